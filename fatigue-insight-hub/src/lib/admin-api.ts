@@ -65,7 +65,7 @@ export interface ActivityEvent {
 
 // ─── API Functions ───────────────────────────────────────────────────────────
 
-async function adminFetch<T>(path: string): Promise<T> {
+async function adminRequest(path: string): Promise<Response> {
   const res = await fetch(`${API_BASE_URL}${path}`, {
     headers: { ...getAuthHeaders() },
   });
@@ -73,6 +73,11 @@ async function adminFetch<T>(path: string): Promise<T> {
     const detail = await res.text().catch(() => 'Unknown error');
     throw new Error(`Admin API error (${res.status}): ${detail}`);
   }
+  return res;
+}
+
+async function adminFetch<T>(path: string): Promise<T> {
+  const res = await adminRequest(path);
   return res.json();
 }
 
@@ -80,8 +85,21 @@ export function getAdminStats(): Promise<PlatformStats> {
   return adminFetch('/api/admin/stats');
 }
 
-export function getAdminUsers(): Promise<AdminUser[]> {
-  return adminFetch('/api/admin/users');
+// Largest page /api/admin/users accepts
+const ADMIN_USERS_PAGE_SIZE = 500;
+
+/** All users, newest first, fetched page by page up to X-Total-Count. */
+export async function getAdminUsers(): Promise<AdminUser[]> {
+  const users: AdminUser[] = [];
+  for (;;) {
+    const res = await adminRequest(
+      `/api/admin/users?limit=${ADMIN_USERS_PAGE_SIZE}&offset=${users.length}`,
+    );
+    const page: AdminUser[] = await res.json();
+    users.push(...page);
+    const total = Number(res.headers.get('X-Total-Count') ?? users.length);
+    if (page.length === 0 || users.length >= total) return users;
+  }
 }
 
 export function getAdminRosters(limit = 100, offset = 0): Promise<AdminRoster[]> {
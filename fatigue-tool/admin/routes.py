@@ -4,33 +4,65 @@ Admin API routes for Aerowake.
 Provides platform-wide visibility for admin users.
 All endpoints are gated by the get_admin_user dependency.
 
+Queries select plain columns rather than ORM entities: responses only need a
+handful of scalar fields, and column rows can never lazy-load a relationship
+per row (N+1). List queries label their columns with the response field
+names, so trusted rows go straight into model_construct() without
+re-validation.
+
 Endpoints:
   GET /api/admin/stats    — Platform-wide statistics
-  GET /api/admin/users    — All registered users with metrics
-  GET /api/admin/rosters  — All uploaded rosters across all users
+  GET /api/admin/users    — Registered users with metrics (paginated)
+  GET /api/admin/rosters  — All uploaded rosters across all users (paginated)
   GET /api/admin/activity — Recent activity feed (signups + uploads)
+
+The two list endpoints accept ?stream=true to stream the JSON array row by
+row from a server-side cursor instead of building the whole list in memory.
+
+/stats, /users and /rosters send an ETag and answer a matching If-None-Match
+with 304 Not Modified, so dashboard polls of unchanged data skip the body.
 """
 
+import hashlib
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from typing import Optional, List
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
-from sqlalchemy import select, func, desc, case
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import (
+    Integer, String, select, func, desc, case, exists, literal, null, cast, union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from admin.stats import get_platform_stats_summary, get_recent_counts, summary_updated_at
 from auth.dependencies import get_admin_user
+from db.cache import cache_get, cache_set
 from db.models import User, Roster, Analysis
-from db.session import get_db
+from db.session import get_db, engine
 
 logger = logging.getLogger(__name__)
 
 admin_router = APIRouter(prefix="/api/admin", tags=["admin"])
 
+# Cached responses are served as raw JSON bytes. Bump the version suffix
+# whenever a response model changes shape.
+#
+# Handlers return pydantic-core-encoded bytes (cached or freshly dumped)
+# rather than models, so FastAPI doesn't validate and encode them again.
+# response_model is kept on the routes for the OpenAPI schema only.
+STATS_CACHE_KEY = "admin:stats:v1"
+STATS_CACHE_TTL = 60
+ACTIVITY_CACHE_KEY = "admin:activity:v1"
+ACTIVITY_CACHE_TTL = 15
+
 
 # ─── Response Models ──────────────────────────────────────────────────────────
+#
+# Timestamps (datetime) and ids (UUID) are passed through as-is and
+# serialized to strings by pydantic-core.
 
 
 class MostActiveUser(BaseModel):
@@ -50,21 +82,21 @@ class PlatformStatsResponse(BaseModel):
 
 
 class AdminUserResponse(BaseModel):
-    id: str
+    id: UUID
     email: Optional[str]
     display_name: Optional[str]
     pilot_id: Optional[str]
     home_base: Optional[str]
     is_active: bool
     is_admin: bool
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
     roster_count: int
-    last_upload: Optional[str]
+    last_upload: Optional[datetime]
 
 
 class AdminRosterResponse(BaseModel):
-    id: str
+    id: UUID
     filename: str
     month: str
     pilot_id: Optional[str]
@@ -74,26 +106,106 @@ class AdminRosterResponse(BaseModel):
     total_sectors: Optional[int]
     total_duty_hours: Optional[float]
     total_block_hours: Optional[float]
-    created_at: str
+    created_at: datetime
     has_analysis: bool
-    user_id: str
+    user_id: UUID
     user_email: Optional[str]
     user_display_name: Optional[str]
 
 
 class ActivityEvent(BaseModel):
     event_type: str  # "roster_upload" | "user_signup"
-    timestamp: str
+    timestamp: datetime
     user_email: Optional[str]
     user_display_name: Optional[str]
     details: dict
 
 
+# Built once at import; list endpoints serialize through these directly
+_ADMIN_USERS = TypeAdapter(List[AdminUserResponse])
+_ADMIN_ROSTERS = TypeAdapter(List[AdminRosterResponse])
+_ACTIVITY_EVENTS = TypeAdapter(List[ActivityEvent])
+
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+# Conditional requests: clients must revalidate every time, but an unchanged
+# ETag lets us answer with an empty 304.
+_REVALIDATE = "private, no-cache"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header lists etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+def _not_modified(etag: str, headers: Optional[dict] = None) -> Response:
+    return Response(
+        status_code=304,
+        headers={**(headers or {}), "ETag": etag, "Cache-Control": _REVALIDATE},
+    )
+
+
+async def _users_version(db: AsyncSession):
+    """Validator for /users: the users table's row count and latest update,
+    plus platform_stats.updated_at for the per-user roster columns (roster
+    inserts and deletes bump it). One round-trip; user_count doubles as the
+    X-Total-Count header.
+    """
+    return (await db.execute(select(
+        select(func.count()).select_from(User).scalar_subquery().label("user_count"),
+        select(func.max(User.updated_at)).scalar_subquery().label("users_updated"),
+        summary_updated_at().label("stats_updated"),
+    ))).one()
+
+
+async def _rosters_version(db: AsyncSession):
+    """Validator for /rosters: platform_stats.updated_at, which roster and
+    analysis inserts/deletes bump, plus the latest user update for the
+    uploader columns. No full-table COUNT.
+    """
+    return (await db.execute(select(
+        summary_updated_at().label("stats_updated"),
+        select(func.max(User.updated_at)).scalar_subquery().label("users_updated"),
+    ))).one()
+
+
+def _version_etag(version) -> str:
+    parts = [
+        str(v.timestamp()) if isinstance(v, datetime) else str(v or 0)
+        for v in version
+    ]
+    return f'W/"{"-".join(parts)}"'
+
+
+async def _stream_json_array(query, response_model):
+    """Yield a JSON array of response models, serializing one row at a time.
+
+    Opens its own Core connection: the request-scoped session is not
+    guaranteed to outlive the handler while the body is still being sent.
+    """
+    async with engine.connect() as conn:
+        result = await conn.stream(query)
+        yield b"["
+        first = True
+        async for row in result.mappings():
+            if not first:
+                yield b","
+            first = False
+            yield response_model.model_construct(**row).model_dump_json().encode()
+        yield b"]"
+
+
 # ─── Endpoints ────────────────────────────────────────────────────────────────
 
 
 @admin_router.get("/stats", response_model=PlatformStatsResponse)
 async def get_platform_stats(
+    request: Request,
     _admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -101,47 +213,39 @@ async def get_platform_stats(
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    now = datetime.now(timezone.utc)
-    week_ago = now - timedelta(days=7)
-
-    # Total counts
-    total_users = (await db.execute(
-        select(func.count()).select_from(User).where(User.is_active == True)
-    )).scalar_one()
-
-    total_rosters = (await db.execute(
-        select(func.count()).select_from(Roster)
-    )).scalar_one()
-
-    total_analyses = (await db.execute(
-        select(func.count()).select_from(Analysis)
-    )).scalar_one()
-
-    # Last 7 days
-    users_last_7 = (await db.execute(
-        select(func.count()).select_from(User).where(User.created_at >= week_ago)
-    )).scalar_one()
-
-    rosters_last_7 = (await db.execute(
-        select(func.count()).select_from(Roster).where(Roster.created_at >= week_ago)
-    )).scalar_one()
-
-    # Average rosters per user
-    avg_per_user = round(total_rosters / max(total_users, 1), 1)
+    cached = await cache_get(STATS_CACHE_KEY)
+    if cached is not None:
+        return _stats_response(request, cached)
 
-    # Top 5 most active users by roster count
+    # Top 5 most active users by roster count. Counting Roster.user_id (not
+    # Roster.id) lets the join be served from ix_rosters_user_month alone.
     top_users_q = (
         select(
             User.email,
             User.display_name,
-            func.count(Roster.id).label("roster_count"),
+            func.count(Roster.user_id).label("roster_count"),
         )
         .outerjoin(Roster, Roster.user_id == User.id)
-        .group_by(User.id, User.email, User.display_name)
+        .group_by(User.id)  # PK functionally determines email/display_name
         .order_by(desc("roster_count"))
         .limit(5)
     )
+
+    summary = await get_platform_stats_summary(db)
     top_users_result = await db.execute(top_users_q)
+
+    # Totals come from the maintained summary row; the 7-day windows from
+    # the background-refreshed in-process cache
+    total_users = summary.total_users
+    total_rosters = summary.total_rosters
+    total_analyses = summary.total_analyses
+    recent = get_recent_counts(summary)
+    users_last_7 = recent["users_last_7_days"]
+    rosters_last_7 = recent["rosters_last_7_days"]
+
+    # Average rosters per user
+    avg_per_user = round(total_rosters / max(total_users, 1), 1)
+
     most_active = [
         MostActiveUser(
             email=row.email,
@@ -151,7 +255,7 @@ async def get_platform_stats(
         for row in top_users_result.all()
     ]
 
-    return PlatformStatsResponse(
+    response = PlatformStatsResponse(
         total_users=total_users,
         total_rosters=total_rosters,
         total_analyses=total_analyses,
@@ -160,17 +264,47 @@ async def get_platform_stats(
         avg_rosters_per_user=avg_per_user,
         most_active_users=most_active,
     )
+    payload = response.model_dump_json().encode()
+    await cache_set(STATS_CACHE_KEY, payload, STATS_CACHE_TTL)
+    return _stats_response(request, payload)
+
+
+def _stats_response(request: Request, payload: bytes) -> Response:
+    """Stats payloads are small, so the ETag is simply a hash of the bytes."""
+    etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": _REVALIDATE},
+    )
 
 
 @admin_router.get("/users", response_model=List[AdminUserResponse])
 async def list_all_users(
+    request: Request,
     _admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    stream: bool = Query(False),
 ):
-    """All registered users with roster metrics."""
+    """Registered users with roster metrics, newest first.
+
+    Paginated with limit/offset; the total user count is returned in the
+    X-Total-Count header.
+    """
     if db is None:
         raise HTTPException(503, "Database not available")
 
+    version = await _users_version(db)
+    etag = _version_etag(version)
+    headers = {"X-Total-Count": str(version.user_count)}
+    if _etag_matches(request, etag):
+        return _not_modified(etag, headers)
+    headers.update({"ETag": etag, "Cache-Control": _REVALIDATE})
+
     # Subquery for per-user roster stats
     roster_stats = (
         select(
@@ -182,82 +316,101 @@ async def list_all_users(
         .subquery()
     )
 
-    # Main query: all users LEFT JOIN roster stats
+    # Main query: users LEFT JOIN roster stats
     query = (
-        select(User, roster_stats.c.roster_count, roster_stats.c.last_upload)
+        select(
+            User.id,
+            User.email,
+            User.display_name,
+            User.pilot_id,
+            User.home_base,
+            User.is_active,
+            User.is_admin,
+            User.created_at,
+            User.updated_at,
+            func.coalesce(roster_stats.c.roster_count, 0).label("roster_count"),
+            roster_stats.c.last_upload,
+        )
         .outerjoin(roster_stats, User.id == roster_stats.c.user_id)
         .order_by(desc(User.created_at))
+        .limit(limit)
+        .offset(offset)
     )
-    result = await db.execute(query)
 
-    users = []
-    for row in result.all():
-        user = row[0]
-        roster_count = row[1] or 0
-        last_upload = row[2]
-        users.append(AdminUserResponse(
-            id=str(user.id),
-            email=user.email,
-            display_name=user.display_name,
-            pilot_id=user.pilot_id,
-            home_base=user.home_base,
-            is_active=user.is_active,
-            is_admin=getattr(user, "is_admin", False),
-            created_at=user.created_at.isoformat() if user.created_at else "",
-            updated_at=user.updated_at.isoformat() if user.updated_at else "",
-            roster_count=roster_count,
-            last_upload=last_upload.isoformat() if last_upload else None,
-        ))
+    if stream:
+        return StreamingResponse(
+            _stream_json_array(query, AdminUserResponse),
+            media_type="application/json",
+            headers=headers,
+        )
 
-    return users
+    result = await db.execute(query)
+    users = [AdminUserResponse.model_construct(**row) for row in result.mappings()]
+    return Response(
+        content=_ADMIN_USERS.dump_json(users),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @admin_router.get("/rosters", response_model=List[AdminRosterResponse])
 async def list_all_rosters(
+    request: Request,
     _admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    stream: bool = Query(False),
 ):
     """All rosters across all users with uploader identity."""
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    # Query rosters joined with users, eagerly load analyses (just to check existence)
+    etag = _version_etag(await _rosters_version(db))
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    headers = {"ETag": etag, "Cache-Control": _REVALIDATE}
+
+    # Query rosters joined with users; analysis presence is a correlated EXISTS
+    has_analysis = exists().where(Analysis.roster_id == Roster.id).label("has_analysis")
     query = (
-        select(Roster, User.email, User.display_name)
+        select(
+            Roster.id,
+            Roster.filename,
+            Roster.month,
+            Roster.pilot_id,
+            Roster.home_base,
+            Roster.config_preset,
+            Roster.total_duties,
+            Roster.total_sectors,
+            Roster.total_duty_hours,
+            Roster.total_block_hours,
+            Roster.created_at,
+            Roster.user_id,
+            User.email.label("user_email"),
+            User.display_name.label("user_display_name"),
+            has_analysis,
+        )
         .join(User, Roster.user_id == User.id)
-        .options(selectinload(Roster.analyses))
         .order_by(desc(Roster.created_at))
         .limit(limit)
         .offset(offset)
     )
-    result = await db.execute(query)
 
-    rosters = []
-    for row in result.all():
-        roster = row[0]
-        user_email = row[1]
-        user_display_name = row[2]
-        rosters.append(AdminRosterResponse(
-            id=str(roster.id),
-            filename=roster.filename,
-            month=roster.month,
-            pilot_id=roster.pilot_id,
-            home_base=roster.home_base,
-            config_preset=roster.config_preset,
-            total_duties=roster.total_duties,
-            total_sectors=roster.total_sectors,
-            total_duty_hours=roster.total_duty_hours,
-            total_block_hours=roster.total_block_hours,
-            created_at=roster.created_at.isoformat() if roster.created_at else "",
-            has_analysis=len(roster.analyses) > 0,
-            user_id=str(roster.user_id),
-            user_email=user_email,
-            user_display_name=user_display_name,
-        ))
+    if stream:
+        return StreamingResponse(
+            _stream_json_array(query, AdminRosterResponse),
+            media_type="application/json",
+            headers=headers,
+        )
 
-    return rosters
+    result = await db.execute(query)
+    rosters = [AdminRosterResponse.model_construct(**row) for row in result.mappings()]
+    return Response(
+        content=_ADMIN_ROSTERS.dump_json(rosters),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @admin_router.get("/activity", response_model=List[ActivityEvent])
@@ -270,51 +423,69 @@ async def get_recent_activity(
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    events: List[ActivityEvent] = []
+    cache_key = f"{ACTIVITY_CACHE_KEY}:{limit}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
 
-    # Recent signups
+    # Signups and uploads projected into matching column slots, merged and
+    # ordered by timestamp in the database. Each branch is limited on its
+    # own so it can stop early on its created_at ordering.
     signups_q = (
-        select(User)
+        select(
+            literal("user_signup").label("event_type"),
+            User.created_at.label("ts"),
+            User.email,
+            User.display_name,
+            User.pilot_id,
+            User.home_base,
+            cast(null(), String).label("filename"),
+            cast(null(), String).label("month"),
+            cast(null(), Integer).label("total_duties"),
+        )
         .order_by(desc(User.created_at))
         .limit(limit)
     )
-    signups = (await db.execute(signups_q)).scalars().all()
-    for user in signups:
-        events.append(ActivityEvent(
-            event_type="user_signup",
-            timestamp=user.created_at.isoformat() if user.created_at else "",
-            user_email=user.email,
-            user_display_name=user.display_name,
-            details={
-                "pilot_id": user.pilot_id,
-                "home_base": user.home_base,
-            },
-        ))
-
-    # Recent uploads
     uploads_q = (
-        select(Roster, User.email, User.display_name)
+        select(
+            literal("roster_upload").label("event_type"),
+            Roster.created_at.label("ts"),
+            User.email,
+            User.display_name,
+            cast(null(), String).label("pilot_id"),
+            Roster.home_base,
+            Roster.filename,
+            Roster.month,
+            Roster.total_duties,
+        )
         .join(User, Roster.user_id == User.id)
         .order_by(desc(Roster.created_at))
         .limit(limit)
     )
-    uploads = (await db.execute(uploads_q)).all()
-    for row in uploads:
-        roster = row[0]
+    activity_q = union_all(signups_q, uploads_q).order_by(desc("ts")).limit(limit)
+
+    events: List[ActivityEvent] = []
+    for row in (await db.execute(activity_q)).all():
+        if row.event_type == "user_signup":
+            details = {
+                "pilot_id": row.pilot_id,
+                "home_base": row.home_base,
+            }
+        else:
+            details = {
+                "filename": row.filename,
+                "month": row.month,
+                "total_duties": row.total_duties,
+                "home_base": row.home_base,
+            }
         events.append(ActivityEvent(
-            event_type="roster_upload",
-            timestamp=roster.created_at.isoformat() if roster.created_at else "",
-            user_email=row[1],
-            user_display_name=row[2],
-            details={
-                "filename": roster.filename,
-                "month": roster.month,
-                "total_duties": roster.total_duties,
-                "home_base": roster.home_base,
-            },
+            event_type=row.event_type,
+            timestamp=row.ts,
+            user_email=row.email,
+            user_display_name=row.display_name,
+            details=details,
         ))
 
-    # Merge and sort by timestamp descending
-    events.sort(key=lambda e: e.timestamp, reverse=True)
-
-    return events[:limit]
+    payload = _ACTIVITY_EVENTS.dump_json(events)
+    await cache_set(cache_key, payload, ACTIVITY_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
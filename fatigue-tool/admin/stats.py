@@ -0,0 +1,208 @@
+"""
+Platform-wide statistics summary for the admin dashboard.
+
+The platform_stats table holds one row of counts so that /api/admin/stats
+is a single primary-key read instead of full-table COUNTs:
+
+  - ORM after_insert / after_delete events on User, Roster and Analysis
+    adjust the totals in the same transaction as the write.
+  - A background task refreshes the rolling 7-day windows into the
+    in-process _STATS_CACHE every WINDOW_REFRESH_SECONDS, so /stats never
+    runs a range COUNT itself.
+  - The same task recomputes every count every RECONCILE_INTERVAL_SECONDS.
+    This corrects drift from writes that bypass ORM events (bulk DELETEs,
+    FK cascades, user deactivation).
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import User, Roster, Analysis, PlatformStatsSummary
+from db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+WINDOW_REFRESH_SECONDS = 60
+RECONCILE_INTERVAL_SECONDS = 300
+
+_SUMMARY_ID = 1
+
+# Latest 7-day window counts for this process:
+# {"users_last_7_days": int, "rosters_last_7_days": int, "fetched_at": datetime}
+_STATS_CACHE: dict = {}
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+
+async def get_platform_stats_summary(db: AsyncSession) -> PlatformStatsSummary:
+    """Return the summary row, computing it first if it doesn't exist yet."""
+    summary = (await db.execute(
+        select(PlatformStatsSummary).where(PlatformStatsSummary.id == _SUMMARY_ID)
+    )).scalar_one_or_none()
+    if summary is None:
+        summary = await refresh_platform_stats(db)
+    return summary
+
+
+def summary_updated_at():
+    """Scalar subquery for the summary row's updated_at (NULL until the row
+    exists). Every tracked insert/delete and every reconcile bumps it, so it
+    serves as a cheap change marker for users, rosters and analyses."""
+    return (
+        select(PlatformStatsSummary.updated_at)
+        .where(PlatformStatsSummary.id == _SUMMARY_ID)
+        .scalar_subquery()
+    )
+
+
+def get_recent_counts(summary: PlatformStatsSummary) -> dict:
+    """7-day window counts: the in-process cache, else the summary row."""
+    if _STATS_CACHE:
+        return _STATS_CACHE
+    return {
+        "users_last_7_days": summary.users_last_7_days,
+        "rosters_last_7_days": summary.rosters_last_7_days,
+    }
+
+
+async def refresh_recent_counts(db: AsyncSession) -> dict:
+    """Recompute the 7-day window counts into _STATS_CACHE."""
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    counts = (await db.execute(select(
+        select(func.count()).select_from(User)
+        .where(User.created_at >= week_ago).scalar_subquery().label("users_last_7_days"),
+        select(func.count()).select_from(Roster)
+        .where(Roster.created_at >= week_ago).scalar_subquery().label("rosters_last_7_days"),
+    ))).one()
+    _cache_recent_counts(counts.users_last_7_days, counts.rosters_last_7_days)
+    return _STATS_CACHE
+
+
+async def refresh_platform_stats(db: AsyncSession) -> PlatformStatsSummary:
+    """Recompute every count with full COUNTs and upsert the summary row."""
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+
+    # All counts in one round-trip: each is a single-row scalar subquery.
+    counts_q = select(
+        select(func.count()).select_from(User)
+        .where(User.is_active == True).scalar_subquery().label("total_users"),
+        select(func.count()).select_from(Roster)
+        .scalar_subquery().label("total_rosters"),
+        select(func.count()).select_from(Analysis)
+        .scalar_subquery().label("total_analyses"),
+        select(func.count()).select_from(User)
+        .where(User.created_at >= week_ago).scalar_subquery().label("users_last_7_days"),
+        select(func.count()).select_from(Roster)
+        .where(Roster.created_at >= week_ago).scalar_subquery().label("rosters_last_7_days"),
+    )
+    counts = dict((await db.execute(counts_q)).one()._mapping)
+
+    stmt = pg_insert(PlatformStatsSummary).values(id=_SUMMARY_ID, **counts)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlatformStatsSummary.id],
+        set_={**counts, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+    await db.commit()
+    _cache_recent_counts(counts["users_last_7_days"], counts["rosters_last_7_days"])
+
+    return (await db.execute(
+        select(PlatformStatsSummary)
+        .where(PlatformStatsSummary.id == _SUMMARY_ID)
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+
+
+async def prime_platform_stats() -> None:
+    """Reconcile once at startup so the first /stats request has real numbers."""
+    if AsyncSessionLocal is None:
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            await refresh_platform_stats(db)
+    except Exception as e:
+        logger.warning(f"Failed to prime platform stats: {e}")
+
+
+async def run_platform_stats_refresher() -> None:
+    """Background loop: refresh the 7-day windows every WINDOW_REFRESH_SECONDS
+    and reconcile the full summary row every RECONCILE_INTERVAL_SECONDS."""
+    if AsyncSessionLocal is None:
+        return
+
+    loop = asyncio.get_running_loop()
+    last_reconcile = loop.time()
+    while True:
+        await asyncio.sleep(WINDOW_REFRESH_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                if loop.time() - last_reconcile >= RECONCILE_INTERVAL_SECONDS:
+                    await refresh_platform_stats(db)
+                    last_reconcile = loop.time()
+                else:
+                    await refresh_recent_counts(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to refresh platform stats: {e}")
+
+
+def _cache_recent_counts(users_last_7_days: int, rosters_last_7_days: int) -> None:
+    _STATS_CACHE.update(
+        users_last_7_days=users_last_7_days,
+        rosters_last_7_days=rosters_last_7_days,
+        fetched_at=datetime.now(timezone.utc),
+    )
+
+
+# ── Write-time maintenance ────────────────────────────────────────────────────
+
+
+def _adjust(connection, delta: int, *columns: str) -> None:
+    """Add delta to the given summary columns (no-op until the row exists)."""
+    summary = PlatformStatsSummary.__table__
+    connection.execute(
+        update(summary)
+        .where(summary.c.id == _SUMMARY_ID)
+        .values(
+            updated_at=func.now(),
+            **{col: summary.c[col] + delta for col in columns},
+        )
+    )
+
+
+@event.listens_for(User, "after_insert")
+def _user_inserted(mapper, connection, target):
+    _adjust(connection, 1, "total_users", "users_last_7_days")
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    if target.is_active:
+        _adjust(connection, -1, "total_users")
+
+
+@event.listens_for(Roster, "after_insert")
+def _roster_inserted(mapper, connection, target):
+    _adjust(connection, 1, "total_rosters", "rosters_last_7_days")
+
+
+@event.listens_for(Roster, "after_delete")
+def _roster_deleted(mapper, connection, target):
+    _adjust(connection, -1, "total_rosters")
+
+
+@event.listens_for(Analysis, "after_insert")
+def _analysis_inserted(mapper, connection, target):
+    _adjust(connection, 1, "total_analyses")
+
+
+@event.listens_for(Analysis, "after_delete")
+def _analysis_deleted(mapper, connection, target):
+    _adjust(connection, -1, "total_analyses")
@@ -16,36 +16,59 @@ Usage:
     uvicorn api_server:app --reload --host 0.0.0.0 --port 8000
 """
 
+import asyncio
+import copy
+import hashlib
+from bisect import bisect_right
+from collections import OrderedDict, deque
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from operator import attrgetter
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Query, Depends
+from fastapi import (
+    FastAPI, UploadFile, File, HTTPException, Form, Query, Depends, BackgroundTasks,
+    Request,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, FileResponse, Response
 from pydantic import BaseModel
+from pydantic_core import to_json
 from typing import Optional, List
 import math
 import tempfile
 import os
+import shutil
+import uuid
+import weakref
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import pytz
+from sqlalchemy import delete as sa_delete, func, select
+
 logger = logging.getLogger(__name__)
 
 # Import your fatigue model
 from core import BorbelyFatigueModel, ModelConfig, RiskThresholds
 from parsers.roster_parser import PDFRosterParser, CSVRosterParser, AirportDatabase
-from models.data_models import MonthlyAnalysis, DutyTimeline
+from models.data_models import (
+    MonthlyAnalysis, DutyTimeline, CrewComposition, ULRCrewSet, get_timezone,
+)
 
 # Database & Auth imports
-from db.session import init_db, get_db, is_db_available
-from db.models import User, Roster, Analysis, FatigueState
+from db.session import init_db, get_db, is_db_available, AsyncSessionLocal
+from db.models import User, Roster, Analysis, FatigueState, RosterMonthlyMetrics
 from auth.routes import auth_router
 from auth.dependencies import get_optional_user
 from admin.routes import admin_router
+from admin.stats import prime_platform_stats, run_platform_stats_refresher
 from company.routes import router as company_router
 from company.detection import detect_airline, extract_fleet_and_role
+from metrics.aggregator import compute_aggregate_metrics
+from metrics.monthly import backfill_monthly_metrics, refresh_monthly_metrics
 
 
 # ============================================================================
@@ -54,9 +77,18 @@ from company.detection import detect_airline, extract_fleet_and_role
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database tables on startup."""
+    """Initialize database tables and start background refreshers on startup."""
     await init_db()
+    await prime_platform_stats()
+    # The backfill can aggregate every analysed roster, so it runs in the
+    # background rather than holding up startup
+    background = [
+        asyncio.create_task(backfill_monthly_metrics()),
+        asyncio.create_task(run_platform_stats_refresher()),
+    ]
     yield
+    for task in background:
+        task.cancel()
 
 app = FastAPI(
     title="Fatigue Analysis API",
@@ -87,12 +119,17 @@ ALLOWED_ORIGINS += [
     "http://127.0.0.1:5173",
 ]
 
+# Compress JSON responses (analysis payloads, admin lists). Registered before
+# CORS so CORS stays the outermost middleware.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "ETag"],
 )
 
 
@@ -452,82 +489,281 @@ class AnalysisResponse(BaseModel):
 # IN-MEMORY STORAGE (Replace with database in production)
 # ============================================================================
 
-analysis_store = {}  # analysis_id -> (MonthlyAnalysis, Roster)
+ANALYSIS_CACHE_SIZE = int(os.environ.get("ANALYSIS_CACHE_SIZE", "128"))
+
+
+class AnalysisStore:
+    """Bounded LRU of recent analyses.
+
+    analysis_id -> (MonthlyAnalysis, Roster, sleep_strategies). Once full, the
+    least recently used entry is evicted; evicted analyses are rebuilt from the
+    stored PDF by the DB fallback paths (get_analysis, get_duty_detail,
+    run_what_if). Every access is synchronous on the event loop, so no lock
+    is needed.
+
+    Alongside an entry the store can hold its AnalysisResponse already
+    encoded as JSON, so GET /api/analysis can resend it without rebuilding
+    the response. It lives and dies with the entry.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._encoded: dict = {}
+
+    def get(self, analysis_id: str) -> Optional[tuple]:
+        """Return the entry (marking it most recently used), or None."""
+        entry = self._entries.get(analysis_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(analysis_id)
+        self.hits += 1
+        return entry
+
+    def __setitem__(self, analysis_id: str, entry: tuple) -> None:
+        self._entries[analysis_id] = entry
+        self._entries.move_to_end(analysis_id)
+        self._encoded.pop(analysis_id, None)
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            self._encoded.pop(evicted, None)
+
+    def get_encoded(self, analysis_id: str) -> Optional[bytes]:
+        """Return the entry's encoded response (marking it most recently
+        used), or None if it has none."""
+        data = self._encoded.get(analysis_id)
+        if data is None:
+            return None
+        self._entries.move_to_end(analysis_id)
+        self.hits += 1
+        return data
+
+    def set_encoded(self, analysis_id: str, data: bytes) -> None:
+        """Attach an encoded response to an existing entry."""
+        if analysis_id in self._entries:
+            self._encoded[analysis_id] = data
+
+    def __contains__(self, analysis_id: str) -> bool:
+        return analysis_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+analysis_store = AnalysisStore(ANALYSIS_CACHE_SIZE)
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Model configuration presets, built once. The model only reads its config,
+# so every request for a preset can share the same instance.
+_CONFIG_PRESETS = {
+    "operational": ModelConfig.operational_config(),
+    "easa_default": ModelConfig.default_easa_config(),
+    "conservative": ModelConfig.conservative_config(),
+    "research": ModelConfig.research_config(),
+}
+_CONFIG_PRESETS["default"] = _CONFIG_PRESETS["operational"]
+_CONFIG_PRESETS["liberal"] = _CONFIG_PRESETS["operational"]  # legacy → operational
+
+
+def _model_config(preset: Optional[str]) -> ModelConfig:
+    """Shared ModelConfig for a preset name; unknown names get operational."""
+    return _CONFIG_PRESETS.get(preset, _CONFIG_PRESETS["operational"])
+
+
+def _new_analysis_id(*prefix: str) -> str:
+    """Unique analysis id: readable prefix parts plus a random suffix.
+
+    The suffix used to be a second-resolution timestamp, so two analyses of
+    the same pilot and month started in the same second shared an id.
+    """
+    return "_".join((*prefix, uuid.uuid4().hex[:16]))
+
+
+# An analysis never changes once stored (reanalysis issues a new id), so
+# responses keyed by analysis_id can sit in the browser cache for a week
+# without revalidation.
+_IMMUTABLE = "private, max-age=604800, immutable"
+
+
+def _analysis_etag(analysis_id: str, *variant: str) -> str:
+    """Strong ETag for an analysis-derived response; variant distinguishes
+    different representations served for the same analysis."""
+    key = "\0".join((analysis_id, *variant))
+    return f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header lists etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _IMMUTABLE})
+
+
+def _set_immutable(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _IMMUTABLE
+    return response
+
+
+async def _analysis_in_db(db, analysis_id: str) -> bool:
+    """True if the analysis is stored in the database. Conditional requests
+    are only answered 304 once the analysis is known to exist, so a cached
+    ETag never stands in for a missing or deleted analysis."""
+    if db is None:
+        return False
+    row = (await db.execute(select(Analysis.id).where(Analysis.id == analysis_id))).first()
+    return row is not None
+
+_UTC = pytz.utc
+_ZERO = timedelta(0)
+
+# UTC offsets are cached per quarter-hour: every current tzdata transition
+# falls on a 15-minute UTC boundary (including half-hour zones such as
+# America/St_Johns), so one bucket never straddles a DST change.
+_OFFSET_BUCKET_SECONDS = 900
+
+_RAW_PERFORMANCE = attrgetter('raw_performance')
+
+
+def _to_utc(dt: datetime) -> datetime:
+    """Return dt in UTC, skipping the conversion when it already is.
+
+    Model datetimes (*_utc fields) are normally already UTC-aware, so the
+    astimezone() call — a new datetime plus tzinfo math — is usually wasted.
+    """
+    if dt.tzinfo is _UTC or dt.utcoffset() == _ZERO:
+        return dt
+    return dt.astimezone(_UTC)
+
+
+def _local_wallclock(dt: datetime, tz) -> datetime:
+    """Naive wall-clock time of dt in tz, for HH:MM display.
+
+    For pytz DST zones this does what tz.fromutc() does internally — one
+    bisect over the zone's UTC transition table, then add that offset —
+    without building a localized datetime. Other zones use astimezone().
+    """
+    transitions = getattr(tz, '_utc_transition_times', None)
+    if transitions is None:
+        return dt.astimezone(tz).replace(tzinfo=None)
+    naive_utc = _to_utc(dt).replace(tzinfo=None)
+    idx = max(bisect_right(transitions, naive_utc) - 1, 0)
+    return naive_utc + tz._transition_info[idx][0]
+
+
+@lru_cache(maxsize=4096)
+def _offset_hours(tz_name: str, utc_bucket: int) -> float:
+    """UTC offset in hours of tz_name at the start of a quarter-hour bucket."""
+    instant = datetime.fromtimestamp(utc_bucket * _OFFSET_BUCKET_SECONDS, _UTC)
+    return instant.astimezone(get_timezone(tz_name)).utcoffset().total_seconds() / 3600
+
+
+def _hhmm(dt: datetime) -> str:
+    """HH:MM of dt — integer formatting, cheaper than strftime("%H:%M")."""
+    return f"{dt.hour:02d}:{dt.minute:02d}"
+
+
+def _hr(dt: datetime) -> float:
+    """Fractional hour of day (HH + MM/60) used for chronogram positioning."""
+    return dt.hour + dt.minute / 60.0
+
+
+def _ymd(dt: datetime) -> str:
+    """YYYY-MM-DD of dt — integer formatting, cheaper than strftime("%Y-%m-%d")."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
+# Lower bound of each risk band; bisect_right maps a score to its label.
+_RISK_THRESHOLDS = (45, 55, 65, 75)
+_RISK_LABELS = ("extreme", "critical", "high", "moderate", "low")
+
+
 def classify_risk(performance: Optional[float]) -> str:
     """Classify risk level based on performance score"""
     if performance is None:
         return "unknown"
-    if performance >= 75:
-        return "low"
-    elif performance >= 65:
-        return "moderate"
-    elif performance >= 55:
-        return "high"
-    elif performance >= 45:
-        return "critical"
-    else:
+    if performance != performance:  # NaN fails every >= threshold
         return "extreme"
+    return _RISK_LABELS[bisect_right(_RISK_THRESHOLDS, performance)]
 
 
 def _build_segments(duty, home_tz) -> list:
-    """Serialize flight segments with timezone conversions."""
-    import pytz
+    """Serialize flight segments with timezone conversions.
 
+    Every field is built here with its declared type, so the response is
+    assembled with model_construct() and skips Pydantic validation.
+    """
     segments = []
     for seg in duty.segments:
         dep_utc = seg.scheduled_departure_utc
         arr_utc = seg.scheduled_arrival_utc
 
         # Home base timezone for chronogram alignment
-        dep_home = dep_utc.astimezone(home_tz)
-        arr_home = arr_utc.astimezone(home_tz)
-
-        # Actual airport-local timezone for display
-        dep_airport_tz = pytz.timezone(seg.departure_airport.timezone)
-        arr_airport_tz = pytz.timezone(seg.arrival_airport.timezone)
-        dep_airport_local = dep_utc.astimezone(dep_airport_tz)
-        arr_airport_local = arr_utc.astimezone(arr_airport_tz)
-
-        dep_utc_offset = dep_airport_local.utcoffset().total_seconds() / 3600
-        arr_utc_offset = arr_airport_local.utcoffset().total_seconds() / 3600
-
-        dep_utc_z = dep_utc.astimezone(pytz.utc)
-        arr_utc_z = arr_utc.astimezone(pytz.utc)
-
-        segments.append(DutySegmentResponse(
+        dep_home = _local_wallclock(dep_utc, home_tz)
+        arr_home = _local_wallclock(arr_utc, home_tz)
+
+        dep_utc_z = _to_utc(dep_utc)
+        arr_utc_z = _to_utc(arr_utc)
+
+        # Actual airport-local timezone for display — the offset only depends
+        # on (zone, instant), so repeat airports hit the cache.
+        dep_tz_name = seg.departure_airport.timezone
+        arr_tz_name = seg.arrival_airport.timezone
+        dep_utc_offset = _offset_hours(
+            dep_tz_name, int(dep_utc_z.timestamp()) // _OFFSET_BUCKET_SECONDS)
+        arr_utc_offset = _offset_hours(
+            arr_tz_name, int(arr_utc_z.timestamp()) // _OFFSET_BUCKET_SECONDS)
+        dep_airport_local = dep_utc_z + timedelta(hours=dep_utc_offset)
+        arr_airport_local = arr_utc_z + timedelta(hours=arr_utc_offset)
+
+        segments.append(DutySegmentResponse.model_construct(
             flight_number=seg.flight_number,
             departure=seg.departure_airport.code,
             arrival=seg.arrival_airport.code,
             departure_time=dep_utc.isoformat(),
             arrival_time=arr_utc.isoformat(),
-            departure_time_local=dep_home.strftime("%H:%M"),
-            arrival_time_local=arr_home.strftime("%H:%M"),
-            departure_time_home_tz=dep_home.strftime("%H:%M"),
-            arrival_time_home_tz=arr_home.strftime("%H:%M"),
+            departure_time_local=_hhmm(dep_home),
+            arrival_time_local=_hhmm(arr_home),
+            departure_time_home_tz=_hhmm(dep_home),
+            arrival_time_home_tz=_hhmm(arr_home),
             # UTC precomputed day/hour for UTC chronogram rendering
-            departure_time_utc=dep_utc_z.strftime("%H:%M"),
-            arrival_time_utc=arr_utc_z.strftime("%H:%M"),
+            departure_time_utc=_hhmm(dep_utc_z),
+            arrival_time_utc=_hhmm(arr_utc_z),
             departure_day_utc=dep_utc_z.day,
-            departure_hour_utc=dep_utc_z.hour + dep_utc_z.minute / 60.0,
+            departure_hour_utc=_hr(dep_utc_z),
             arrival_day_utc=arr_utc_z.day,
-            arrival_hour_utc=arr_utc_z.hour + arr_utc_z.minute / 60.0,
-            departure_time_airport_local=dep_airport_local.strftime("%H:%M"),
-            arrival_time_airport_local=arr_airport_local.strftime("%H:%M"),
-            departure_timezone=seg.departure_airport.timezone,
-            arrival_timezone=seg.arrival_airport.timezone,
+            arrival_hour_utc=_hr(arr_utc_z),
+            departure_time_airport_local=_hhmm(dep_airport_local),
+            arrival_time_airport_local=_hhmm(arr_airport_local),
+            departure_timezone=dep_tz_name,
+            arrival_timezone=arr_tz_name,
             departure_utc_offset=dep_utc_offset,
             arrival_utc_offset=arr_utc_offset,
             block_hours=seg.block_time_hours,
-            activity_code=getattr(seg, 'activity_code', None),
-            is_deadhead=getattr(seg, 'is_deadhead', False),
-            line_training_codes=getattr(seg, 'line_training_codes', None),
-            aircraft_type=getattr(seg, 'aircraft_type', None),
+            activity_code=seg.activity_code,
+            is_deadhead=seg.is_deadhead,
+            line_training_codes=seg.line_training_codes,
+            aircraft_type=seg.aircraft_type,
         ))
     return segments
 
@@ -537,15 +773,23 @@ def _validate_duty_times(duty) -> list:
     warnings = []
     if duty.report_time_utc >= duty.release_time_utc:
         warnings.append("Invalid duty: report time >= release time")
-    if duty.duty_hours > 24 and not getattr(duty, 'is_ulr', False):
+    if duty.duty_hours > 24 and not duty.is_ulr:
         warnings.append(f"Unusual duty length: {duty.duty_hours:.1f} hours")
-    elif duty.duty_hours > 23 and getattr(duty, 'is_ulr', False):
+    elif duty.duty_hours > 23 and duty.is_ulr:
         warnings.append(f"ULR duty exceeds max discretion limit: {duty.duty_hours:.1f} hours")
     if duty.duty_hours < 0.5:
         warnings.append(f"Very short duty: {duty.duty_hours:.1f} hours")
     return warnings
 
 
+def _sleep_start_key(block: dict) -> str:
+    return block.get('sleep_start_iso') or ''
+
+
+def _sleep_end_key(block: dict) -> str:
+    return block.get('sleep_end_iso') or ''
+
+
 def _build_sleep_quality(duty_timeline) -> Optional[SleepQualityResponse]:
     """Assemble SleepQualityResponse from strategy data.
 
@@ -556,65 +800,64 @@ def _build_sleep_quality(duty_timeline) -> Optional[SleepQualityResponse]:
         return None
 
     sqd = duty_timeline.sleep_quality_data
-    blocks = sqd.get('sleep_blocks', [])
+    g = sqd.get
+    blocks = g('sleep_blocks', [])
 
     if blocks:
-        earliest = blocks[0]
-        latest = blocks[0]
-        for b in blocks[1:]:
-            if (b.get('sleep_start_iso') or '') < (earliest.get('sleep_start_iso') or ''):
-                earliest = b
-            if (b.get('sleep_end_iso') or '') > (latest.get('sleep_end_iso') or ''):
-                latest = b
+        # min()/max() keep the first block on ties, like the strict compares
+        # they replace.  Keys stay as the home-TZ ISO strings (not epochs) so
+        # ordering across a DST fall-back is unchanged.
+        earliest = min(blocks, key=_sleep_start_key)
+        latest = max(blocks, key=_sleep_end_key)
     else:
         earliest = {}
         latest = {}
+    eg = earliest.get
+    lg = latest.get
 
     return SleepQualityResponse(
-        total_sleep_hours=sqd.get('total_sleep_hours', 0.0),
-        effective_sleep_hours=sqd.get('effective_sleep_hours', 0.0),
-        sleep_efficiency=sqd.get('sleep_efficiency', 0.0),
-        wocl_overlap_hours=sqd.get('wocl_overlap_hours', 0.0),
-        sleep_strategy=sqd.get('strategy_type', 'unknown'),
-        confidence=sqd.get('confidence', 0.0),
-        warnings=sqd.get('warnings', []),
+        total_sleep_hours=g('total_sleep_hours', 0.0),
+        effective_sleep_hours=g('effective_sleep_hours', 0.0),
+        sleep_efficiency=g('sleep_efficiency', 0.0),
+        wocl_overlap_hours=g('wocl_overlap_hours', 0.0),
+        sleep_strategy=g('strategy_type', 'unknown'),
+        confidence=g('confidence', 0.0),
+        warnings=g('warnings', []),
         sleep_blocks=blocks,
-        sleep_start_time=sqd.get('sleep_start_time'),
-        sleep_end_time=sqd.get('sleep_end_time'),
-        explanation=sqd.get('explanation'),
-        confidence_basis=sqd.get('confidence_basis'),
-        quality_factors=sqd.get('quality_factors'),
-        references=sqd.get('references', []),
-        sleep_start_iso=earliest.get('sleep_start_iso'),
-        sleep_end_iso=latest.get('sleep_end_iso'),
-        sleep_start_utc=earliest.get('sleep_start_utc'),
-        sleep_end_utc=latest.get('sleep_end_utc'),
-        sleep_start_day=earliest.get('sleep_start_day'),
-        sleep_start_hour=earliest.get('sleep_start_hour'),
-        sleep_end_day=latest.get('sleep_end_day'),
-        sleep_end_hour=latest.get('sleep_end_hour'),
-        sleep_start_day_home_tz=earliest.get('sleep_start_day_home_tz'),
-        sleep_start_hour_home_tz=earliest.get('sleep_start_hour_home_tz'),
-        sleep_end_day_home_tz=latest.get('sleep_end_day_home_tz'),
-        sleep_end_hour_home_tz=latest.get('sleep_end_hour_home_tz'),
-        sleep_start_time_home_tz=earliest.get('sleep_start_time_home_tz'),
-        sleep_end_time_home_tz=latest.get('sleep_end_time_home_tz'),
+        sleep_start_time=g('sleep_start_time'),
+        sleep_end_time=g('sleep_end_time'),
+        explanation=g('explanation'),
+        confidence_basis=g('confidence_basis'),
+        quality_factors=g('quality_factors'),
+        references=g('references', []),
+        sleep_start_iso=eg('sleep_start_iso'),
+        sleep_end_iso=lg('sleep_end_iso'),
+        sleep_start_utc=eg('sleep_start_utc'),
+        sleep_end_utc=lg('sleep_end_utc'),
+        sleep_start_day=eg('sleep_start_day'),
+        sleep_start_hour=eg('sleep_start_hour'),
+        sleep_end_day=lg('sleep_end_day'),
+        sleep_end_hour=lg('sleep_end_hour'),
+        sleep_start_day_home_tz=eg('sleep_start_day_home_tz'),
+        sleep_start_hour_home_tz=eg('sleep_start_hour_home_tz'),
+        sleep_end_day_home_tz=lg('sleep_end_day_home_tz'),
+        sleep_end_hour_home_tz=lg('sleep_end_hour_home_tz'),
+        sleep_start_time_home_tz=eg('sleep_start_time_home_tz'),
+        sleep_end_time_home_tz=lg('sleep_end_time_home_tz'),
         # UTC precomputed day/hour for UTC chronogram rendering
-        sleep_start_day_utc=earliest.get('sleep_start_day_utc'),
-        sleep_start_hour_utc=earliest.get('sleep_start_hour_utc'),
-        sleep_end_day_utc=latest.get('sleep_end_day_utc'),
-        sleep_end_hour_utc=latest.get('sleep_end_hour_utc'),
-        sleep_start_time_utc=earliest.get('sleep_start_time_utc'),
-        sleep_end_time_utc=latest.get('sleep_end_time_utc'),
+        sleep_start_day_utc=eg('sleep_start_day_utc'),
+        sleep_start_hour_utc=eg('sleep_start_hour_utc'),
+        sleep_end_day_utc=lg('sleep_end_day_utc'),
+        sleep_end_hour_utc=lg('sleep_end_hour_utc'),
+        sleep_start_time_utc=eg('sleep_start_time_utc'),
+        sleep_end_time_utc=lg('sleep_end_time_utc'),
     )
 
 
 def _build_ulr_data(duty_timeline, duty) -> tuple:
     """Extract ULR compliance dict and inflight rest blocks."""
-    import pytz
-
     ulr_compliance_dict = None
-    if getattr(duty_timeline, 'ulr_compliance', None):
+    if duty_timeline.ulr_compliance:
         uc = duty_timeline.ulr_compliance
         ulr_compliance_dict = {
             'is_ulr': uc.is_ulr,
@@ -628,28 +871,29 @@ def _build_ulr_data(duty_timeline, duty) -> tuple:
             'warnings': uc.warnings,
         }
 
-    home_tz = pytz.timezone(duty.home_base_timezone)
-
-    inflight_blocks = []
-    rest_periods = []
-    if hasattr(duty, 'inflight_rest_plan') and duty.inflight_rest_plan:
-        rest_periods = duty.inflight_rest_plan.rest_periods
-
     # Only emit IR overlay bars when the PDF actually contained an `IR` activity code
     # on at least one segment.  For AUGMENTED_3 duties with no IR marker (e.g. the
     # outbound operating leg of a ULR pair), AugmentedCrewRestPlanner still generates
     # internal rest blocks to drive the fatigue model, but these should NOT appear as
     # IR overlay bars on the chronogram — the pilot is on the flight deck, not resting.
-    has_pdf_ir = getattr(duty, 'has_inflight_rest_segments', False)
+    if not duty.has_inflight_rest_segments:
+        return ulr_compliance_dict, []
+
+    home_tz = get_timezone(duty.home_base_timezone)
 
-    for i, block in enumerate(getattr(duty_timeline, 'inflight_rest_blocks', []) if has_pdf_ir else []):
+    inflight_blocks = []
+    rest_periods = []
+    if duty.inflight_rest_plan:
+        rest_periods = duty.inflight_rest_plan.rest_periods
+
+    for i, block in enumerate(duty_timeline.inflight_rest_blocks):
         period = rest_periods[i] if i < len(rest_periods) else None
 
         # Convert UTC block times to home-base TZ for chronogram positioning.
         # The frontend should use these pre-computed fields rather than doing
         # manual UTC→local arithmetic via departure segment offsets.
-        start_utc = block.start_utc.astimezone(pytz.utc) if block.start_utc else None
-        end_utc = block.end_utc.astimezone(pytz.utc) if block.end_utc else None
+        start_utc = _to_utc(block.start_utc) if block.start_utc else None
+        end_utc = _to_utc(block.end_utc) if block.end_utc else None
         start_home = start_utc.astimezone(home_tz) if start_utc else None
         end_home = end_utc.astimezone(home_tz) if end_utc else None
 
@@ -659,21 +903,21 @@ def _build_ulr_data(duty_timeline, duty) -> tuple:
             'end_utc': end_utc.isoformat() if end_utc else None,
             # Home-base TZ positioning — mirrors SleepBlockResponse fields.
             # Use these for chronogram bar placement (same reference as duty bars).
-            'start_home_tz': start_home.strftime('%H:%M') if start_home else None,
-            'end_home_tz': end_home.strftime('%H:%M') if end_home else None,
+            'start_home_tz': _hhmm(start_home) if start_home else None,
+            'end_home_tz': _hhmm(end_home) if end_home else None,
             'start_day_home_tz': start_home.day if start_home else None,
-            'start_hour_home_tz': (start_home.hour + start_home.minute / 60.0) if start_home else None,
+            'start_hour_home_tz': _hr(start_home) if start_home else None,
             'end_day_home_tz': end_home.day if end_home else None,
-            'end_hour_home_tz': (end_home.hour + end_home.minute / 60.0) if end_home else None,
+            'end_hour_home_tz': _hr(end_home) if end_home else None,
             'start_iso_home_tz': start_home.isoformat() if start_home else None,
             'end_iso_home_tz': end_home.isoformat() if end_home else None,
             # UTC precomputed day/hour for UTC chronogram rendering
             'start_day_utc': start_utc.day if start_utc else None,
-            'start_hour_utc': (start_utc.hour + start_utc.minute / 60.0) if start_utc else None,
+            'start_hour_utc': _hr(start_utc) if start_utc else None,
             'end_day_utc': end_utc.day if end_utc else None,
-            'end_hour_utc': (end_utc.hour + end_utc.minute / 60.0) if end_utc else None,
-            'start_time_utc': start_utc.strftime('%H:%M') if start_utc else None,
-            'end_time_utc': end_utc.strftime('%H:%M') if end_utc else None,
+            'end_hour_utc': _hr(end_utc) if end_utc else None,
+            'start_time_utc': _hhmm(start_utc) if start_utc else None,
+            'end_time_utc': _hhmm(end_utc) if end_utc else None,
             # Quality metrics
             'duration_hours': block.duration_hours,
             'effective_sleep_hours': block.effective_sleep_hours,
@@ -687,17 +931,42 @@ def _build_ulr_data(duty_timeline, duty) -> tuple:
     return ulr_compliance_dict, inflight_blocks
 
 
+# Typical cabin altitude (ft) by aircraft type token.  Matched as a substring
+# of the roster's aircraft type, first entry wins — keep the order.
+AIRCRAFT_CABIN_ALT = {
+    'A350': 6000, 'A359': 6000, 'A35K': 6000, '351': 6000, '359': 6000,
+    'A320': 7000, 'A321': 7000, 'A319': 7000, '320': 7000, '32Q': 7000, '321': 7000,
+    '777': 7300, '77W': 7300, '77L': 7300,
+    '787': 6000, '789': 6000, '78J': 6000,
+    'A330': 6900, '330': 6900, '333': 6900, '339': 6900,
+    'A380': 5000, '380': 5000, '388': 5000,
+}
+_CABIN_ALT_LOOKUP = tuple((key.upper(), float(alt)) for key, alt in AIRCRAFT_CABIN_ALT.items())
+
+
+@lru_cache(maxsize=128)
+def _cabin_altitude(aircraft_type: str) -> Optional[float]:
+    """Cabin altitude for an aircraft type string, or None if unrecognised."""
+    aircraft_type = aircraft_type.upper()
+    for key, alt in _CABIN_ALT_LOOKUP:
+        if key in aircraft_type:
+            return alt
+    return None
+
+
 def _build_duty_response(duty_timeline, duty, roster) -> DutyResponse:
-    """Shared serialization for a single duty — used by both POST and GET endpoints."""
-    import pytz
+    """Shared serialization for a single duty — used by both POST and GET endpoints.
 
+    Built with model_construct() like the segments; sleep_quality is the one
+    nested model still validated, since its sleep_blocks arrive as dicts.
+    """
     # For flight duties, risk is based on landing performance (the critical moment).
     # For training duties (no landing), risk is based on minimum performance.
     risk_score = duty_timeline.landing_performance
     if risk_score is None:
         risk_score = duty_timeline.min_performance
     risk = classify_risk(risk_score)
-    home_tz = pytz.timezone(duty.home_base_timezone)
+    home_tz = get_timezone(duty.home_base_timezone)
 
     segments = _build_segments(duty, home_tz)
     time_warnings = _validate_duty_times(duty)
@@ -705,42 +974,29 @@ def _build_duty_response(duty_timeline, duty, roster) -> DutyResponse:
     ulr_compliance_dict, inflight_blocks = _build_ulr_data(duty_timeline, duty)
 
     # Infer cabin altitude from per-segment aircraft type (fall back to roster header)
-    AIRCRAFT_CABIN_ALT = {
-        'A350': 6000, 'A359': 6000, 'A35K': 6000, '351': 6000, '359': 6000,
-        'A320': 7000, 'A321': 7000, 'A319': 7000, '320': 7000, '32Q': 7000, '321': 7000,
-        '777': 7300, '77W': 7300, '77L': 7300,
-        '787': 6000, '789': 6000, '78J': 6000,
-        'A330': 6900, '330': 6900, '333': 6900, '339': 6900,
-        'A380': 5000, '380': 5000, '388': 5000,
-    }
     # 1. Prefer per-segment aircraft type (first operating segment)
     aircraft_type_str = None
     if duty.segments:
         for seg in duty.segments:
-            if getattr(seg, 'aircraft_type', None) and not seg.is_deadhead and not seg.is_inflight_rest:
+            if seg.aircraft_type and not seg.is_deadhead and not seg.is_inflight_rest:
                 aircraft_type_str = seg.aircraft_type
                 break
         # Fall back to any segment with aircraft type
         if not aircraft_type_str:
             for seg in duty.segments:
-                if getattr(seg, 'aircraft_type', None):
+                if seg.aircraft_type:
                     aircraft_type_str = seg.aircraft_type
                     break
     # 2. Final fallback: roster-level pilot_aircraft from PDF header
-    if not aircraft_type_str and hasattr(roster, 'pilot_aircraft') and roster.pilot_aircraft:
+    if not aircraft_type_str and roster.pilot_aircraft:
         aircraft_type_str = roster.pilot_aircraft
     # 3. Resolve cabin altitude
-    cabin_alt = None
-    if aircraft_type_str:
-        for key, alt in AIRCRAFT_CABIN_ALT.items():
-            if key.upper() in aircraft_type_str.upper():
-                cabin_alt = float(alt)
-                break
+    cabin_alt = _cabin_altitude(aircraft_type_str) if aircraft_type_str else None
 
     # Extract worst-point S/C/W decomposition for immediate frontend rendering
     worst_point_dict = None
     if duty_timeline.timeline:
-        worst_pt = min(duty_timeline.timeline, key=lambda p: p.raw_performance)
+        worst_pt = min(duty_timeline.timeline, key=_RAW_PERFORMANCE)
         worst_point_dict = {
             "performance": worst_pt.raw_performance,
             "sleep_pressure": worst_pt.homeostatic_component,
@@ -756,26 +1012,31 @@ def _build_duty_response(duty_timeline, duty, roster) -> DutyResponse:
             "timestamp_local": worst_pt.timestamp_local.isoformat(),
         }
 
-    report_local = duty.report_time_utc.astimezone(home_tz)
-    release_local = duty.release_time_utc.astimezone(home_tz)
-    report_utc_z = duty.report_time_utc.astimezone(pytz.utc)
-    release_utc_z = duty.release_time_utc.astimezone(pytz.utc)
-
-    return DutyResponse(
+    # Every report/release representation derived once, up front.
+    report_utc = duty.report_time_utc
+    release_utc = duty.release_time_utc
+    report_iso = report_utc.isoformat()
+    release_iso = release_utc.isoformat()
+    report_local = _local_wallclock(report_utc, home_tz)
+    release_local = _local_wallclock(release_utc, home_tz)
+    report_utc_z = _to_utc(report_utc)
+    release_utc_z = _to_utc(release_utc)
+
+    return DutyResponse.model_construct(
         duty_id=duty_timeline.duty_id,
-        date=duty_timeline.duty_date.strftime("%Y-%m-%d"),
-        report_time_utc=duty.report_time_utc.isoformat(),
-        release_time_utc=duty.release_time_utc.isoformat(),
-        report_time_local=report_local.strftime("%H:%M"),
-        release_time_local=release_local.strftime("%H:%M"),
-        report_time_home_tz=report_local.strftime("%H:%M"),
-        release_time_home_tz=release_local.strftime("%H:%M"),
-        report_time_hhmm_utc=report_utc_z.strftime("%H:%M"),
-        release_time_hhmm_utc=release_utc_z.strftime("%H:%M"),
+        date=_ymd(duty_timeline.duty_date),
+        report_time_utc=report_iso,
+        release_time_utc=release_iso,
+        report_time_local=_hhmm(report_local),
+        release_time_local=_hhmm(release_local),
+        report_time_home_tz=_hhmm(report_local),
+        release_time_home_tz=_hhmm(release_local),
+        report_time_hhmm_utc=_hhmm(report_utc_z),
+        release_time_hhmm_utc=_hhmm(release_utc_z),
         report_day_utc=report_utc_z.day,
-        report_hour_utc=report_utc_z.hour + report_utc_z.minute / 60.0,
+        report_hour_utc=_hr(report_utc_z),
         release_day_utc=release_utc_z.day,
-        release_hour_utc=release_utc_z.hour + release_utc_z.minute / 60.0,
+        release_hour_utc=_hr(release_utc_z),
         duty_hours=duty.duty_hours,
         sectors=len(duty.segments),
         segments=segments,
@@ -802,21 +1063,37 @@ def _build_duty_response(duty_timeline, duty, roster) -> DutyResponse:
         cabin_altitude_ft=cabin_alt,
         aircraft_type=aircraft_type_str,
         # Training duty metadata
-        duty_type=duty.duty_type.value if hasattr(duty, 'duty_type') else 'flight',
-        training_code=getattr(duty, 'training_code', None),
-        training_annotations=getattr(duty, 'training_annotations', None),
+        duty_type=duty.duty_type.value,
+        training_code=duty.training_code,
+        training_annotations=duty.training_annotations,
         # Augmented crew / ULR
-        crew_composition=duty.crew_composition.value if hasattr(duty.crew_composition, 'value') else str(getattr(duty, 'crew_composition', 'standard')),
-        rest_facility_class=duty.rest_facility_class.value if getattr(duty, 'rest_facility_class', None) else None,
-        is_ulr=getattr(duty_timeline, 'is_ulr', False),
-        ulr_crew_set=duty.ulr_crew_set.value if getattr(duty, 'ulr_crew_set', None) else None,
-        acclimatization_state=duty_timeline.acclimatization_state.value if hasattr(getattr(duty_timeline, 'acclimatization_state', None), 'value') else str(getattr(duty_timeline, 'acclimatization_state', 'acclimatized')),
+        crew_composition=duty.crew_composition.value if hasattr(duty.crew_composition, 'value') else str(duty.crew_composition),
+        rest_facility_class=duty.rest_facility_class.value if duty.rest_facility_class else None,
+        is_ulr=duty_timeline.is_ulr,
+        ulr_crew_set=duty.ulr_crew_set.value if duty.ulr_crew_set else None,
+        acclimatization_state=duty_timeline.acclimatization_state.value if hasattr(duty_timeline.acclimatization_state, 'value') else str(duty_timeline.acclimatization_state),
         ulr_compliance=ulr_compliance_dict,
         inflight_rest_blocks=inflight_blocks,
-        return_to_deck_performance=getattr(duty_timeline, 'return_to_deck_performance', None),
+        return_to_deck_performance=duty_timeline.return_to_deck_performance,
     )
 
 
+def _build_duty_responses(duty_timelines, roster) -> List[DutyResponse]:
+    """Serialize every simulated duty of a roster, in timeline order.
+
+    Timelines whose duty is no longer in the roster are skipped.
+    """
+    duty_by_id = {d.duty_id: d for d in roster.duties}
+    responses = []
+    append = responses.append
+    for duty_timeline in duty_timelines:
+        duty = duty_by_id.get(duty_timeline.duty_id)
+        if duty is None:
+            continue
+        append(_build_duty_response(duty_timeline, duty, roster))
+    return responses
+
+
 def _build_rest_days_sleep(sleep_strategies: dict) -> List[RestDaySleepResponse]:
     """
     Extract rest-day sleep AND post-duty layover sleep from sleep_strategies dict.
@@ -836,11 +1113,11 @@ def _build_rest_days_sleep(sleep_strategies: dict) -> List[RestDaySleepResponse]
     # Build a per-duty suppression map: for each ULR duty key, the set of
     # ISO date strings (YYYY-MM-DD, home-base TZ) that its sleep blocks cover.
     #
-    # A gap-fill rest_YYYY-MM-DD entry is suppressed only when the ULR duty
-    # responsible for the SAME inter-duty gap has a block on that exact date.
-    # Using a GLOBAL set across all ULR duties caused false suppression: a
-    # gap-fill night between duty A and duty B was incorrectly hidden because a
-    # different ULR duty C→D happened to cover that same calendar day number.
+    # A gap-fill rest_YYYY-MM-DD entry is suppressed when any ULR pre-duty
+    # block covers that exact date.  Matching on the full ISO date (not the
+    # day-of-month number) is what prevents false suppression: a gap-fill
+    # night between duty A and duty B used to be hidden because a ULR duty in
+    # another month happened to cover the same calendar day number.
     #
     # Coverage rules per block (all dates in home-base TZ / ISO string):
     #   - The block's start ISO date is always covered (the 23:00 evening).
@@ -853,8 +1130,24 @@ def _build_rest_days_sleep(sleep_strategies: dict) -> List[RestDaySleepResponse]
     # ulr_duty_covered_dates: duty_key → set of YYYY-MM-DD strings
     ulr_duty_covered_dates: dict = {}   # duty_key → set[str]
 
+    # Emit candidates in sleep_strategies order: rest day sleep (rest_*),
+    # post-duty sleep (post_duty_*), AND duty-keyed ULR pre-duty sleep (e.g.
+    # 'D20260116').  The ULR blocks are stored per-duty so the frontend
+    # duties-loop path skips them (it can't handle the multi-night aggregate
+    # correctly); emitting them here lets the restDaysSleep path render each
+    # night individually.  Collected in the same pass as the coverage map.
+    candidates = []   # (key, data, is_rest)
+
+    # Per-duty / per-day trace lines are DEBUG only; check once so the sorts
+    # and f-strings below are skipped entirely on the production log level.
+    trace = logger.isEnabledFor(logging.DEBUG)
+
     for key, data in sleep_strategies.items():
-        if not key.startswith('rest_') and data.get('strategy_type') == 'ulr_pre_duty':
+        if key.startswith('rest_'):
+            candidates.append((key, data, True))
+            continue
+        is_ulr_pre_duty = data.get('strategy_type') == 'ulr_pre_duty'
+        if is_ulr_pre_duty:
             covered: set = set()
             for blk in data.get('sleep_blocks', []):
                 iso_start = blk.get('sleep_start_iso', '')
@@ -866,74 +1159,326 @@ def _build_rest_days_sleep(sleep_strategies: dict) -> List[RestDaySleepResponse]
                 if end_date and end_date != start_date:
                     covered.add(end_date)
             ulr_duty_covered_dates[key] = covered
-            logger.info(f"[ULR-SUPPRESS] duty={key} covered_dates={sorted(covered)}")
+            if trace:
+                logger.debug(f"[ULR-SUPPRESS] duty={key} covered_dates={sorted(covered)}")
+        if is_ulr_pre_duty or key.startswith('post_duty_'):
+            candidates.append((key, data, False))
 
-    logger.info(f"[ULR-SUPPRESS] rest_keys={sorted(k for k in sleep_strategies if k.startswith('rest_'))}")
+    if trace:
+        logger.debug(f"[ULR-SUPPRESS] rest_keys={sorted(k for k, _, is_rest in candidates if is_rest)}")
 
-    # Include rest day sleep (rest_*), post-duty sleep (post_duty_*), AND
-    # duty-keyed ULR pre-duty sleep (e.g. 'D20260116').  The ULR blocks are
-    # stored per-duty so the frontend duties-loop path skips them (it can't
-    # handle the multi-night aggregate correctly); emitting them here lets
-    # the restDaysSleep path render each night individually.
-    for key, data in sleep_strategies.items():
-        is_ulr_duty_key = (
-            not key.startswith('rest_')
-            and not key.startswith('post_duty_')
-            and data.get('strategy_type') == 'ulr_pre_duty'
-        )
-        if key.startswith('rest_') or key.startswith('post_duty_') or is_ulr_duty_key:
-            # Extract date from key (rest_2024-01-15, post_duty_D001, or duty-ID)
-            if key.startswith('rest_'):
-                date_str = key.replace('rest_', '')
-            else:
-                # For post-duty and ULR duty keys: derive date from first sleep block
-                blocks = data.get('sleep_blocks', [])
-                if blocks and blocks[0].get('sleep_start_iso'):
-                    # Extract date from ISO timestamp (YYYY-MM-DDTHH:mm...)
-                    date_str = blocks[0]['sleep_start_iso'].split('T')[0]
-                else:
-                    continue  # Skip if no date info available
+    # Union of every ULR duty's covered dates — one O(1) lookup per rest day.
+    all_covered_dates = frozenset().union(*ulr_duty_covered_dates.values())
+
+    for key, data, is_rest in candidates:
+        # Extract date from key (rest_2024-01-15, post_duty_D001, or duty-ID)
+        if is_rest:
+            date_str = key[5:]   # strip "rest_" prefix → "YYYY-MM-DD"
 
             # Suppress gap-fill recovery entries that are already rendered by a
-            # ULR pre-duty strategy for the same inter-duty gap.
+            # ULR pre-duty strategy.
             #
             # Match by FULL ISO date string (YYYY-MM-DD) extracted from the key
-            # (rest_2026-02-05 → "2026-02-05") against the per-duty covered-dates
-            # set built above.  This is unambiguous across month boundaries and
-            # avoids the day-of-month integer collision that caused false suppression
-            # when multiple ULR duties shared the same day number (e.g. day 5 of
-            # two different months, or two ULR duties in the same month whose
-            # covered-day sets merged globally).
-            if key.startswith('rest_'):
-                rest_date_str = key[5:]   # strip "rest_" prefix → "YYYY-MM-DD"
-                suppressed = any(
-                    rest_date_str in covered
-                    for covered in ulr_duty_covered_dates.values()
-                )
-                logger.info(f"[ULR-SUPPRESS] rest={rest_date_str} suppressed={suppressed}")
-                if suppressed:
-                    continue  # Already rendered by the ULR pre-duty strategy
-
-            rest_days.append(RestDaySleepResponse(
-                date=date_str,
-                sleep_blocks=data.get('sleep_blocks', []),
-                total_sleep_hours=data.get('total_sleep_hours', 0.0),
-                effective_sleep_hours=data.get('effective_sleep_hours', 0.0),
-                sleep_efficiency=data.get('sleep_efficiency', 0.0),
-                strategy_type=data.get('strategy_type', 'recovery'),
-                confidence=data.get('confidence', 0.0),
-                # Scientific methodology — now always populated
-                explanation=data.get('explanation'),
-                confidence_basis=data.get('confidence_basis'),
-                quality_factors=data.get('quality_factors'),
-                references=data.get('references', []),
-                # Recovery context
-                recovery_night_number=data.get('recovery_night_number'),
-                cumulative_recovery_fraction=data.get('cumulative_recovery_fraction'),
-            ))
+            # (rest_2026-02-05 → "2026-02-05") against the covered dates of
+            # all ULR duties built above.  This is unambiguous across month
+            # boundaries and avoids the day-of-month integer collision that
+            # caused false suppression when multiple ULR duties shared the same
+            # day number (e.g. day 5 of two different months).
+            suppressed = date_str in all_covered_dates
+            if trace:
+                logger.debug(f"[ULR-SUPPRESS] rest={date_str} suppressed={suppressed}")
+            if suppressed:
+                continue  # Already rendered by the ULR pre-duty strategy
+        else:
+            # For post-duty and ULR duty keys: derive date from first sleep block
+            blocks = data.get('sleep_blocks', [])
+            if blocks and blocks[0].get('sleep_start_iso'):
+                # Extract date from ISO timestamp (YYYY-MM-DDTHH:mm...)
+                date_str = blocks[0]['sleep_start_iso'].split('T')[0]
+            else:
+                continue  # Skip if no date info available
+
+        rest_days.append(RestDaySleepResponse(
+            date=date_str,
+            sleep_blocks=data.get('sleep_blocks', []),
+            total_sleep_hours=data.get('total_sleep_hours', 0.0),
+            effective_sleep_hours=data.get('effective_sleep_hours', 0.0),
+            sleep_efficiency=data.get('sleep_efficiency', 0.0),
+            strategy_type=data.get('strategy_type', 'recovery'),
+            confidence=data.get('confidence', 0.0),
+            # Scientific methodology — now always populated
+            explanation=data.get('explanation'),
+            confidence_basis=data.get('confidence_basis'),
+            quality_factors=data.get('quality_factors'),
+            references=data.get('references', []),
+            # Recovery context
+            recovery_night_number=data.get('recovery_night_number'),
+            cumulative_recovery_fraction=data.get('cumulative_recovery_fraction'),
+        ))
     return rest_days
 
 
+def _build_analysis_response(
+    analysis_id: str, monthly_analysis, roster, sleep_strategies: dict, **extra
+) -> AnalysisResponse:
+    """Assemble the full AnalysisResponse for a simulated roster.
+
+    Shared by analyze, get_analysis, reanalyze and what-if so the four
+    endpoints return the same shape. Endpoint-specific fields
+    (timezone_format, company_detection, continuity) come in via extra.
+    """
+    return AnalysisResponse(
+        analysis_id=analysis_id,
+        roster_id=roster.roster_id,
+        pilot_id=roster.pilot_id,
+        pilot_name=roster.pilot_name,
+        pilot_base=roster.pilot_base,
+        pilot_aircraft=roster.pilot_aircraft,
+        home_base_timezone=roster.home_base_timezone,
+        month=roster.month,
+        total_duties=roster.total_duties,
+        total_sectors=roster.total_sectors,
+        total_duty_hours=roster.total_duty_hours,
+        total_block_hours=roster.total_block_hours,
+        high_risk_duties=monthly_analysis.high_risk_duties,
+        critical_risk_duties=monthly_analysis.critical_risk_duties,
+        total_pinch_events=monthly_analysis.total_pinch_events,
+        avg_sleep_per_night=monthly_analysis.average_sleep_per_night,
+        max_sleep_debt=monthly_analysis.max_sleep_debt,
+        average_sleep_debt=monthly_analysis.average_sleep_debt,
+        worst_duty_id=monthly_analysis.lowest_performance_duty,
+        worst_performance=monthly_analysis.lowest_performance_value,
+        duties=_build_duty_responses(monthly_analysis.duty_timelines, roster),
+        rest_days_sleep=_build_rest_days_sleep(sleep_strategies),
+        # Already a list of plain dicts from the model; no per-point rebuild
+        body_clock_timeline=monthly_analysis.body_clock_timeline,
+        total_ulr_duties=monthly_analysis.total_ulr_duties,
+        total_augmented_duties=monthly_analysis.total_augmented_duties,
+        ulr_violations=monthly_analysis.ulr_violations,
+        **extra,
+    )
+
+
+def _build_timeline_rows(points) -> List[dict]:
+    """Duty timeline as one object per point."""
+    return [
+        {
+            "timestamp": p.timestamp_utc.isoformat(),
+            "timestamp_local": p.timestamp_local.isoformat(),
+            "performance": p.raw_performance,
+            "sleep_pressure": p.homeostatic_component,
+            "circadian": p.circadian_component,
+            # Factor form: 1.0 = no effect, <1.0 = degradation.
+            # The frontend displays (factor - 1.0) * 100 as a percentage.
+            "sleep_inertia": 1.0 - p.sleep_inertia_component,
+            "hours_on_duty": p.hours_on_duty,
+            "time_on_task_penalty": 1.0 - p.time_on_task_penalty,
+            "debt_penalty": p.debt_penalty,
+            "hypoxia_factor": p.hypoxia_factor,
+            "pvt_lapses": p.pvt_lapses,
+            "microsleep_probability": p.microsleep_probability,
+            "flight_phase": p.current_flight_phase.value if p.current_flight_phase else None,
+            "is_critical": p.is_critical_phase,
+            "is_in_rest": p.is_in_rest,
+        }
+        for p in points
+    ]
+
+
+def _build_timeline_columns(points) -> dict:
+    """Duty timeline as one list per field (same keys as the row format).
+
+    Keys are sent once instead of once per point, roughly halving the
+    payload for long duties, and charting code can feed the arrays
+    straight into a series.
+    """
+    return {
+        "timestamp": [p.timestamp_utc.isoformat() for p in points],
+        "timestamp_local": [p.timestamp_local.isoformat() for p in points],
+        "performance": [p.raw_performance for p in points],
+        "sleep_pressure": [p.homeostatic_component for p in points],
+        "circadian": [p.circadian_component for p in points],
+        "sleep_inertia": [1.0 - p.sleep_inertia_component for p in points],
+        "hours_on_duty": [p.hours_on_duty for p in points],
+        "time_on_task_penalty": [1.0 - p.time_on_task_penalty for p in points],
+        "debt_penalty": [p.debt_penalty for p in points],
+        "hypoxia_factor": [p.hypoxia_factor for p in points],
+        "pvt_lapses": [p.pvt_lapses for p in points],
+        "microsleep_probability": [p.microsleep_probability for p in points],
+        "flight_phase": [
+            p.current_flight_phase.value if p.current_flight_phase else None for p in points
+        ],
+        "is_critical": [p.is_critical_phase for p in points],
+        "is_in_rest": [p.is_in_rest for p in points],
+    }
+
+
+# Per-analysis locks so that concurrent requests for an analysis that has
+# dropped out of memory rebuild it once, not once per request.
+_restore_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+async def _restore_analysis(db, analysis_id: str) -> Optional[tuple]:
+    """Rebuild an analysis missing from analysis_store by re-parsing and
+    re-simulating the roster PDF stored with it, and put it back in the store.
+
+    Returns None when there is no such analysis or no stored PDF; parse and
+    simulation errors propagate to the caller.
+    """
+    if db is None:
+        return None
+
+    lock = _restore_locks.get(analysis_id)
+    if lock is None:
+        lock = _restore_locks[analysis_id] = asyncio.Lock()
+    async with lock:
+        # A request that held the lock before us may have rebuilt it already
+        cached = analysis_store.get(analysis_id)
+        if cached is not None:
+            return cached
+
+        # One round-trip for just the roster fields needed, not the
+        # analysis JSON
+        row = (await db.execute(
+            select(
+                Roster.original_file_bytes, Roster.config_preset,
+                Roster.pilot_id, Roster.home_base, Roster.month,
+            )
+            .join(Analysis, Analysis.roster_id == Roster.id)
+            .where(Analysis.id == analysis_id)
+        )).first()
+        if row is None or not row.original_file_bytes:
+            return None
+
+        parser = PDFRosterParser(home_base=row.home_base or "DOH", home_timezone="Asia/Qatar")
+        roster_obj = await asyncio.to_thread(
+            parser.parse_pdf_bytes,
+            row.original_file_bytes,
+            row.pilot_id or "P12345",
+            row.month or "2026-02",
+        )
+        model = BorbelyFatigueModel(_model_config(row.config_preset or "default"))
+        monthly_analysis = await asyncio.to_thread(model.simulate_roster, roster_obj)
+
+        cached = (monthly_analysis, roster_obj, model.sleep_strategies)
+        analysis_store[analysis_id] = cached
+        return cached
+
+
+def _final_fatigue_state(user_id, roster_id, month: str, monthly_analysis, roster) -> Optional[FatigueState]:
+    """End-of-roster fatigue state row, used to seed next month's analysis."""
+    if not monthly_analysis.duty_timelines:
+        return None
+    last_tl = monthly_analysis.duty_timelines[-1]
+    last_duty = roster.duties[-1]
+    fc = last_tl.final_circadian_state
+    return FatigueState(
+        user_id=user_id,
+        roster_id=roster_id,
+        month=month,
+        period_end_utc=last_duty.release_time_utc,
+        final_process_s=last_tl.final_process_s,
+        final_sleep_debt=last_tl.cumulative_sleep_debt,
+        final_phase_shift=fc.current_phase_shift_hours if fc else 0.0,
+        final_phase_tz=fc.reference_timezone if fc else roster.home_base_timezone,
+    )
+
+
+# Analyses that failed to save, newest last. On the background path the
+# user has already been told the upload was saved, so failures are kept
+# here (and counted on /health) as well as logged.
+_PERSIST_FAILURES_KEPT = 100
+_persist_failures: deque = deque(maxlen=_PERSIST_FAILURES_KEPT)
+_persist_failure_total = 0
+
+
+def _record_persist_failure(analysis_id: str, db_roster: Roster, user_id, month: str, error: Exception) -> None:
+    global _persist_failure_total
+    _persist_failure_total += 1
+    _persist_failures.append({
+        "analysis_id": analysis_id,
+        "roster_id": str(db_roster.id) if db_roster.id else None,
+        "filename": db_roster.filename,
+        "user_id": str(user_id),
+        "month": month,
+        "error": str(error),
+        "failed_at": datetime.now(_UTC).isoformat(),
+    })
+
+
+async def _persist_analysis(
+    db, db_roster: Roster, analysis_id: str, analysis_json: dict,
+    analysis_json_blob: bytes, monthly_analysis, roster,
+    user_id, company_id, month: str, replace_existing: bool = False,
+) -> None:
+    """Store a roster's analysis, its end-of-roster fatigue state, its
+    dashboard metrics row and the company metrics that depend on it.
+
+    db_roster may be new (analyze) or already stored (reanalyze, where
+    replace_existing drops the previous analysis); it is merged into db, so
+    it can come from a request session that has since closed. Failures are
+    logged rather than raised: in the background path the response has
+    already been sent. A failed analysis save is also recorded in
+    _persist_failures.
+    """
+    try:
+        db_roster = await db.merge(db_roster)
+        await db.flush()  # Get db_roster.id
+        if replace_existing:
+            await db.execute(sa_delete(Analysis).where(Analysis.roster_id == db_roster.id))
+        db.add(Analysis(
+            id=analysis_id,
+            roster_id=db_roster.id,
+            analysis_json=analysis_json,
+            analysis_json_blob=analysis_json_blob,
+        ))
+        await db.commit()
+        logger.info(f"Analysis {analysis_id} persisted to database for user {user_id}")
+    except Exception as e:
+        logger.error(
+            f"Failed to persist analysis {analysis_id} to DB "
+            f"(roster={db_roster.id}, user={user_id}, month={month}): {e}"
+        )
+        _record_persist_failure(analysis_id, db_roster, user_id, month, e)
+        await db.rollback()
+        return
+
+    # ── Save end-of-roster fatigue state for continuity ───
+    try:
+        fs = _final_fatigue_state(user_id, db_roster.id, month, monthly_analysis, roster)
+        if fs is not None:
+            await db.merge(fs)
+            await db.commit()
+            logger.info(
+                f"Fatigue state saved: month={month} "
+                f"S={fs.final_process_s:.3f} debt={fs.final_sleep_debt:.1f}h"
+            )
+    except Exception as e:
+        logger.warning(f"Failed to save fatigue state: {e}")
+        await db.rollback()
+
+    # ── Refresh the roster's yearly-dashboard row ───
+    try:
+        await refresh_monthly_metrics(db, db_roster.id)
+    except Exception as e:
+        logger.warning(f"Failed to refresh monthly metrics: {e}")
+        await db.rollback()
+
+    # ── Trigger comparative metrics aggregation ───
+    if company_id:
+        try:
+            await compute_aggregate_metrics(db, company_id, month)
+        except Exception as e:
+            logger.warning(f"Failed to compute aggregate metrics: {e}")
+
+
+async def _persist_analysis_in_background(**kwargs) -> None:
+    """BackgroundTasks entry point: _persist_analysis on its own session,
+    since the request's session is closed once the response is sent."""
+    async with AsyncSessionLocal() as db:
+        await _persist_analysis(db, **kwargs)
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -952,8 +1497,6 @@ async def root():
 @app.get("/debug/timezone-test")
 async def timezone_test():
     """Debug endpoint to test timezone conversions"""
-    import pytz
-    from datetime import datetime
 
     # Test case from screenshot: CCJ → DOH
     dep_utc_str = "2026-02-01T22:25:00Z"
@@ -963,8 +1506,8 @@ async def timezone_test():
     arr_utc = datetime.fromisoformat(arr_utc_str.replace('Z', '+00:00'))
 
     # Convert to different timezones
-    india_tz = pytz.timezone("Asia/Kolkata")
-    qatar_tz = pytz.timezone("Asia/Qatar")
+    india_tz = get_timezone("Asia/Kolkata")
+    qatar_tz = get_timezone("Asia/Qatar")
 
     return {
         "departure_utc": dep_utc_str,
@@ -991,12 +1534,22 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "analysis_cache": analysis_store.stats(),
+        "persist_failures": {
+            "total": _persist_failure_total,
+            "last_failed_at": _persist_failures[-1]["failed_at"] if _persist_failures else None,
+        },
     }
 
 
+# Uploads are copied to their temp file in 1 MiB chunks.
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
 @app.post("/api/analyze", response_model=AnalysisResponse)
 async def analyze_roster(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     pilot_id: str = Form("P12345"),
     month: str = Form("2026-02"),
@@ -1006,13 +1559,15 @@ async def analyze_roster(
     timezone_format: str = Form("auto"),
     crew_set: str = Form("crew_b"),
     duty_crew_overrides: str = Form("{}"),
+    wait: bool = Query(False),
     user: Optional[User] = Depends(get_optional_user),
     db=Depends(get_db),
 ):
     """
     Upload roster file and get fatigue analysis.
 
-    When authenticated: persists roster + analysis to database.
+    When authenticated: persists roster + analysis to database, after the
+    response is sent (or before it, with ?wait=true).
     When anonymous: stores in-memory only (lost on restart).
     """
     
@@ -1026,11 +1581,13 @@ async def analyze_roster(
         if suffix not in ['.pdf', '.csv']:
             raise HTTPException(status_code=400, detail="Unsupported file format. Use PDF or CSV.")
         
+        # Spool the upload to disk in chunks, off the event loop, instead of
+        # buffering the whole file in memory first.
         with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = await file.read()
-            tmp.write(content)
+            await asyncio.to_thread(shutil.copyfileobj, file.file, tmp, UPLOAD_CHUNK_SIZE)
             tmp_path = tmp.name
-        
+
+        content = None  # raw upload bytes, only loaded when they will be persisted
         try:
             # Validate timezone_format parameter
             valid_tz_formats = ('auto', 'local', 'homebase', 'zulu')
@@ -1047,13 +1604,16 @@ async def analyze_roster(
                     home_timezone=home_timezone,
                     timezone_format=timezone_format.lower()
                 )
-                roster = parser.parse_pdf(tmp_path, pilot_id, month)
+                roster = await asyncio.to_thread(parser.parse_pdf, tmp_path, pilot_id, month)
             else:  # CSV
                 parser = CSVRosterParser(
                     home_base=home_base,
                     home_timezone=home_timezone
                 )
-                roster = parser.parse_csv(tmp_path, pilot_id, month)
+                roster = await asyncio.to_thread(parser.parse_csv, tmp_path, pilot_id, month)
+
+            if user is not None and db is not None:
+                content = await asyncio.to_thread(Path(tmp_path).read_bytes)
         finally:
             # Clean up temp file
             os.unlink(tmp_path)
@@ -1063,37 +1623,45 @@ async def analyze_roster(
             raise HTTPException(status_code=400, detail="No duties found in roster")
 
         # Apply per-duty crew set overrides (parser auto-detection is preserved as default)
-        from models.data_models import ULRCrewSet
 
         overrides_dict = {}
         try:
             overrides_dict = json.loads(duty_crew_overrides) if duty_crew_overrides else {}
         except (json.JSONDecodeError, TypeError):
             logger.warning("Invalid duty_crew_overrides JSON, ignoring")
+        if not isinstance(overrides_dict, dict):
+            logger.warning("duty_crew_overrides is not a JSON object, ignoring")
+            overrides_dict = {}
 
-        # Only override duties that have an explicit per-duty override;
+        # Only override duties that have an explicit, valid per-duty override;
         # parser-detected defaults (from auto_detect_crew_augmentation) are preserved.
+        # Resolved up front so the duty loop is a single dict lookup, and
+        # skipped entirely in the usual no-override case.
         valid_crew_sets = {'crew_a': ULRCrewSet.CREW_A, 'crew_b': ULRCrewSet.CREW_B}
-
-        for d in roster.duties:
-            if hasattr(d, 'ulr_crew_set') and d.duty_id in overrides_dict:
-                override_val = valid_crew_sets.get(overrides_dict[d.duty_id])
-                if override_val:
+        crew_overrides = {
+            duty_id: valid_crew_sets[value]
+            for duty_id, value in overrides_dict.items()
+            if isinstance(value, str) and value in valid_crew_sets
+        }
+        if crew_overrides:
+            for d in roster.duties:
+                override_val = crew_overrides.get(d.duty_id)
+                if override_val is not None:
                     d.ulr_crew_set = override_val
-        
+
         # ── Company detection & fleet/role extraction ──────────────────
         # Only run airline detection if user has no company yet
         company_detection_result = None
         if user is not None and user.company_id is None:
             try:
                 # Gather detection signals from the parser
-                roster_format = getattr(parser, 'detected_format', None) or ''
-                raw_pdf_text = getattr(parser, 'raw_pdf_text', None) or ''
+                roster_format = parser.detected_format or ''
+                raw_pdf_text = parser.raw_pdf_text
                 flight_numbers = [
                     seg.flight_number
                     for d in roster.duties
                     for seg in d.segments
-                    if hasattr(seg, 'flight_number') and seg.flight_number
+                    if seg.flight_number
                 ]
                 airline_guess = detect_airline(
                     roster_format=roster_format,
@@ -1114,7 +1682,7 @@ async def analyze_roster(
         extracted_fleet = None
         extracted_pilot_role = None
         try:
-            pilot_info = getattr(parser, 'pilot_info', {}) or {}
+            pilot_info = parser.pilot_info
             fleet_role = extract_fleet_and_role(pilot_info)
             extracted_fleet = fleet_role.get('fleet')
             extracted_pilot_role = fleet_role.get('pilot_role')
@@ -1122,16 +1690,7 @@ async def analyze_roster(
             logger.warning(f"Fleet/role extraction failed: {e}")
 
         # Get config
-        config_map = {
-            "default": ModelConfig.operational_config,
-            "operational": ModelConfig.operational_config,
-            "easa_default": ModelConfig.default_easa_config,
-            "conservative": ModelConfig.conservative_config,
-            "liberal": ModelConfig.operational_config,  # legacy → operational
-            "research": ModelConfig.research_config
-        }
-        config_func = config_map.get(config_preset, ModelConfig.operational_config)
-        config = config_func()
+        config = _model_config(config_preset)
 
         # Use the month actually parsed from the roster (not the form default)
         effective_month = roster.month or month
@@ -1141,9 +1700,8 @@ async def analyze_roster(
         initial_conditions_dict = None
         if user is not None and db is not None:
             try:
-                from sqlalchemy import select as sa_select
                 prior_result = await db.execute(
-                    sa_select(FatigueState)
+                    select(FatigueState)
                     .where(FatigueState.user_id == user.id)
                     .where(FatigueState.month < effective_month)
                     .order_by(FatigueState.month.desc())
@@ -1179,19 +1737,34 @@ async def analyze_roster(
 
         # Run analysis
         model = BorbelyFatigueModel(config)
-        monthly_analysis = model.simulate_roster(roster)
+        monthly_analysis = await asyncio.to_thread(model.simulate_roster, roster)
 
         # Generate analysis ID
-        analysis_id = f"{pilot_id}_{effective_month}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        analysis_id = _new_analysis_id(pilot_id, effective_month)
 
         # Store for later retrieval (include sleep_strategies for GET endpoint)
         analysis_store[analysis_id] = (monthly_analysis, roster, model.sleep_strategies)
 
+        # Get effective timezone format (what the parser actually used)
+        effective_tz_format = parser.effective_timezone_format or timezone_format
+
+        response = _build_analysis_response(
+            analysis_id, monthly_analysis, roster, model.sleep_strategies,
+            timezone_format=effective_tz_format,
+            company_detection=company_detection_result,
+            continuity_from_month=continuity_from_month,
+            initial_conditions=initial_conditions_dict,
+        )
+        # Serialized once: stored as the Analysis row and returned as the body
+        analysis_json = response.model_dump(mode="json")
+        analysis_json_blob = to_json(analysis_json)
+        analysis_store.set_encoded(analysis_id, analysis_json_blob)
+
         # Persist to database when user is authenticated
         if user is not None and db is not None:
-            try:
+            persist_kwargs = dict(
                 # Store roster with original PDF bytes
-                db_roster = Roster(
+                db_roster=Roster(
                     user_id=user.id,
                     filename=file.filename or "roster.pdf",
                     month=effective_month,
@@ -1206,126 +1779,22 @@ async def analyze_roster(
                     company_id=user.company_id,  # Copy from user (may be None)
                     fleet=extracted_fleet,
                     pilot_role=extracted_pilot_role,
-                )
-                db.add(db_roster)
-                await db.flush()  # Get db_roster.id
-
-                # Build response JSON for storage (we'll serialize AnalysisResponse)
-                # Done after building duties_response below
-                _pending_db_roster = db_roster
-                _pending_analysis_id = analysis_id
-            except Exception as e:
-                logger.warning(f"Failed to persist roster to DB: {e}")
-                _pending_db_roster = None
-                _pending_analysis_id = None
-        else:
-            _pending_db_roster = None
-            _pending_analysis_id = None
-
-        # Build response using shared helper
-        duties_response = []
-        for duty_timeline in monthly_analysis.duty_timelines:
-            duty_idx = roster.get_duty_index(duty_timeline.duty_id)
-            if duty_idx is None:
-                continue
-            duties_response.append(
-                _build_duty_response(duty_timeline, roster.duties[duty_idx], roster)
+                ),
+                analysis_id=analysis_id,
+                analysis_json=analysis_json,
+                analysis_json_blob=analysis_json_blob,
+                monthly_analysis=monthly_analysis,
+                roster=roster,
+                user_id=user.id,
+                company_id=user.company_id,
+                month=effective_month,
             )
+            if wait:
+                await _persist_analysis(db, **persist_kwargs)
+            else:
+                background_tasks.add_task(_persist_analysis_in_background, **persist_kwargs)
 
-        rest_days_sleep = _build_rest_days_sleep(model.sleep_strategies)
-        
-        # Get effective timezone format (what the parser actually used)
-        effective_tz_format = getattr(parser, 'effective_timezone_format', timezone_format)
-
-        response = AnalysisResponse(
-            analysis_id=analysis_id,
-            roster_id=roster.roster_id,
-            pilot_id=roster.pilot_id,
-            pilot_name=roster.pilot_name,
-            pilot_base=roster.pilot_base,
-            pilot_aircraft=roster.pilot_aircraft,
-            home_base_timezone=roster.home_base_timezone,
-            timezone_format=effective_tz_format,
-            month=roster.month,
-            total_duties=roster.total_duties,
-            total_sectors=roster.total_sectors,
-            total_duty_hours=roster.total_duty_hours,
-            total_block_hours=roster.total_block_hours,
-            high_risk_duties=monthly_analysis.high_risk_duties,
-            critical_risk_duties=monthly_analysis.critical_risk_duties,
-            total_pinch_events=monthly_analysis.total_pinch_events,
-            avg_sleep_per_night=monthly_analysis.average_sleep_per_night,
-            max_sleep_debt=monthly_analysis.max_sleep_debt,
-            average_sleep_debt=getattr(monthly_analysis, 'average_sleep_debt', 0.0),
-            worst_duty_id=monthly_analysis.lowest_performance_duty,
-            worst_performance=monthly_analysis.lowest_performance_value,
-            duties=duties_response,
-            rest_days_sleep=rest_days_sleep,
-            body_clock_timeline=[
-                {'timestamp_utc': ts, 'phase_shift_hours': ps, 'reference_timezone': tz}
-                for ts, ps, tz in monthly_analysis.body_clock_timeline
-            ],
-            total_ulr_duties=getattr(monthly_analysis, 'total_ulr_duties', 0),
-            total_augmented_duties=getattr(monthly_analysis, 'total_augmented_duties', 0),
-            ulr_violations=getattr(monthly_analysis, 'ulr_violations', []),
-            company_detection=company_detection_result,
-            continuity_from_month=continuity_from_month,
-            initial_conditions=initial_conditions_dict,
-        )
-
-        # Persist analysis JSON to database if roster was stored
-        if _pending_db_roster is not None and db is not None:
-            try:
-                db_analysis = Analysis(
-                    id=analysis_id,
-                    roster_id=_pending_db_roster.id,
-                    analysis_json=response.model_dump(mode="json"),
-                )
-                db.add(db_analysis)
-                await db.commit()
-                logger.info(f"Analysis {analysis_id} persisted to database for user {user.id}")
-
-                # ── Save end-of-roster fatigue state for continuity ───
-                try:
-                    if monthly_analysis.duty_timelines:
-                        last_tl = monthly_analysis.duty_timelines[-1]
-                        last_duty = roster.duties[-1]
-                        fc = last_tl.final_circadian_state
-
-                        fs = FatigueState(
-                            user_id=user.id,
-                            roster_id=_pending_db_roster.id,
-                            month=effective_month,
-                            period_end_utc=last_duty.release_time_utc,
-                            final_process_s=last_tl.final_process_s,
-                            final_sleep_debt=last_tl.cumulative_sleep_debt,
-                            final_phase_shift=fc.current_phase_shift_hours if fc else 0.0,
-                            final_phase_tz=fc.reference_timezone if fc else roster.home_base_timezone,
-                        )
-                        await db.merge(fs)
-                        await db.commit()
-                        logger.info(
-                            f"Fatigue state saved: month={effective_month} "
-                            f"S={last_tl.final_process_s:.3f} "
-                            f"debt={last_tl.cumulative_sleep_debt:.1f}h"
-                        )
-                except Exception as e:
-                    logger.warning(f"Failed to save fatigue state: {e}")
-                    await db.rollback()
-
-                # ── Trigger comparative metrics aggregation ───
-                if user.company_id:
-                    try:
-                        from metrics.aggregator import compute_aggregate_metrics
-                        await compute_aggregate_metrics(db, user.company_id, effective_month)
-                    except Exception as e:
-                        logger.warning(f"Failed to compute aggregate metrics: {e}")
-
-            except Exception as e:
-                logger.warning(f"Failed to persist analysis to DB: {e}")
-                await db.rollback()
-
-        return response
+        return Response(content=analysis_json_blob, media_type="application/json")
 
     except HTTPException:
         raise
@@ -1334,139 +1803,100 @@ async def analyze_roster(
 
 
 @app.get("/api/analysis/{analysis_id}")
-async def get_analysis(analysis_id: str, db=Depends(get_db)):
+async def get_analysis(analysis_id: str, request: Request, db=Depends(get_db)):
     """Retrieve stored analysis by ID.
 
-    Tries in-memory store first, then falls back to database.
+    Serves the full encoded response from memory or the database; only
+    without either does it rebuild one from the in-memory model objects.
     """
-
-    # 1. Try in-memory store (current session)
-    if analysis_id in analysis_store:
-        monthly_analysis, roster, sleep_strategies = analysis_store[analysis_id]
-
-        # Build duties response using shared helper
-        duties_response = []
-        for duty_timeline in monthly_analysis.duty_timelines:
-            duty_idx = roster.get_duty_index(duty_timeline.duty_id)
-            if duty_idx is None:
-                continue
-            duties_response.append(
-                _build_duty_response(duty_timeline, roster.duties[duty_idx], roster)
-            )
-
-        rest_days_sleep = _build_rest_days_sleep(sleep_strategies)
-
-        return AnalysisResponse(
-            analysis_id=analysis_id,
-            roster_id=roster.roster_id,
-            pilot_id=roster.pilot_id,
-            pilot_name=roster.pilot_name,
-            pilot_base=roster.pilot_base,
-            pilot_aircraft=roster.pilot_aircraft,
-            home_base_timezone=roster.home_base_timezone,
-            month=roster.month,
-            total_duties=roster.total_duties,
-            total_sectors=roster.total_sectors,
-            total_duty_hours=roster.total_duty_hours,
-            total_block_hours=roster.total_block_hours,
-            high_risk_duties=monthly_analysis.high_risk_duties,
-            critical_risk_duties=monthly_analysis.critical_risk_duties,
-            total_pinch_events=monthly_analysis.total_pinch_events,
-            avg_sleep_per_night=monthly_analysis.average_sleep_per_night,
-            max_sleep_debt=monthly_analysis.max_sleep_debt,
-            average_sleep_debt=getattr(monthly_analysis, 'average_sleep_debt', 0.0),
-            worst_duty_id=monthly_analysis.lowest_performance_duty,
-            worst_performance=monthly_analysis.lowest_performance_value,
-            duties=duties_response,
-            rest_days_sleep=rest_days_sleep,
-            body_clock_timeline=[
-                {'timestamp_utc': ts, 'phase_shift_hours': ps, 'reference_timezone': tz}
-                for ts, ps, tz in monthly_analysis.body_clock_timeline
-            ],
-            total_ulr_duties=getattr(monthly_analysis, 'total_ulr_duties', 0),
-            total_augmented_duties=getattr(monthly_analysis, 'total_augmented_duties', 0),
-            ulr_violations=getattr(monthly_analysis, 'ulr_violations', []),
+    etag = _analysis_etag(analysis_id)
+
+    # 1. The encoded response kept in memory since it was analysed
+    analysis_json_blob = analysis_store.get_encoded(analysis_id)
+    if analysis_json_blob is not None:
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        return _set_immutable(
+            Response(content=analysis_json_blob, media_type="application/json"), etag
         )
 
-    # 2. Fallback to database
+    # 2. The stored response (already AnalysisResponse format): the
+    #    pre-encoded bytes when present, else re-encode the JSONB
     if db is not None:
-        from sqlalchemy import select
-        result = await db.execute(
-            select(Analysis).where(Analysis.id == analysis_id)
-        )
-        db_analysis = result.scalar_one_or_none()
-        if db_analysis is not None:
-            # Return the stored JSON directly (it's already AnalysisResponse format)
-            return JSONResponse(content=db_analysis.analysis_json)
+        if _etag_matches(request, etag):
+            if await _analysis_in_db(db, analysis_id):
+                return _not_modified(etag)
+        else:
+            blob = (await db.execute(
+                select(Analysis.analysis_json_blob).where(Analysis.id == analysis_id)
+            )).first()
+            if blob is not None:
+                if blob[0] is not None:
+                    # Keep it with the model objects if those are in memory
+                    analysis_store.set_encoded(analysis_id, blob[0])
+                    return _set_immutable(
+                        Response(content=blob[0], media_type="application/json"), etag
+                    )
+                analysis_json = (await db.execute(
+                    select(Analysis.analysis_json).where(Analysis.id == analysis_id)
+                )).scalar_one()
+                return _set_immutable(JSONResponse(content=analysis_json), etag)
+
+    # 3. Only the model objects in memory. The rebuilt response lacks the
+    #    upload-time fields (timezone_format, company_detection, ...), so it
+    #    gets its own ETag and isn't kept as the encoded response
+    cached = analysis_store.get(analysis_id)
+    if cached is not None:
+        etag = _analysis_etag(analysis_id, "rebuilt")
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        monthly_analysis, roster, sleep_strategies = cached
+        return _set_immutable(Response(
+            content=to_json(_build_analysis_response(
+                analysis_id, monthly_analysis, roster, sleep_strategies
+            ).model_dump(mode="json")),
+            media_type="application/json",
+        ), etag)
 
     raise HTTPException(status_code=404, detail="Analysis not found")
 
 
 @app.get("/api/duty/{analysis_id}/{duty_id}")
-async def get_duty_detail(analysis_id: str, duty_id: str, db=Depends(get_db)):
+async def get_duty_detail(
+    analysis_id: str,
+    duty_id: str,
+    request: Request,
+    response: Response,
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
+    db=Depends(get_db),
+):
     """
     Get detailed timeline data for a single duty.
     Returns all performance points for interactive charting.
 
+    format=rows (default): "timeline" is a list of one object per point.
+    format=columnar: "timeline" is one object of per-field arrays.
+
     Falls back to re-analyzing from stored PDF if not in memory.
     """
-
-    if analysis_id not in analysis_store:
+    etag = _analysis_etag(analysis_id, duty_id, format)
+    if _etag_matches(request, etag) and (
+        analysis_id in analysis_store or await _analysis_in_db(db, analysis_id)
+    ):
+        return _not_modified(etag)
+
+    cached = analysis_store.get(analysis_id)
+    if cached is None:
         # Try to re-analyze from database
-        if db is not None:
-            from sqlalchemy import select
-            from sqlalchemy.orm import selectinload
-
-            result = await db.execute(
-                select(Analysis).where(Analysis.id == analysis_id).options(
-                    selectinload(Analysis.roster)
-                )
-            )
-            db_analysis = result.scalar_one_or_none()
-
-            if db_analysis is not None and db_analysis.roster and db_analysis.roster.original_file_bytes:
-                try:
-                    # Re-parse and re-analyze from stored PDF
-                    db_roster_model = db_analysis.roster
-                    pdf_bytes = db_roster_model.original_file_bytes
-                    preset = db_roster_model.config_preset or "default"
-                    pilot = db_roster_model.pilot_id or "P12345"
-                    base = db_roster_model.home_base or "DOH"
-                    month_str = db_roster_model.month or "2026-02"
-
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                        tmp.write(pdf_bytes)
-                        tmp_path = tmp.name
-
-                    try:
-                        parser = PDFRosterParser(home_base=base, home_timezone="Asia/Qatar")
-                        roster_obj = parser.parse_pdf(tmp_path, pilot, month_str)
-                    finally:
-                        os.unlink(tmp_path)
-
-                    config_map = {
-                        "default": ModelConfig.operational_config,
-                        "operational": ModelConfig.operational_config,
-                        "easa_default": ModelConfig.default_easa_config,
-                        "conservative": ModelConfig.conservative_config,
-                        "liberal": ModelConfig.operational_config,  # legacy → operational
-                        "research": ModelConfig.research_config,
-                    }
-                    config = config_map.get(preset, ModelConfig.operational_config)()
-                    model = BorbelyFatigueModel(config)
-                    monthly_analysis_obj = model.simulate_roster(roster_obj)
-
-                    # Cache for subsequent requests
-                    analysis_store[analysis_id] = (monthly_analysis_obj, roster_obj, model.sleep_strategies)
-                except Exception as e:
-                    logger.warning(f"Failed to re-analyze from stored PDF: {e}")
-                    raise HTTPException(status_code=404, detail="Analysis not found (re-analysis failed)")
-            else:
-                raise HTTPException(status_code=404, detail="Analysis not found")
-        else:
+        try:
+            cached = await _restore_analysis(db, analysis_id)
+        except Exception as e:
+            logger.warning(f"Failed to re-analyze from stored PDF: {e}")
+            raise HTTPException(status_code=404, detail="Analysis not found (re-analysis failed)")
+        if cached is None:
             raise HTTPException(status_code=404, detail="Analysis not found")
 
-    monthly_analysis, roster, _sleep_strategies = analysis_store[analysis_id]
+    monthly_analysis, roster, _sleep_strategies = cached
 
     # Find duty
     duty_timeline = None
@@ -1479,28 +1909,12 @@ async def get_duty_detail(analysis_id: str, duty_id: str, db=Depends(get_db)):
         raise HTTPException(status_code=404, detail="Duty not found")
     
     # Build timeline data for frontend charting
-    timeline_data = []
-    
-    for point in duty_timeline.timeline:
-        timeline_data.append({
-            "timestamp": point.timestamp_utc.isoformat(),
-            "timestamp_local": point.timestamp_local.isoformat(),
-            "performance": point.raw_performance,
-            "sleep_pressure": point.homeostatic_component,
-            "circadian": point.circadian_component,
-            # Factor form: 1.0 = no effect, <1.0 = degradation.
-            # The frontend displays (factor - 1.0) * 100 as a percentage.
-            "sleep_inertia": 1.0 - point.sleep_inertia_component,
-            "hours_on_duty": point.hours_on_duty,
-            "time_on_task_penalty": 1.0 - point.time_on_task_penalty,
-            "debt_penalty": point.debt_penalty,
-            "hypoxia_factor": point.hypoxia_factor,
-            "pvt_lapses": point.pvt_lapses,
-            "microsleep_probability": point.microsleep_probability,
-            "flight_phase": point.current_flight_phase.value if point.current_flight_phase else None,
-            "is_critical": point.is_critical_phase,
-            "is_in_rest": getattr(point, 'is_in_rest', False),
-        })
+    if format == "columnar":
+        timeline_data = _build_timeline_columns(duty_timeline.timeline)
+    else:
+        timeline_data = _build_timeline_rows(duty_timeline.timeline)
+
+    _set_immutable(response, etag)
 
     return {
         "duty_id": duty_id,
@@ -1527,13 +1941,18 @@ async def get_duty_detail(analysis_id: str, duty_id: str, db=Depends(get_db)):
 
 
 @app.get("/api/statistics/{analysis_id}")
-async def get_statistics(analysis_id: str):
+async def get_statistics(analysis_id: str, request: Request, response: Response):
     """Get summary statistics for frontend dashboard"""
-    
-    if analysis_id not in analysis_store:
+    etag = _analysis_etag(analysis_id, "statistics")
+    if _etag_matches(request, etag) and analysis_id in analysis_store:
+        return _not_modified(etag)
+
+    cached = analysis_store.get(analysis_id)
+    if cached is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    monthly_analysis, roster, _sleep_strategies = analysis_store[analysis_id]
+    monthly_analysis, roster, _sleep_strategies = cached
+    _set_immutable(response, etag)
 
     # Calculate additional statistics
     all_perfs = [dt.landing_performance for dt in monthly_analysis.duty_timelines 
@@ -1562,7 +1981,7 @@ async def get_statistics(analysis_id: str):
         "sleep": {
             "avg_sleep_per_night": monthly_analysis.average_sleep_per_night,
             "max_sleep_debt": monthly_analysis.max_sleep_debt,
-            "average_sleep_debt": getattr(monthly_analysis, 'average_sleep_debt', 0.0),
+            "average_sleep_debt": monthly_analysis.average_sleep_debt,
         }
     }
 
@@ -1589,6 +2008,23 @@ class RosterSummaryResponse(BaseModel):
     created_at: str
 
 
+# Roster columns the listing endpoints need. Selecting these instead of the
+# Roster entity keeps the stored PDF bytes out of the result set.
+_ROSTER_SUMMARY_COLUMNS = (
+    Roster.id,
+    Roster.filename,
+    Roster.month,
+    Roster.pilot_id,
+    Roster.home_base,
+    Roster.config_preset,
+    Roster.total_duties,
+    Roster.total_sectors,
+    Roster.total_duty_hours,
+    Roster.total_block_hours,
+    Roster.created_at,
+)
+
+
 @app.get("/api/rosters", response_model=List[RosterSummaryResponse])
 async def list_rosters(
     user: User = Depends(_get_current_user),
@@ -1598,16 +2034,19 @@ async def list_rosters(
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-
+    # Only the analysis id is listed, so fetch it with a correlated
+    # subquery rather than loading every roster's analysis JSON.
+    analysis_id = (
+        select(Analysis.id)
+        .where(Analysis.roster_id == Roster.id)
+        .limit(1)
+        .scalar_subquery()
+    )
     result = await db.execute(
-        select(Roster)
+        select(*_ROSTER_SUMMARY_COLUMNS, analysis_id.label("analysis_id"))
         .where(Roster.user_id == user.id)
-        .options(selectinload(Roster.analyses))
         .order_by(Roster.created_at.desc())
     )
-    rosters = result.scalars().all()
 
     return [
         RosterSummaryResponse(
@@ -1621,10 +2060,10 @@ async def list_rosters(
             total_sectors=r.total_sectors,
             total_duty_hours=r.total_duty_hours,
             total_block_hours=r.total_block_hours,
-            analysis_id=r.analyses[0].id if r.analyses else None,
+            analysis_id=r.analysis_id,
             created_at=r.created_at.isoformat() if r.created_at else "",
         )
-        for r in rosters
+        for r in result
     ]
 
 
@@ -1638,24 +2077,24 @@ async def get_roster(
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-
     result = await db.execute(
-        select(Roster)
+        select(*_ROSTER_SUMMARY_COLUMNS)
         .where(Roster.id == roster_id, Roster.user_id == user.id)
-        .options(selectinload(Roster.analyses))
     )
-    roster = result.scalar_one_or_none()
+    roster = result.one_or_none()
 
     if roster is None:
         raise HTTPException(404, "Roster not found")
 
     analysis_json = None
     analysis_id = None
-    if roster.analyses:
-        analysis_json = roster.analyses[0].analysis_json
-        analysis_id = roster.analyses[0].id
+    analysis = (await db.execute(
+        select(Analysis.id, Analysis.analysis_json)
+        .where(Analysis.roster_id == roster.id)
+        .limit(1)
+    )).first()
+    if analysis is not None:
+        analysis_id, analysis_json = analysis
 
     return {
         "id": str(roster.id),
@@ -1684,8 +2123,6 @@ async def delete_roster(
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    from sqlalchemy import select
-
     result = await db.execute(
         select(Roster).where(Roster.id == roster_id, Roster.user_id == user.id)
     )
@@ -1701,17 +2138,22 @@ async def delete_roster(
 @app.post("/api/rosters/{roster_id}/reanalyze")
 async def reanalyze_roster(
     roster_id: str,
+    background_tasks: BackgroundTasks,
     config_preset: str = Form("default"),
     crew_set: str = Form("crew_b"),
+    wait: bool = Query(True),
     user: User = Depends(_get_current_user),
     db=Depends(get_db),
 ):
-    """Re-run analysis on a stored roster with different settings."""
+    """Re-run analysis on a stored roster with different settings.
+
+    The new analysis replaces the stored one before the response is sent,
+    since the client re-reads the roster list as soon as it arrives
+    (?wait=false saves it afterwards instead).
+    """
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    from sqlalchemy import select
-
     result = await db.execute(
         select(Roster).where(Roster.id == roster_id, Roster.user_id == user.id)
     )
@@ -1720,30 +2162,30 @@ async def reanalyze_roster(
     if db_roster is None:
         raise HTTPException(404, "Roster not found")
 
-    if not db_roster.original_file_bytes:
+    # Fetched as a bare column (it is deferred on Roster) so the PDF never
+    # becomes part of db_roster's state and is not re-sent when db_roster
+    # is merged for persistence.
+    pdf_bytes = (await db.execute(
+        select(Roster.original_file_bytes).where(Roster.id == db_roster.id)
+    )).scalar_one()
+    if not pdf_bytes:
         raise HTTPException(400, "No stored PDF for this roster")
 
     # Re-parse from stored bytes
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(db_roster.original_file_bytes)
-        tmp_path = tmp.name
-
-    try:
-        parser = PDFRosterParser(
-            home_base=db_roster.home_base or "DOH",
-            home_timezone="Asia/Qatar",
-        )
-        roster_obj = parser.parse_pdf(
-            tmp_path,
-            db_roster.pilot_id or "P12345",
-            db_roster.month or "2026-02",
-        )
-    finally:
-        os.unlink(tmp_path)
+    parser = PDFRosterParser(
+        home_base=db_roster.home_base or "DOH",
+        home_timezone="Asia/Qatar",
+    )
+    roster_obj = await asyncio.to_thread(
+        parser.parse_pdf_bytes,
+        pdf_bytes,
+        db_roster.pilot_id or "P12345",
+        db_roster.month or "2026-02",
+    )
 
     # Extract fleet/role from re-parsed roster
     try:
-        re_pilot_info = getattr(parser, 'pilot_info', {}) or {}
+        re_pilot_info = parser.pilot_info
         re_fleet_role = extract_fleet_and_role(re_pilot_info)
         if re_fleet_role.get('fleet'):
             db_roster.fleet = re_fleet_role['fleet']
@@ -1757,24 +2199,15 @@ async def reanalyze_roster(
     # endpoint accepts duty_crew_overrides (currently it does not).
 
     # Run analysis
-    config_map = {
-        "default": ModelConfig.operational_config,
-        "operational": ModelConfig.operational_config,
-        "easa_default": ModelConfig.default_easa_config,
-        "conservative": ModelConfig.conservative_config,
-        "liberal": ModelConfig.operational_config,  # legacy → operational
-        "research": ModelConfig.research_config,
-    }
-    config = config_map.get(config_preset, ModelConfig.operational_config)()
+    config = _model_config(config_preset)
 
     # ── Fatigue continuity for re-analysis ────────────────────
     reanalyze_effective_month = roster_obj.month or db_roster.month or "2026-02"
     re_continuity_from_month = None
     re_initial_conditions = None
     try:
-        from sqlalchemy import select as sa_select
         prior_result = await db.execute(
-            sa_select(FatigueState)
+            select(FatigueState)
             .where(FatigueState.user_id == user.id)
             .where(FatigueState.month < reanalyze_effective_month)
             .order_by(FatigueState.month.desc())
@@ -1801,115 +2234,45 @@ async def reanalyze_roster(
         logger.warning(f"Fatigue continuity lookup on reanalyze failed: {e}")
 
     model = BorbelyFatigueModel(config)
-    monthly_analysis = model.simulate_roster(roster_obj)
+    monthly_analysis = await asyncio.to_thread(model.simulate_roster, roster_obj)
 
-    analysis_id = f"{db_roster.pilot_id}_{db_roster.month}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    analysis_id = _new_analysis_id(str(db_roster.pilot_id), str(db_roster.month))
 
     # Store in memory
     analysis_store[analysis_id] = (monthly_analysis, roster_obj, model.sleep_strategies)
 
     # Build response
-    duties_response = []
-    for dt in monthly_analysis.duty_timelines:
-        duty_idx = roster_obj.get_duty_index(dt.duty_id)
-        if duty_idx is None:
-            continue
-        duties_response.append(
-            _build_duty_response(dt, roster_obj.duties[duty_idx], roster_obj)
-        )
-
-    rest_days_sleep = _build_rest_days_sleep(model.sleep_strategies)
-    effective_tz = getattr(parser, "effective_timezone_format", "auto")
-
-    response = AnalysisResponse(
-        analysis_id=analysis_id,
-        roster_id=roster_obj.roster_id,
-        pilot_id=roster_obj.pilot_id,
-        pilot_name=roster_obj.pilot_name,
-        pilot_base=roster_obj.pilot_base,
-        pilot_aircraft=roster_obj.pilot_aircraft,
-        home_base_timezone=roster_obj.home_base_timezone,
+    effective_tz = parser.effective_timezone_format
+    response = _build_analysis_response(
+        analysis_id, monthly_analysis, roster_obj, model.sleep_strategies,
         timezone_format=effective_tz,
-        month=roster_obj.month,
-        total_duties=roster_obj.total_duties,
-        total_sectors=roster_obj.total_sectors,
-        total_duty_hours=roster_obj.total_duty_hours,
-        total_block_hours=roster_obj.total_block_hours,
-        high_risk_duties=monthly_analysis.high_risk_duties,
-        critical_risk_duties=monthly_analysis.critical_risk_duties,
-        total_pinch_events=monthly_analysis.total_pinch_events,
-        avg_sleep_per_night=monthly_analysis.average_sleep_per_night,
-        max_sleep_debt=monthly_analysis.max_sleep_debt,
-        worst_duty_id=monthly_analysis.lowest_performance_duty,
-        worst_performance=monthly_analysis.lowest_performance_value,
-        duties=duties_response,
-        rest_days_sleep=rest_days_sleep,
-        body_clock_timeline=[
-            {"timestamp_utc": ts, "phase_shift_hours": ps, "reference_timezone": tz}
-            for ts, ps, tz in monthly_analysis.body_clock_timeline
-        ],
-        total_ulr_duties=getattr(monthly_analysis, "total_ulr_duties", 0),
-        total_augmented_duties=getattr(monthly_analysis, "total_augmented_duties", 0),
-        ulr_violations=getattr(monthly_analysis, "ulr_violations", []),
         continuity_from_month=re_continuity_from_month,
         initial_conditions=re_initial_conditions,
     )
+    analysis_json = response.model_dump(mode="json")
+    analysis_json_blob = to_json(analysis_json)
+    analysis_store.set_encoded(analysis_id, analysis_json_blob)
+
+    # Replace the stored analysis
+    db_roster.config_preset = config_preset
+    persist_kwargs = dict(
+        db_roster=db_roster,
+        analysis_id=analysis_id,
+        analysis_json=analysis_json,
+        analysis_json_blob=analysis_json_blob,
+        monthly_analysis=monthly_analysis,
+        roster=roster_obj,
+        user_id=user.id,
+        company_id=user.company_id,
+        month=reanalyze_effective_month,
+        replace_existing=True,
+    )
+    if wait:
+        await _persist_analysis(db, **persist_kwargs)
+    else:
+        background_tasks.add_task(_persist_analysis_in_background, **persist_kwargs)
 
-    # Update analysis in DB
-    try:
-        # Delete old analysis for this roster
-        from sqlalchemy import delete as sa_delete
-        await db.execute(
-            sa_delete(Analysis).where(Analysis.roster_id == db_roster.id)
-        )
-
-        db_analysis = Analysis(
-            id=analysis_id,
-            roster_id=db_roster.id,
-            analysis_json=response.model_dump(mode="json"),
-        )
-        db.add(db_analysis)
-
-        # Update roster config
-        db_roster.config_preset = config_preset
-        await db.commit()
-
-        # ── Save end-of-roster fatigue state (reanalyze) ─────────
-        try:
-            if monthly_analysis.duty_timelines:
-                last_tl = monthly_analysis.duty_timelines[-1]
-                last_duty = roster_obj.duties[-1]
-                fc = last_tl.final_circadian_state
-
-                fs = FatigueState(
-                    user_id=user.id,
-                    roster_id=db_roster.id,
-                    month=reanalyze_effective_month,
-                    period_end_utc=last_duty.release_time_utc,
-                    final_process_s=last_tl.final_process_s,
-                    final_sleep_debt=last_tl.cumulative_sleep_debt,
-                    final_phase_shift=fc.current_phase_shift_hours if fc else 0.0,
-                    final_phase_tz=fc.reference_timezone if fc else roster_obj.home_base_timezone,
-                )
-                await db.merge(fs)
-                await db.commit()
-        except Exception as e:
-            logger.warning(f"Failed to save fatigue state on reanalyze: {e}")
-            await db.rollback()
-
-        # ── Trigger comparative metrics aggregation (reanalyze) ───
-        if user.company_id:
-            try:
-                from metrics.aggregator import compute_aggregate_metrics
-                await compute_aggregate_metrics(db, user.company_id, reanalyze_effective_month)
-            except Exception as e:
-                logger.warning(f"Failed to compute aggregate metrics on reanalyze: {e}")
-
-    except Exception as e:
-        logger.warning(f"Failed to persist re-analysis: {e}")
-        await db.rollback()
-
-    return response
+    return Response(content=analysis_json_blob, media_type="application/json")
 
 
 # ============================================================================
@@ -1956,67 +2319,22 @@ async def run_what_if(request: WhatIfRequest, db=Depends(get_db)):
     modifications (time shifts, crew changes, exclusions), re-run the
     fatigue model, and return the modified analysis. Ephemeral — not persisted.
     """
-    import copy
-    from datetime import timedelta
-    from models.data_models import CrewComposition, ULRCrewSet
 
     analysis_id = request.analysis_id
 
     # 1. Load original roster from memory or DB fallback
-    if analysis_id not in analysis_store:
+    cached = analysis_store.get(analysis_id)
+    if cached is None:
         # DB fallback — same pattern as get_duty_detail
-        if db is not None:
-            from sqlalchemy import select
-            from sqlalchemy.orm import selectinload
-
-            result = await db.execute(
-                select(Analysis).where(Analysis.id == analysis_id).options(
-                    selectinload(Analysis.roster)
-                )
-            )
-            db_analysis = result.scalar_one_or_none()
-
-            if db_analysis and db_analysis.roster and db_analysis.roster.original_file_bytes:
-                try:
-                    db_roster_model = db_analysis.roster
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                        tmp.write(db_roster_model.original_file_bytes)
-                        tmp_path = tmp.name
-                    try:
-                        parser = PDFRosterParser(
-                            home_base=db_roster_model.home_base or "DOH",
-                            home_timezone="Asia/Qatar",
-                        )
-                        roster_obj = parser.parse_pdf(
-                            tmp_path,
-                            db_roster_model.pilot_id or "P12345",
-                            db_roster_model.month or "2026-02",
-                        )
-                    finally:
-                        os.unlink(tmp_path)
-
-                    preset = db_roster_model.config_preset or "default"
-                    config_map = {
-                        "default": ModelConfig.operational_config,
-                        "operational": ModelConfig.operational_config,
-                        "easa_default": ModelConfig.default_easa_config,
-                        "conservative": ModelConfig.conservative_config,
-                        "liberal": ModelConfig.operational_config,  # legacy → operational
-                        "research": ModelConfig.research_config,
-                    }
-                    config = config_map.get(preset, ModelConfig.operational_config)()
-                    model = BorbelyFatigueModel(config)
-                    monthly_analysis_obj = model.simulate_roster(roster_obj)
-                    analysis_store[analysis_id] = (monthly_analysis_obj, roster_obj, model.sleep_strategies)
-                except Exception as e:
-                    logger.warning(f"What-if: failed to re-analyze from stored PDF: {e}")
-                    raise HTTPException(404, "Analysis not found (re-analysis failed)")
-            else:
-                raise HTTPException(404, "Analysis not found")
-        else:
+        try:
+            cached = await _restore_analysis(db, analysis_id)
+        except Exception as e:
+            logger.warning(f"What-if: failed to re-analyze from stored PDF: {e}")
+            raise HTTPException(404, "Analysis not found (re-analysis failed)")
+        if cached is None:
             raise HTTPException(404, "Analysis not found")
 
-    _monthly_analysis, original_roster, _sleep_strategies = analysis_store[analysis_id]
+    _monthly_analysis, original_roster, _sleep_strategies = cached
 
     # 2. Deep-copy the roster
     modified_roster = copy.deepcopy(original_roster)
@@ -2120,66 +2438,17 @@ async def run_what_if(request: WhatIfRequest, db=Depends(get_db)):
             }
 
     # 9. Run fatigue model on modified roster
-    config_map = {
-        "default": ModelConfig.operational_config,
-        "operational": ModelConfig.operational_config,
-        "easa_default": ModelConfig.default_easa_config,
-        "conservative": ModelConfig.conservative_config,
-        "liberal": ModelConfig.operational_config,  # legacy → operational
-        "research": ModelConfig.research_config,
-    }
-    config = config_map.get(request.config_preset, ModelConfig.operational_config)()
+    config = _model_config(request.config_preset)
     model = BorbelyFatigueModel(config)
-    monthly_analysis = model.simulate_roster(modified_roster, sleep_overrides=sleep_overrides)
+    monthly_analysis = await asyncio.to_thread(
+        model.simulate_roster, modified_roster, sleep_overrides=sleep_overrides
+    )
 
     # 10. Build response (same shape as /api/analyze)
-    whatif_id = f"whatif_{analysis_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    whatif_id = _new_analysis_id("whatif", analysis_id)
 
-    duties_response = []
-    for dt in monthly_analysis.duty_timelines:
-        duty_idx = modified_roster.get_duty_index(dt.duty_id)
-        if duty_idx is None:
-            continue
-        duties_response.append(
-            _build_duty_response(dt, modified_roster.duties[duty_idx], modified_roster)
-        )
-
-    rest_days_sleep = _build_rest_days_sleep(model.sleep_strategies)
-
-    return AnalysisResponse(
-        analysis_id=whatif_id,
-        roster_id=modified_roster.roster_id,
-        pilot_id=modified_roster.pilot_id,
-        pilot_name=modified_roster.pilot_name,
-        pilot_base=modified_roster.pilot_base,
-        pilot_aircraft=modified_roster.pilot_aircraft,
-        home_base_timezone=modified_roster.home_base_timezone,
-        month=modified_roster.month,
-        total_duties=len(modified_roster.duties),
-        total_sectors=sum(len(d.segments) for d in modified_roster.duties),
-        total_duty_hours=round(sum(d.duty_hours for d in modified_roster.duties), 1),
-        total_block_hours=round(
-            sum(
-                sum(s.block_hours for s in d.segments if hasattr(s, 'block_hours'))
-                for d in modified_roster.duties
-            ), 1
-        ),
-        high_risk_duties=monthly_analysis.high_risk_duties,
-        critical_risk_duties=monthly_analysis.critical_risk_duties,
-        total_pinch_events=monthly_analysis.total_pinch_events,
-        avg_sleep_per_night=monthly_analysis.average_sleep_per_night,
-        max_sleep_debt=monthly_analysis.max_sleep_debt,
-        worst_duty_id=monthly_analysis.lowest_performance_duty,
-        worst_performance=monthly_analysis.lowest_performance_value,
-        duties=duties_response,
-        rest_days_sleep=rest_days_sleep,
-        body_clock_timeline=[
-            {"timestamp_utc": ts, "phase_shift_hours": ps, "reference_timezone": tz}
-            for ts, ps, tz in monthly_analysis.body_clock_timeline
-        ],
-        total_ulr_duties=getattr(monthly_analysis, "total_ulr_duties", 0),
-        total_augmented_duties=getattr(monthly_analysis, "total_augmented_duties", 0),
-        ulr_violations=getattr(monthly_analysis, "ulr_violations", []),
+    return _build_analysis_response(
+        whatif_id, monthly_analysis, modified_roster, model.sleep_strategies
     )
 
 
@@ -2253,23 +2522,41 @@ class YearlyDashboardResponse(BaseModel):
     summary: YearlySummary
 
 
+# MonthlyMetrics fields read straight from the monthly_metrics row of the same name
+_MONTHLY_METRIC_COLUMNS = tuple(
+    name for name in MonthlyMetrics.model_fields
+    if name not in ("month", "roster_id", "filename", "created_at")
+)
+
+
 def _compute_yearly_summary(months: list[MonthlyMetrics]) -> YearlySummary:
     """Compute duty-weighted averages and totals across all months."""
     if not months:
         return YearlySummary()
 
-    total_duties = sum(m.total_duties for m in months)
-    total_sectors = sum(m.total_sectors for m in months)
-    total_duty_h = sum(m.total_duty_hours for m in months)
-    total_block_h = sum(m.total_block_hours for m in months)
-
-    # Weighted average performance (by duties per month)
-    weighted_perf = sum(m.avg_performance * m.total_duties for m in months)
-    avg_perf = round(weighted_perf / total_duties, 1) if total_duties else 0
-
-    # Weighted average sleep
-    weighted_sleep = sum(m.avg_sleep_per_night * m.total_duties for m in months)
-    avg_sleep = round(weighted_sleep / total_duties, 1) if total_duties else 0
+    # One pass over the months, accumulating every total in locals
+    total_duties = total_sectors = 0
+    total_duty_h = total_block_h = total_wocl_h = 0.0
+    weighted_perf = weighted_sleep = 0.0      # weighted by duties per month
+    total_pinch = total_high = total_critical = 0
+    worst_perf = math.inf
+    max_debt = -math.inf
+    for m in months:
+        duties = m.total_duties
+        total_duties += duties
+        total_sectors += m.total_sectors
+        total_duty_h += m.total_duty_hours
+        total_block_h += m.total_block_hours
+        weighted_perf += m.avg_performance * duties
+        weighted_sleep += m.avg_sleep_per_night * duties
+        total_wocl_h += m.total_wocl_hours
+        total_pinch += m.total_pinch_events
+        total_high += m.high_risk_duties
+        total_critical += m.critical_risk_duties
+        if m.worst_performance < worst_perf:
+            worst_perf = m.worst_performance
+        if m.max_sleep_debt > max_debt:
+            max_debt = m.max_sleep_debt
 
     return YearlySummary(
         total_months=len(months),
@@ -2277,14 +2564,14 @@ def _compute_yearly_summary(months: list[MonthlyMetrics]) -> YearlySummary:
         total_sectors=total_sectors,
         total_duty_hours=round(total_duty_h, 1),
         total_block_hours=round(total_block_h, 1),
-        avg_performance=avg_perf,
-        worst_performance=min(m.worst_performance for m in months) if months else 0,
-        avg_sleep_per_night=avg_sleep,
-        max_sleep_debt=max(m.max_sleep_debt for m in months) if months else 0,
-        total_wocl_hours=round(sum(m.total_wocl_hours for m in months), 1),
-        total_pinch_events=sum(m.total_pinch_events for m in months),
-        total_high_risk_duties=sum(m.high_risk_duties for m in months),
-        total_critical_risk_duties=sum(m.critical_risk_duties for m in months),
+        avg_performance=round(weighted_perf / total_duties, 1) if total_duties else 0,
+        worst_performance=worst_perf,
+        avg_sleep_per_night=round(weighted_sleep / total_duties, 1) if total_duties else 0,
+        max_sleep_debt=max_debt,
+        total_wocl_hours=round(total_wocl_h, 1),
+        total_pinch_events=total_pinch,
+        total_high_risk_duties=total_high,
+        total_critical_risk_duties=total_critical,
     )
 
 
@@ -2297,94 +2584,39 @@ async def get_yearly_dashboard(
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-
-    # Get all rosters for this user with their analyses
+    # Newest analysed roster per month, from the precomputed per-roster rows
+    newest_per_month = (
+        select(
+            RosterMonthlyMetrics.roster_id,
+            func.row_number().over(
+                partition_by=RosterMonthlyMetrics.month,
+                order_by=RosterMonthlyMetrics.roster_created_at.desc(),
+            ).label("rn"),
+        )
+        .where(RosterMonthlyMetrics.user_id == user.id)
+        .subquery()
+    )
     result = await db.execute(
-        select(Roster)
-        .where(Roster.user_id == user.id)
-        .options(selectinload(Roster.analyses))
-        .order_by(Roster.month.asc())
+        select(RosterMonthlyMetrics)
+        .join(newest_per_month, RosterMonthlyMetrics.roster_id == newest_per_month.c.roster_id)
+        .where(newest_per_month.c.rn == 1)
+        .order_by(RosterMonthlyMetrics.month.desc())
+        .limit(12)
     )
-    all_rosters = result.scalars().all()
-
-    # Deduplicate by month — keep newest roster per month
-    month_map: dict[str, tuple] = {}
-    for r in all_rosters:
-        if r.analyses:
-            latest_analysis = r.analyses[0]
-            if r.month not in month_map or r.created_at > month_map[r.month][0].created_at:
-                month_map[r.month] = (r, latest_analysis)
-
-    # Sort by month, take last 12
-    sorted_months = sorted(month_map.keys())[-12:]
-
-    months_data: list[MonthlyMetrics] = []
-    for month_key in sorted_months:
-        roster, analysis = month_map[month_key]
-        aj = analysis.analysis_json or {}
-
-        # Extract per-duty metrics from stored JSONB
-        duties = aj.get("duties", [])
-
-        risk_counts = {"low": 0, "moderate": 0, "high": 0, "critical": 0}
-        total_wocl = 0.0
-        all_avg_perf = []
-        all_min_perf = []
-        flight_count = sim_count = ground_count = 0
-
-        for d in duties:
-            rl = d.get("risk_level", "low")
-            if rl in risk_counts:
-                risk_counts[rl] += 1
-            elif rl == "extreme":
-                risk_counts["critical"] += 1
-
-            total_wocl += d.get("wocl_hours", 0) or 0
-
-            avg_p = d.get("avg_performance")
-            if avg_p is not None:
-                all_avg_perf.append(avg_p)
-
-            min_p = d.get("min_performance")
-            if min_p is not None:
-                all_min_perf.append(min_p)
-
-            dt = d.get("duty_type", "flight")
-            if dt == "simulator":
-                sim_count += 1
-            elif dt == "ground_training":
-                ground_count += 1
-            else:
-                flight_count += 1
-
-        months_data.append(MonthlyMetrics(
-            month=month_key,
-            roster_id=str(roster.id),
-            filename=roster.filename,
-            created_at=roster.created_at.isoformat() if roster.created_at else "",
-            total_duties=roster.total_duties or aj.get("total_duties", 0),
-            total_sectors=roster.total_sectors or aj.get("total_sectors", 0),
-            total_duty_hours=round(roster.total_duty_hours or aj.get("total_duty_hours", 0), 1),
-            total_block_hours=round(roster.total_block_hours or aj.get("total_block_hours", 0), 1),
-            avg_performance=round(sum(all_avg_perf) / len(all_avg_perf), 1) if all_avg_perf else 0,
-            worst_performance=round(min(all_min_perf), 1) if all_min_perf else 0,
-            low_risk_count=risk_counts["low"],
-            moderate_risk_count=risk_counts["moderate"],
-            high_risk_count=risk_counts["high"],
-            critical_risk_count=risk_counts["critical"],
-            avg_sleep_per_night=round(aj.get("avg_sleep_per_night", 0) or 0, 1),
-            max_sleep_debt=round(aj.get("max_sleep_debt", 0) or 0, 1),
-            average_sleep_debt=round(aj.get("average_sleep_debt", 0) or 0, 1),
-            total_wocl_hours=round(total_wocl, 1),
-            total_pinch_events=aj.get("total_pinch_events", 0) or 0,
-            high_risk_duties=aj.get("high_risk_duties", 0) or 0,
-            critical_risk_duties=aj.get("critical_risk_duties", 0) or 0,
-            flight_duties=flight_count,
-            simulator_duties=sim_count,
-            ground_training_duties=ground_count,
-        ))
+    rows = reversed(result.scalars().all())   # oldest month first
+
+    # Rows are stored rounded and typed as the response wants them (see
+    # metrics/monthly.py), so skip re-validating them
+    months_data = [
+        MonthlyMetrics.model_construct(
+            month=row.month,
+            roster_id=str(row.roster_id),
+            filename=row.filename,
+            created_at=row.roster_created_at.isoformat(),
+            **{name: getattr(row, name) for name in _MONTHLY_METRIC_COLUMNS},
+        )
+        for row in rows
+    ]
 
     summary = _compute_yearly_summary(months_data)
     return YearlyDashboardResponse(months=months_data, summary=summary)
@@ -2394,27 +2626,28 @@ async def get_yearly_dashboard(
 # AIRPORT DATABASE ENDPOINTS
 # ============================================================================
 
-@app.get("/api/airports/{iata_code}", response_model=AirportResponse)
-async def get_airport(iata_code: str):
-    """
-    Look up airport by IATA code from backend's ~7,800 airport database.
+def _current_offset_bucket() -> int:
+    """The _offset_hours() bucket for now; airport requests share it per quarter-hour."""
+    return int(datetime.now(_UTC).timestamp()) // _OFFSET_BUCKET_SECONDS
 
-    Returns timezone (IANA), coordinates, and current UTC offset.
-    This eliminates the need for the frontend to maintain its own airport database.
-    """
-    import pytz
 
-    airport = AirportDatabase.get_airport(iata_code)
+@lru_cache(maxsize=4096)
+def _airport_response(code: str, bucket: int) -> AirportResponse:
+    """AirportResponse for an IATA code, with the zone's UTC offset (DST-aware)
+    at the given _offset_hours() bucket.
 
-    # Calculate current UTC offset (DST-aware)
+    Memoized per (code, bucket): airport data is static and the offset only
+    changes between buckets, so repeat lookups within a quarter-hour (and
+    repeated codes in one batch) are a dict hit. Responses are never mutated,
+    and are built with model_construct() since every field comes straight
+    from the airport table.
+    """
+    airport = AirportDatabase.get_airport(code)
     try:
-        tz = pytz.timezone(airport.timezone)
-        now = datetime.now(pytz.utc)
-        utc_offset = tz.utcoffset(now).total_seconds() / 3600
+        utc_offset = _offset_hours(airport.timezone, bucket)
     except Exception:
         utc_offset = None
-
-    return AirportResponse(
+    return AirportResponse.model_construct(
         code=airport.code,
         timezone=airport.timezone,
         utc_offset_hours=utc_offset,
@@ -2423,6 +2656,17 @@ async def get_airport(iata_code: str):
     )
 
 
+@app.get("/api/airports/{iata_code}", response_model=AirportResponse)
+async def get_airport(iata_code: str):
+    """
+    Look up airport by IATA code from backend's ~7,800 airport database.
+
+    Returns timezone (IANA), coordinates, and current UTC offset.
+    This eliminates the need for the frontend to maintain its own airport database.
+    """
+    return _airport_response(iata_code.upper(), _current_offset_bucket())
+
+
 class BatchAirportRequest(BaseModel):
     codes: List[str]  # List of IATA codes
 
@@ -2435,31 +2679,14 @@ async def get_airports_batch(request: BatchAirportRequest):
     Accepts up to 50 IATA codes and returns timezone + coordinate data for each.
     Use this to populate the frontend's airport data for a whole roster in one call.
     """
-    import pytz
-
     if len(request.codes) > 50:
         raise HTTPException(status_code=400, detail="Maximum 50 airports per batch request")
 
-    now = datetime.now(pytz.utc)
-    results = []
-
-    for code in request.codes:
-        airport = AirportDatabase.get_airport(code)
-        try:
-            tz = pytz.timezone(airport.timezone)
-            utc_offset = tz.utcoffset(now).total_seconds() / 3600
-        except Exception:
-            utc_offset = None
-
-        results.append(AirportResponse(
-            code=airport.code,
-            timezone=airport.timezone,
-            utc_offset_hours=utc_offset,
-            latitude=airport.latitude,
-            longitude=airport.longitude,
-        ))
-
-    return results
+    bucket = _current_offset_bucket()
+    return [
+        _airport_response(code.upper(), bucket)
+        for code in request.codes
+    ]
 
 
 @app.get("/api/airports/search")
@@ -2470,27 +2697,24 @@ async def search_airports(q: str = Query(..., min_length=2, max_length=10)):
     Returns matching airports from the ~7,800 airport database.
     Useful for autocomplete in the frontend.
     """
-    import airportsdata
-
-    _db = airportsdata.load('IATA')
-    q_upper = q.upper()
-    matches = []
-
-    for code, entry in _db.items():
-        if code.startswith(q_upper):
-            matches.append({
-                "code": entry['iata'],
-                "name": entry.get('name', ''),
-                "city": entry.get('city', ''),
-                "country": entry.get('country', ''),
-                "timezone": entry['tz'],
-                "latitude": entry['lat'],
-                "longitude": entry['lon'],
-            })
-        if len(matches) >= 20:
-            break
+    matches = [
+        {
+            "code": entry['iata'],
+            "name": entry.get('name', ''),
+            "city": entry.get('city', ''),
+            "country": entry.get('country', ''),
+            "timezone": entry['tz'],
+            "latitude": entry['lat'],
+            "longitude": entry['lon'],
+        }
+        for entry in AirportDatabase.search(q)
+    ]
 
-    return {"results": matches, "total": len(matches)}
+    # No response_model, so encode here rather than via jsonable_encoder
+    return Response(
+        content=to_json({"results": matches, "total": len(matches)}),
+        media_type="application/json",
+    )
 
 
 # ============================================================================
@@ -2517,4 +2741,10 @@ if __name__ == "__main__":
     print(f"  GET  http://localhost:{port}/api/duty/{{analysis_id}}/{{duty_id}}")
     print()
     
-    uvicorn.run(app, host="0.0.0.0", port=port, reload=True)
+    # Auto-reload (a file watcher plus a worker restart on every change) is
+    # for local development only: AEROWAKE_ENV=dev. Reload needs the app as
+    # an import string, so it must be started from the fatigue-tool directory.
+    if os.environ.get("AEROWAKE_ENV", "prod") == "dev":
+        uvicorn.run("api.api_server:app", host="0.0.0.0", port=port, reload=True)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)
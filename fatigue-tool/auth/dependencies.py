@@ -2,20 +2,25 @@
 FastAPI dependencies for authentication.
 
 get_current_user: requires valid JWT → returns User
+get_current_user_with_company: get_current_user with user.company loaded
 get_optional_user: returns User or None (for endpoints that work with/without auth)
 get_admin_user: requires valid JWT + is_admin flag or ADMIN_EMAILS env var
+
+Users are looked up through a short-lived in-process cache (see _load_user)
+so chatty clients don't cost a users + companies query per request.
 """
 
 import os
 import logging
+import time
+from collections import OrderedDict
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from auth.jwt import decode_token
 from db.models import User
@@ -26,6 +31,70 @@ logger = logging.getLogger(__name__)
 # auto_error=False: don't raise 401 automatically (allows optional auth)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
+# Bootstrap admins (lower-cased), from the comma-separated ADMIN_EMAILS env var
+_ADMIN_EMAILS = frozenset(
+    e.strip().lower() for e in os.environ.get("ADMIN_EMAILS", "").split(",") if e.strip()
+)
+
+# user_id -> (detached User, expiry on the monotonic clock)
+USER_CACHE_TTL_SECONDS = 60
+_USER_CACHE_SIZE = 10_000
+_user_cache: "OrderedDict[str, tuple[User, float]]" = OrderedDict()
+
+
+async def _load_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """User for user_id, attached to db.
+
+    Cached copies are detached and merged into the request's session with
+    load=False, which needs no SQL, so handlers can still modify and commit
+    the returned user. ORM updates/deletes of a user drop its entry (see
+    the listeners below); other changes show up within USER_CACHE_TTL_SECONDS.
+    """
+    now = time.monotonic()
+    cached = _user_cache.get(user_id)
+    if cached is not None and cached[1] > now:
+        _user_cache.move_to_end(user_id)
+        return await db.merge(cached[0], load=False)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        _user_cache.pop(user_id, None)
+        return None
+
+    # Keep the loaded instance as the cached copy; the request gets its own
+    db.expunge(user)
+    _user_cache[user_id] = (user, now + USER_CACHE_TTL_SECONDS)
+    _user_cache.move_to_end(user_id)
+    if len(_user_cache) > _USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+    return await db.merge(user, load=False)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _drop_cached_user(mapper, connection, target):
+    _user_cache.pop(str(target.id), None)
+
+
+async def _user_from_token(token: Optional[str], db: Optional[AsyncSession]) -> Optional[User]:
+    """The active user an access token belongs to, or None if there isn't one."""
+    if token is None or db is None:
+        return None
+
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        return None
+    user_id: Optional[str] = payload.get("sub")
+    if user_id is None or payload.get("type") != "access":
+        return None
+
+    user = await _load_user(db, user_id)
+    if user is None or not user.is_active:
+        return None
+    return user
+
 
 async def get_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
@@ -37,32 +106,28 @@ async def get_current_user(
     Decodes JWT, looks up user in DB.
     Raises HTTP 401 if invalid/expired or user not found.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid or expired token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    if token is None or db is None:
-        raise credentials_exception
-
-    try:
-        payload = decode_token(token)
-        user_id: str = payload.get("sub")
-        token_type: str = payload.get("type")
-        if user_id is None or token_type != "access":
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    user = await _user_from_token(token, db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
 
-    result = await db.execute(
-        select(User).where(User.id == user_id).options(selectinload(User.company))
-    )
-    user = result.scalar_one_or_none()
 
-    if user is None or not user.is_active:
-        raise credentials_exception
+async def get_current_user_with_company(
+    user: User = Depends(get_current_user),
+    db: Optional[AsyncSession] = Depends(get_db),
+) -> User:
+    """
+    get_current_user, plus user.company loaded.
 
+    Only the few endpoints that show the company pay for fetching it; it
+    can't be lazy-loaded on access under asyncio.
+    """
+    if user.company_id is not None:
+        await db.refresh(user, attribute_names=["company"])
     return user
 
 
@@ -76,27 +141,14 @@ async def get_optional_user(
     Used for endpoints that work both authenticated and anonymously
     (e.g., POST /api/analyze persists when authenticated, uses in-memory otherwise).
     """
-    if token is None or db is None:
-        return None
-
-    try:
-        payload = decode_token(token)
-        user_id: str = payload.get("sub")
-        token_type: str = payload.get("type")
-        if user_id is None or token_type != "access":
-            return None
-    except JWTError:
-        return None
-
-    result = await db.execute(
-        select(User).where(User.id == user_id).options(selectinload(User.company))
-    )
-    user = result.scalar_one_or_none()
+    return await _user_from_token(token, db)
 
-    if user is None or not user.is_active:
-        return None
 
-    return user
+def is_admin(user: User) -> bool:
+    """Check if user is admin via DB flag or ADMIN_EMAILS env var."""
+    if user.is_admin:
+        return True
+    return bool(user.email and user.email.lower() in _ADMIN_EMAILS)
 
 
 async def get_admin_user(
@@ -110,13 +162,7 @@ async def get_admin_user(
     (so the first admin can access the dashboard before manually setting the flag).
     Raises HTTP 403 if neither condition is met.
     """
-    if getattr(user, "is_admin", False):
-        return user
-
-    # Fallback: check env var for bootstrapping
-    admin_emails_raw = os.environ.get("ADMIN_EMAILS", "")
-    admin_emails = [e.strip().lower() for e in admin_emails_raw.split(",") if e.strip()]
-    if user.email and user.email.lower() in admin_emails:
+    if is_admin(user):
         return user
 
     raise HTTPException(
@@ -7,6 +7,8 @@ Refresh tokens (30 days) for silent re-authentication.
 
 import os
 import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -19,6 +21,11 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 
+# Recently verified tokens -> payload. A client sends the same access token
+# on every request for its 30-minute life, so each is verified once.
+_VERIFIED_CACHE_SIZE = 4096
+_verified: "OrderedDict[str, dict]" = OrderedDict()
+
 
 def create_access_token(user_id: str, expires_delta: Optional[timedelta] = None) -> str:
     """Create a short-lived JWT access token."""
@@ -52,10 +59,25 @@ def decode_token(token: str) -> dict:
 
     Returns the payload dict with 'sub' (user_id) and 'type'.
     Raises JWTError on invalid/expired tokens.
+
+    Payloads of tokens that verified are cached until their 'exp', so
+    repeat requests skip the signature check and JSON decoding. Anything
+    not in the cache (or past its expiry) goes through jwt.decode().
     """
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    payload = _verified.get(token)
+    if payload is not None and payload["exp"] > time.time():
+        _verified.move_to_end(token)
+        return dict(payload)
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if isinstance(payload.get("exp"), (int, float)):
+        _verified[token] = payload
+        _verified.move_to_end(token)
+        if len(_verified) > _VERIFIED_CACHE_SIZE:
+            _verified.popitem(last=False)
+    return dict(payload)
 
 
-def hash_token(token: str) -> str:
-    """Hash a refresh token for DB storage (SHA-256)."""
-    return hashlib.sha256(token.encode()).hexdigest()
+def hash_token(token: str) -> bytes:
+    """Hash a refresh token for DB storage (raw 32-byte SHA-256 digest)."""
+    return hashlib.sha256(token.encode()).digest()
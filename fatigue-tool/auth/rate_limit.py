@@ -0,0 +1,75 @@
+"""
+In-memory rate limiting for the password endpoints.
+
+Every login/registration runs a bcrypt hash (~100 ms of CPU), so an
+unthrottled client can keep a worker busy with nothing but bad passwords.
+login_rate_limit allows LOGIN_RATE_LIMIT attempts per client IP in any
+LOGIN_RATE_WINDOW_SECONDS window and answers 429 beyond that.
+
+State is per process, which is enough to cap the CPU one client can burn
+on one worker.
+"""
+
+import os
+import time
+from collections import defaultdict, deque
+
+from fastapi import HTTPException, Request, status
+
+LOGIN_RATE_LIMIT = int(os.environ.get("LOGIN_RATE_LIMIT", "10"))
+LOGIN_RATE_WINDOW_SECONDS = float(os.environ.get("LOGIN_RATE_WINDOW_SECONDS", "60"))
+
+# Forget idle clients once this many are tracked
+_MAX_TRACKED_CLIENTS = 10_000
+
+
+class SlidingWindowLimiter:
+    """At most `limit` hits per key in any `window`-second span."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._hits: defaultdict[str, deque] = defaultdict(deque)
+
+    def hit(self, key: str) -> float:
+        """Record a hit for key. Returns 0 if allowed, else seconds until
+        the next hit would be allowed (the rejected hit is not recorded)."""
+        now = time.monotonic()
+        if len(self._hits) > _MAX_TRACKED_CLIENTS:
+            self._sweep(now)
+
+        hits = self._hits[key]
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+        if len(hits) >= self.limit:
+            return hits[0] + self.window - now
+        hits.append(now)
+        return 0.0
+
+    def _sweep(self, now: float) -> None:
+        cutoff = now - self.window
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= cutoff]:
+            del self._hits[key]
+
+
+_login_limiter = SlidingWindowLimiter(LOGIN_RATE_LIMIT, LOGIN_RATE_WINDOW_SECONDS)
+
+
+def _client_ip(request: Request) -> str:
+    """The caller's IP. Behind Railway's proxy request.client is the proxy,
+    so use the last X-Forwarded-For entry (the one the proxy appended)."""
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def login_rate_limit(request: Request) -> None:
+    """FastAPI dependency: raise 429 when the client IP is over the limit."""
+    retry_after = _login_limiter.hit(_client_ip(request))
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please try again later",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
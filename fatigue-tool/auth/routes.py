@@ -10,8 +10,9 @@ Endpoints:
   POST /api/auth/logout    — invalidate refresh token
 """
 
-import os
+import asyncio
 import logging
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -28,7 +29,8 @@ from auth.jwt import (
     hash_token,
     REFRESH_TOKEN_EXPIRE_DAYS,
 )
-from auth.dependencies import get_current_user
+from auth.dependencies import get_current_user_with_company, is_admin
+from auth.rate_limit import login_rate_limit
 from db.models import User, Company, RefreshToken
 from db.session import get_db
 
@@ -86,24 +88,13 @@ class UpdateProfileRequest(BaseModel):
 # ─── Helpers ───────────────────────────────────────────────────────────────────
 
 
-async def _store_refresh_token(db: AsyncSession, user_id, raw_token: str):
-    """Store hashed refresh token in DB."""
-    token_entry = RefreshToken(
-        user_id=user_id,
+def _add_refresh_token(db: AsyncSession, user: User, raw_token: str):
+    """Stage the hashed refresh token; the caller's commit stores it."""
+    db.add(RefreshToken(
+        user_id=user.id,
         token_hash=hash_token(raw_token),
         expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
-    )
-    db.add(token_entry)
-    await db.commit()
-
-
-def _is_admin(user: User) -> bool:
-    """Check if user is admin via DB flag or ADMIN_EMAILS env var."""
-    if getattr(user, "is_admin", False):
-        return True
-    admin_emails_raw = os.environ.get("ADMIN_EMAILS", "")
-    admin_emails = [e.strip().lower() for e in admin_emails_raw.split(",") if e.strip()]
-    return bool(user.email and user.email.lower() in admin_emails)
+    ))
 
 
 def _user_to_response(user: User) -> UserResponse:
@@ -123,7 +114,7 @@ def _user_to_response(user: User) -> UserResponse:
         pilot_id=user.pilot_id,
         home_base=user.home_base,
         auth_provider=user.auth_provider,
-        is_admin=_is_admin(user),
+        is_admin=is_admin(user),
         company_id=str(user.company_id) if user.company_id else None,
         company_name=company_name,
         company_role=user.company_role or "pilot",
@@ -134,7 +125,10 @@ def _user_to_response(user: User) -> UserResponse:
 # ─── Routes ───────────────────────────────────────────────────────────────────
 
 
-@auth_router.post("/register", response_model=TokenResponse, status_code=201)
+@auth_router.post(
+    "/register", response_model=TokenResponse, status_code=201,
+    dependencies=[Depends(login_rate_limit)],
+)
 async def register(body: RegisterRequest, db: AsyncSession = Depends(get_db)):
     """Create a new user account with email and password."""
     if db is None:
@@ -150,28 +144,30 @@ async def register(body: RegisterRequest, db: AsyncSession = Depends(get_db)):
 
     # Create user
     user = User(
+        id=uuid.uuid4(),   # known up front, so the tokens need no flush
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=await asyncio.to_thread(hash_password, body.password),
         display_name=body.display_name,
         auth_provider="email",
         pilot_id=body.pilot_id,
         home_base=body.home_base,
     )
     db.add(user)
-    await db.commit()
-    await db.refresh(user)
 
-    # Generate tokens
+    # Generate tokens; the user and its refresh token commit together
     access = create_access_token(str(user.id))
     refresh = create_refresh_token(str(user.id))
-    await _store_refresh_token(db, user.id, refresh)
+    _add_refresh_token(db, user, refresh)
+    await db.commit()
 
     logger.info(f"New user registered: {body.email}")
 
     return TokenResponse(access_token=access, refresh_token=refresh)
 
 
-@auth_router.post("/login", response_model=TokenResponse)
+@auth_router.post(
+    "/login", response_model=TokenResponse, dependencies=[Depends(login_rate_limit)]
+)
 async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
     """Sign in with email and password."""
     if db is None:
@@ -186,7 +182,8 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
             detail="Invalid email or password",
         )
 
-    if not verify_password(body.password, user.password_hash):
+    # bcrypt is deliberately slow; keep it off the event loop
+    if not await asyncio.to_thread(verify_password, body.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -201,7 +198,8 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
     # Generate tokens
     access = create_access_token(str(user.id))
     refresh = create_refresh_token(str(user.id))
-    await _store_refresh_token(db, user.id, refresh)
+    _add_refresh_token(db, user, refresh)
+    await db.commit()
 
     return TokenResponse(access_token=access, refresh_token=refresh)
 
@@ -244,13 +242,14 @@ async def refresh_tokens(body: RefreshRequest, db: AsyncSession = Depends(get_db
     # Issue new tokens
     access = create_access_token(str(user.id))
     refresh = create_refresh_token(str(user.id))
-    await _store_refresh_token(db, user.id, refresh)
+    _add_refresh_token(db, user, refresh)
+    await db.commit()   # old token's delete + new token, together
 
     return TokenResponse(access_token=access, refresh_token=refresh)
 
 
 @auth_router.get("/me", response_model=UserResponse)
-async def get_profile(user: User = Depends(get_current_user)):
+async def get_profile(user: User = Depends(get_current_user_with_company)):
     """Get current authenticated user's profile."""
     return _user_to_response(user)
 
@@ -258,7 +257,7 @@ async def get_profile(user: User = Depends(get_current_user)):
 @auth_router.put("/me", response_model=UserResponse)
 async def update_profile(
     body: UpdateProfileRequest,
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_with_company),
     db: AsyncSession = Depends(get_db),
 ):
     """Update current user's profile fields."""
@@ -272,8 +271,7 @@ async def update_profile(
     if body.home_base is not None:
         user.home_base = body.home_base
 
-    await db.commit()
-    await db.refresh(user)
+    await db.commit()   # expire_on_commit=False: user (and its company) stay loaded
 
     return _user_to_response(user)
 
@@ -18,11 +18,13 @@ Usage:
 """
 
 import re
-from typing import Dict, List, Optional
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True)
 class AirlineGuess:
     name: str
     icao: str
@@ -39,41 +41,86 @@ class AirlineGuess:
 
 # ── Known airline signatures ────────────────────────────────────────────────
 
-# Each entry: (name, icao, format, bases, flight_prefix_re, text_keywords)
-_AIRLINE_SIGNATURES = [
-    {
-        'name': 'easyJet',
-        'icao': 'EZY',
-        'format': 'easyjet',                    # Unique parser format = certain
-        'bases': None,                            # Any base
-        'flight_re': re.compile(r'^EJU\d{4}$'),
-        'keywords': ['easyjet', 'eju'],
-    },
-    {
-        'name': 'Qatar Airways',
-        'icao': 'QTR',
-        'format': 'crewlink',
-        'bases': {'DOH'},
-        'flight_re': re.compile(r'^QR\d{3,4}$'),
-        'keywords': ['qatar airways', 'qatar'],
-    },
-    {
-        'name': 'Emirates',
-        'icao': 'UAE',
-        'format': 'crewlink',
-        'bases': {'DXB'},
-        'flight_re': re.compile(r'^EK\d{3,4}$'),
-        'keywords': ['emirates'],
-    },
-    {
-        'name': 'Etihad Airways',
-        'icao': 'ETD',
-        'format': 'crewlink',
-        'bases': {'AUH'},
-        'flight_re': re.compile(r'^EY\d{3,4}$'),
-        'keywords': ['etihad'],
-    },
-]
+@dataclass(frozen=True, slots=True)
+class AirlineSignature:
+    name: str
+    icao: str
+    format: Optional[str]                   # Parser format, None = any format
+    bases: Optional[FrozenSet[str]]         # Home bases, None = any base
+    flight_re: Optional[Pattern[str]]       # Flight number, used with fullmatch()
+    keywords: Tuple[str, ...]               # Lowercase PDF text keywords
+
+
+# Signatures with a unique format come first so detect_airline can stop at
+# the first near-certain match.
+_AIRLINE_SIGNATURES = (
+    AirlineSignature(
+        name='easyJet',
+        icao='EZY',
+        format='easyjet',                   # Unique parser format = certain
+        bases=None,                         # Any base
+        flight_re=re.compile(r'EJU\d{4}'),
+        keywords=('easyjet', 'eju'),
+    ),
+    AirlineSignature(
+        name='Qatar Airways',
+        icao='QTR',
+        format='crewlink',
+        bases=frozenset({'DOH'}),
+        flight_re=re.compile(r'QR\d{3,4}'),
+        keywords=('qatar airways', 'qatar'),
+    ),
+    AirlineSignature(
+        name='Emirates',
+        icao='UAE',
+        format='crewlink',
+        bases=frozenset({'DXB'}),
+        flight_re=re.compile(r'EK\d{3,4}'),
+        keywords=('emirates',),
+    ),
+    AirlineSignature(
+        name='Etihad Airways',
+        icao='ETD',
+        format='crewlink',
+        bases=frozenset({'AUH'}),
+        flight_re=re.compile(r'EY\d{3,4}'),
+        keywords=('etihad',),
+    ),
+)
+
+# Signatures to score per roster format, in list order. Signatures without
+# a format apply to every format (and are all an unknown format gets).
+_ANY_FORMAT_SIGNATURES = tuple(sig for sig in _AIRLINE_SIGNATURES if not sig.format)
+_SIGNATURES_BY_FORMAT = {
+    fmt: tuple(sig for sig in _AIRLINE_SIGNATURES if sig.format in (fmt, None))
+    for fmt in {sig.format for sig in _AIRLINE_SIGNATURES if sig.format}
+}
+
+# All flight-number patterns as one alternation, one named group per ICAO
+# code, so each flight number is matched once instead of once per airline.
+_COMBINED_FLIGHT_RE = re.compile('|'.join(
+    f'(?P<{sig.icao}>{sig.flight_re.pattern})'
+    for sig in _AIRLINE_SIGNATURES if sig.flight_re
+))
+
+# Text keyword -> airline ICAO, and one pattern finding every keyword in a
+# single scan of the PDF text. The lookahead lets matches overlap, so one
+# airline's keyword can't hide another's.
+_ICAO_BY_KEYWORD = {
+    kw: sig.icao for sig in _AIRLINE_SIGNATURES for kw in sig.keywords
+}
+_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(kw) for kw in sorted(_ICAO_BY_KEYWORD, key=len, reverse=True)) + '))'
+)
+
+# Airline names appear in the roster header, so only the start of the
+# PDF text is searched for keywords.
+_KEYWORD_SCAN_CHARS = 4096
+
+
+def _keyword_hits(header: str) -> set:
+    """ICAO codes of the airlines with a keyword in the PDF header text."""
+    return {_ICAO_BY_KEYWORD[kw] for kw in _KEYWORD_RE.findall(header.lower())}
 
 
 def detect_airline(
@@ -95,44 +142,67 @@ def detect_airline(
         AirlineGuess with name, ICAO code, and confidence score (0.0-1.0).
         Returns None if no airline could be guessed.
     """
+    # Canonical, hashable arguments for the cache. Rosters repeat the same
+    # few flight numbers, so flights are passed as sorted (number, count).
+    return _detect_airline(
+        roster_format,
+        (home_base or '').upper(),
+        (raw_pdf_text or '')[:_KEYWORD_SCAN_CHARS],
+        tuple(sorted(Counter(flight_numbers or ()).items())),
+    )
+
+
+@lru_cache(maxsize=512)
+def _detect_airline(
+    roster_format: str,
+    base_upper: str,
+    header: str,
+    flight_counts: Tuple[Tuple[str, int], ...],
+) -> Optional[AirlineGuess]:
+    """detect_airline() on canonical arguments, memoized (guesses are frozen)."""
     best_guess: Optional[AirlineGuess] = None
     best_score: float = 0.0
 
-    text_lower = (raw_pdf_text or '').lower()
-    base_upper = (home_base or '').upper()
-    flights = flight_numbers or []
+    # Flight-number matches per airline ICAO, each distinct number matched once
+    total_flights = 0
+    flight_matches = Counter()
+    for flight, count in flight_counts:
+        total_flights += count
+        m = _COMBINED_FLIGHT_RE.fullmatch(flight)
+        if m:
+            flight_matches[m.lastgroup] += count
+    keyword_hits = None     # scanned on first use
 
-    for sig in _AIRLINE_SIGNATURES:
+    for sig in _SIGNATURES_BY_FORMAT.get(roster_format, _ANY_FORMAT_SIGNATURES):
         score = 0.0
 
         # ── Format match (strongest signal for unique formats) ────────
-        if sig['format'] and roster_format == sig['format']:
+        if sig.format and roster_format == sig.format:
             # Unique formats like 'easyjet' are nearly certain
             if roster_format != 'crewlink':
                 score += 0.9  # Nearly certain
             else:
                 score += 0.2  # CrewLink is shared by many airlines
 
-        elif sig['format'] and roster_format != sig['format']:
-            continue  # Wrong format family, skip entirely
-
         # ── Home base match ───────────────────────────────────────────
-        if sig['bases'] and base_upper in sig['bases']:
+        if sig.bases and base_upper in sig.bases:
             score += 0.4
 
         # ── Flight prefix match ───────────────────────────────────────
-        if sig['flight_re'] and flights:
-            prefix_matches = sum(1 for f in flights if sig['flight_re'].match(f))
+        if sig.flight_re and total_flights:
+            prefix_matches = flight_matches[sig.icao]
             if prefix_matches > 0:
-                ratio = prefix_matches / len(flights)
+                ratio = prefix_matches / total_flights
                 score += 0.3 * ratio  # More matches = more confidence
 
         # ── Text keyword match (PDF header/body) ──────────────────────
-        if sig['keywords'] and text_lower:
-            for kw in sig['keywords']:
-                if kw in text_lower:
-                    score += 0.2
-                    break  # One keyword match is enough
+        if score + 0.2 <= best_score:
+            continue  # The keyword bonus can't lift this past the best guess
+        if sig.keywords and header:
+            if keyword_hits is None:
+                keyword_hits = _keyword_hits(header)
+            if sig.icao in keyword_hits:
+                score += 0.2  # One keyword match is enough
 
         # Cap at 1.0
         score = min(score, 1.0)
@@ -140,10 +210,14 @@ def detect_airline(
         if score > best_score:
             best_score = score
             best_guess = AirlineGuess(
-                name=sig['name'],
-                icao=sig['icao'],
+                name=sig.name,
+                icao=sig.icao,
                 confidence=round(score, 2),
             )
+            # Nearly certain. Reaching 0.9 takes a unique format or a home
+            # base match, which no other signature shares, so stop here
+            if best_score >= 0.9:
+                break
 
     # Only return if we have a meaningful guess (> 0.3 threshold)
     if best_guess and best_guess.confidence >= 0.3:
@@ -152,6 +226,13 @@ def detect_airline(
     return None
 
 
+# Roster role code -> pilot role
+_ROLE_BY_CODE = {
+    'CP': 'captain', 'CA': 'captain', 'CAPT': 'captain', 'PIC': 'captain',
+    'FO': 'first_officer', 'F/O': 'first_officer', 'SFO': 'first_officer', 'COFO': 'first_officer',
+}
+
+
 def extract_fleet_and_role(pilot_info: Dict) -> Dict[str, Optional[str]]:
     """
     Extract fleet (aircraft type) and pilot role from parsed pilot info.
@@ -171,20 +252,14 @@ def extract_fleet_and_role(pilot_info: Dict) -> Dict[str, Optional[str]]:
     if aircraft:
         aircraft = aircraft.strip()
         # Normalize: "319" → "A319", "320" → "A320", "A350" stays "A350"
-        if re.match(r'^\d{3}$', aircraft):
+        if len(aircraft) == 3 and aircraft.isdecimal():
             fleet = f"A{aircraft}"
-        elif re.match(r'^[A-Z]?\d{3}', aircraft):
-            fleet = aircraft.upper()
         else:
             fleet = aircraft.upper()
 
     # Role extraction
     role_code = pilot_info.get('role', '').strip().upper()
-    if role_code in ('CP', 'CA', 'CAPT', 'PIC'):
-        role = 'captain'
-    elif role_code in ('FO', 'F/O', 'SFO', 'COFO'):
-        role = 'first_officer'
-    elif role_code:
-        role = role_code.lower()
+    if role_code:
+        role = _ROLE_BY_CODE.get(role_code) or role_code.lower()
 
     return {'fleet': fleet, 'pilot_role': role}
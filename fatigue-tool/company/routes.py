@@ -14,7 +14,7 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import Company, User
@@ -91,24 +91,27 @@ async def list_companies(
     if db is None:
         raise HTTPException(503, "Database not available")
 
-    result = await db.execute(select(Company).order_by(Company.name))
-    companies = result.scalars().all()
+    # Member counts per company, joined in so it's a single query
+    member_counts = (
+        select(User.company_id, func.count().label("member_count"))
+        .group_by(User.company_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(Company, func.coalesce(member_counts.c.member_count, 0))
+        .outerjoin(member_counts, member_counts.c.company_id == Company.id)
+        .order_by(Company.name)
+    )
 
-    # Count members per company
-    output = []
-    for c in companies:
-        member_result = await db.execute(
-            select(User.id).where(User.company_id == c.id)
-        )
-        count = len(member_result.all())
-        output.append({
+    return [
+        {
             'id': str(c.id),
             'name': c.name,
             'icao_code': c.icao_code,
             'member_count': count,
-        })
-
-    return output
+        }
+        for c, count in result.all()
+    ]
 
 
 @router.post("")
@@ -181,10 +184,9 @@ async def get_company(
     if not user.is_admin and str(user.company_id) != company_id:
         raise HTTPException(403, "Not a member of this company")
 
-    member_result = await db.execute(
-        select(User.id).where(User.company_id == company.id)
-    )
-    count = len(member_result.all())
+    count = (await db.execute(
+        select(func.count()).select_from(User).where(User.company_id == company.id)
+    )).scalar_one()
 
     return {
         'id': str(company.id),
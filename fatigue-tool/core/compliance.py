@@ -9,9 +9,8 @@ References: EASA ORO.FTL, AMC1 ORO.FTL
 
 from datetime import datetime, timedelta, time
 from typing import Dict, List, Optional
-import pytz
 
-from models.data_models import Duty, CrewComposition, RestFacilityClass
+from models.data_models import Duty, CrewComposition, RestFacilityClass, get_timezone
 from core.parameters import EASAFatigueFramework
 
 class EASAComplianceValidator:
@@ -29,7 +28,7 @@ class EASAComplianceValidator:
         - Augmented crew 3/4-pilot operations (CS FTL.1.205(c)(2))
         - ULR operations (Qatar FTL 7.18)
         """
-        tz = pytz.timezone(duty.home_base_timezone)
+        tz = get_timezone(duty.home_base_timezone)
         report_local = duty.report_time_utc.astimezone(tz)
         report_hour = report_local.hour
         sectors = len(duty.segments)
@@ -120,7 +119,7 @@ class EASAComplianceValidator:
         reference_timezone: str
     ) -> timedelta:
         """Calculate overlap with WOCL (02:00-05:59 reference time)"""
-        tz = pytz.timezone(reference_timezone)
+        tz = get_timezone(reference_timezone)
         duty_start_local = duty_start.astimezone(tz)
         duty_end_local = duty_end.astimezone(tz)
         
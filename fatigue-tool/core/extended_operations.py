@@ -23,12 +23,11 @@ Scientific Foundation:
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-import pytz
 
 from models.data_models import (
     AcclimatizationState, CrewComposition, RestFacilityClass, ULRCrewSet,
     InFlightRestPeriod, InFlightRestPlan, ULRComplianceResult,
-    Duty, Roster, SleepBlock,
+    Duty, Roster, SleepBlock, get_timezone,
 )
 
 
@@ -311,7 +310,7 @@ class AugmentedCrewRestPlanner:
         rest_end_utc = rest_start_utc + timedelta(hours=rest_duration)
 
         # Check WOCL overlap
-        home_tz = pytz.timezone(home_timezone)
+        home_tz = get_timezone(home_timezone)
         rest_start_local = rest_start_utc.astimezone(home_tz)
         is_wocl = 0 <= rest_start_local.hour < 6 or rest_start_local.hour >= 22
 
@@ -401,7 +400,7 @@ class ULRRestPlanner:
                 rest_facility_class=RestFacilityClass.CLASS_1,
             )
 
-        home_tz = pytz.timezone(home_timezone)
+        home_tz = get_timezone(home_timezone)
 
         if crew_set == ULRCrewSet.CREW_B:
             if sector == "outbound":
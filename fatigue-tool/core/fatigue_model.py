@@ -25,7 +25,8 @@ from models.data_models import (
     Duty, Roster, FlightSegment, SleepBlock, CircadianState,
     PerformancePoint, PinchEvent, DutyTimeline, MonthlyAnalysis, FlightPhase,
     CrewComposition, RestFacilityClass, ULRCrewSet,
-    InFlightRestPeriod, InFlightRestPlan, ULRComplianceResult, DutyType
+    InFlightRestPeriod, InFlightRestPlan, ULRComplianceResult, DutyType,
+    get_timezone,
 )
 from core.parameters import ModelConfig
 from core.sleep_calculator import UnifiedSleepCalculator, SleepStrategy
@@ -129,8 +130,8 @@ class BorbelyFatigueModel:
         
         elapsed_days = elapsed_seconds / 86400
         
-        current_tz = pytz.timezone(current_tz_str)
-        home_tz = pytz.timezone(home_base_tz_str)
+        current_tz = get_timezone(current_tz_str)
+        home_tz = get_timezone(home_base_tz_str)
         
         naive_time = current_utc.replace(tzinfo=None)
         home_offset = home_tz.localize(naive_time).utcoffset().total_seconds() / 3600
@@ -201,7 +202,7 @@ class BorbelyFatigueModel:
             Strogatz et al. (1987) Am J Physiol 253:R173
             McCauley et al. (2013) Proc Natl Acad Sci 110:E2380-E2389
         """
-        tz = pytz.timezone(reference_timezone)
+        tz = get_timezone(reference_timezone)
         local_time = time_utc.astimezone(tz)
         hour_of_day = local_time.hour + local_time.minute / 60.0
 
@@ -570,7 +571,7 @@ class BorbelyFatigueModel:
         if rest_plan:
             rest_quality = rest_plan.rest_facility_quality
 
-        tz = pytz.timezone(duty.home_base_timezone)
+        tz = get_timezone(duty.home_base_timezone)
 
         # Pre-compute whether this is a training duty (no flight phases)
         is_training_duty = duty.duty_type != DutyType.FLIGHT if hasattr(duty, 'duty_type') else False
@@ -779,7 +780,7 @@ class BorbelyFatigueModel:
         
         if not timeline:
             logger.warning(f"[{duty.duty_id}] Empty timeline - using fallback calculation")
-            tz = pytz.timezone(duty.home_base_timezone)
+            tz = get_timezone(duty.home_base_timezone)
             mid_duty_time = duty.report_time_utc + (duty.release_time_utc - duty.report_time_utc) / 2
             
             s_estimate = 0.3
@@ -1197,7 +1198,7 @@ class BorbelyFatigueModel:
         """
         sleep_blocks = []
         sleep_strategies = {}
-        home_tz = pytz.timezone(roster.home_base_timezone)
+        home_tz = get_timezone(roster.home_base_timezone)
 
         # --- Pre-roster ROFF/off-day recovery fill ---
         # Days off (ROFF/LVE/OFF) before the first duty are skipped by the
@@ -1429,7 +1430,7 @@ class BorbelyFatigueModel:
                     rest_tz = home_tz
                     rest_env = 'home'
                 elif prev_arrival:
-                    rest_tz = pytz.timezone(prev_arrival.timezone)
+                    rest_tz = get_timezone(prev_arrival.timezone)
                     rest_env = 'hotel'
                 else:
                     rest_tz = home_tz
@@ -1885,7 +1886,7 @@ class BorbelyFatigueModel:
         """
         from core.strategy_references import get_strategy_references
 
-        home_tz = pytz.timezone(roster.home_base_timezone)
+        home_tz = get_timezone(roster.home_base_timezone)
 
         for duty_id, override in sleep_overrides.items():
             s_start = override["start_utc"]
@@ -1982,7 +1983,7 @@ class BorbelyFatigueModel:
             all_sleep.sort(key=lambda b: b.start_utc)
 
             # Build replacement strategy response
-            location_tz_obj = pytz.timezone(location_timezone)
+            location_tz_obj = get_timezone(location_timezone)
             ss_local = s_start.astimezone(location_tz_obj)
             se_local = s_end.astimezone(location_tz_obj)
 
@@ -2075,7 +2076,7 @@ class BorbelyFatigueModel:
 
         if strategy.sleep_blocks:
             for idx, block in enumerate(strategy.sleep_blocks):
-                location_tz = pytz.timezone(block.location_timezone)
+                location_tz = get_timezone(block.location_timezone)
                 sleep_start_local = block.start_utc.astimezone(location_tz)
                 sleep_end_local = block.end_utc.astimezone(location_tz)
                 sleep_start_home = block.start_utc.astimezone(home_tz)
@@ -2251,11 +2252,11 @@ class BorbelyFatigueModel:
         bcl = []
         if body_clock_timeline:
             for timestamp, state in body_clock_timeline:
-                bcl.append((
-                    timestamp.isoformat(),
-                    round(state.current_phase_shift_hours, 2),
-                    state.reference_timezone,
-                ))
+                bcl.append({
+                    'timestamp_utc': timestamp.isoformat(),
+                    'phase_shift_hours': round(state.current_phase_shift_hours, 2),
+                    'reference_timezone': state.reference_timezone,
+                })
 
         # ULR / augmented crew statistics
         total_ulr = sum(1 for dt in duty_timelines if getattr(dt, 'is_ulr', False))
@@ -24,7 +24,7 @@ logger = logging.getLogger(__name__)
 from models.data_models import (
     Duty, Roster, FlightSegment, SleepBlock, CircadianState,
     PerformancePoint, PinchEvent, DutyTimeline, MonthlyAnalysis, FlightPhase,
-    CrewComposition
+    CrewComposition, get_timezone,
 )
 from core.parameters import ModelConfig
 from core.sleep_quality import SleepQualityAnalysis, SleepQualityEngine
@@ -177,7 +177,7 @@ class UnifiedSleepCalculator(SleepStrategyMixin):
             home_base: Pilot's home base airport code (e.g., 'DOH')
         """
 
-        self.home_tz = pytz.timezone(home_timezone)
+        self.home_tz = get_timezone(home_timezone)
         # Use provided home_base, or infer from first departure if not provided
         self.home_base = home_base or (duty.segments[0].departure_airport.code if duty.segments else None)
 
@@ -207,7 +207,7 @@ class UnifiedSleepCalculator(SleepStrategyMixin):
             layover_duration_hours = (duty.report_time_utc - previous_duty.release_time_utc).total_seconds() / 3600
             # Only use layover timezone if pilot has been at this location >48h (acclimated)
             if layover_duration_hours > 48:
-                strategy_tz = pytz.timezone(layover_tz)
+                strategy_tz = get_timezone(layover_tz)
 
         report_local = duty.report_time_utc.astimezone(strategy_tz)
         report_hour = report_local.hour
@@ -225,8 +225,8 @@ class UnifiedSleepCalculator(SleepStrategyMixin):
         timezone_shift = 0.0
         if duty.segments:
             dep_airport = duty.segments[0].departure_airport
-            home_airport_tz = pytz.timezone(duty.home_base_timezone)
-            dep_tz = pytz.timezone(dep_airport.timezone)
+            home_airport_tz = get_timezone(duty.home_base_timezone)
+            dep_tz = get_timezone(dep_airport.timezone)
             # Correctly convert UTC time to each timezone to get the offset
             home_offset = duty.report_time_utc.astimezone(home_airport_tz).utcoffset().total_seconds() / 3600
             dep_offset = duty.report_time_utc.astimezone(dep_tz).utcoffset().total_seconds() / 3600
@@ -355,7 +355,7 @@ class UnifiedSleepCalculator(SleepStrategyMixin):
             Dijk & Czeisler (1995) J Neurosci 15:3526
             Borbély (1982) Human Neurobiol 1:195-204
         """
-        self.home_tz = pytz.timezone(home_timezone)
+        self.home_tz = get_timezone(home_timezone)
         self.home_base = home_base or (
             next_duty.segments[0].departure_airport.code
             if next_duty.segments else None
@@ -364,7 +364,7 @@ class UnifiedSleepCalculator(SleepStrategyMixin):
         # --- Determine sleep location ---
         arrival_airport = previous_duty.segments[-1].arrival_airport if previous_duty.segments else None
         if arrival_airport and arrival_airport.code != self.home_base:
-            sleep_tz = pytz.timezone(arrival_airport.timezone)
+            sleep_tz = get_timezone(arrival_airport.timezone)
             sleep_location = 'hotel'
             is_layover = True
         else:
@@ -387,7 +387,7 @@ class UnifiedSleepCalculator(SleepStrategyMixin):
             sleep_tz.zone if (not is_layover or acclimated)
             else self.home_tz.zone
         )
-        bio_tz = pytz.timezone(bio_tz_str)
+        bio_tz = get_timezone(bio_tz_str)
 
         # --- 1. Sleep onset: release time + arrival-window delay ---
         # Roach et al. (2025): layover sleep onset predicted by layover start
@@ -18,9 +18,10 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 import math
-import pytz
 import logging
 
+from models.data_models import get_timezone
+
 logger = logging.getLogger(__name__)
 
 
@@ -183,8 +184,8 @@ class SleepQualityEngine:
             wocl_boost = 1.0   # No penalty for non-WOCL sleep
 
         # 5. Late sleep onset penalty
-        tz = pytz.timezone(location_timezone)
-        bio_tz_for_onset = pytz.timezone(biological_timezone) if biological_timezone else tz
+        tz = get_timezone(location_timezone)
+        bio_tz_for_onset = get_timezone(biological_timezone) if biological_timezone else tz
         sleep_start_bio_local = sleep_start.astimezone(bio_tz_for_onset)
         sleep_start_hour = sleep_start_bio_local.hour + sleep_start_bio_local.minute / 60.0
 
@@ -370,7 +371,7 @@ class SleepQualityEngine:
         """Calculate hours of sleep overlapping WOCL (02:00-06:00) in biological TZ."""
 
         wocl_tz_str = biological_timezone or location_timezone
-        wocl_tz = pytz.timezone(wocl_tz_str)
+        wocl_tz = get_timezone(wocl_tz_str)
 
         sleep_start_bio = sleep_start.astimezone(wocl_tz)
         sleep_end_bio = sleep_end.astimezone(wocl_tz)
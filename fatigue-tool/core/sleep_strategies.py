@@ -22,7 +22,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Any
 import pytz
 
-from models.data_models import Duty, SleepBlock
+from models.data_models import Duty, SleepBlock, get_timezone
 from core.sleep_quality import SleepQualityAnalysis
 
 
@@ -65,7 +65,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -182,7 +182,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -309,7 +309,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -401,7 +401,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -416,7 +416,7 @@ class SleepStrategyMixin:
             second=0, microsecond=0,
         ) - timedelta(days=1)
 
-        bio_tz = pytz.timezone(
+        bio_tz = get_timezone(
             self.home_tz.zone if (self.is_layover and self.layover_duration_hours <= 48)
             else sleep_tz.zone
         )
@@ -521,7 +521,7 @@ class SleepStrategyMixin:
         # Outbound (at home base): home_tz, 'home' environment.
         # Return (at layover station): layover_tz, 'hotel' environment.
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment  # 'hotel'
         else:
             sleep_tz = self.home_tz
@@ -711,7 +711,7 @@ class SleepStrategyMixin:
 
         # Determine where the pilot actually sleeps before this duty.
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment  # 'hotel'
         else:
             sleep_tz = self.home_tz
@@ -836,7 +836,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -923,7 +923,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -1002,7 +1002,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -1156,7 +1156,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -1267,7 +1267,7 @@ class SleepStrategyMixin:
         from core.sleep_calculator import SleepStrategy
 
         if self.is_layover and self.layover_timezone:
-            sleep_tz = pytz.timezone(self.layover_timezone)
+            sleep_tz = get_timezone(self.layover_timezone)
             sleep_location = self.sleep_environment
         else:
             sleep_tz = self.home_tz
@@ -1283,7 +1283,7 @@ class SleepStrategyMixin:
         ) - timedelta(days=1)
 
         extended_duration = min(9.0, self.MAX_REALISTIC_SLEEP)
-        bio_tz_obj = pytz.timezone(
+        bio_tz_obj = get_timezone(
             self.home_tz.zone if (self.is_layover and self.layover_duration_hours <= 48)
             else sleep_tz.zone
         )
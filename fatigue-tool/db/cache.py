@@ -0,0 +1,60 @@
+"""
+Optional Redis response cache for Aerowake.
+
+Reads REDIS_URL from environment. When it is unset (development) or the
+redis client is not installed, every lookup is a miss and writes are
+dropped, so callers always fall back to the database.
+"""
+
+import os
+import logging
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is only needed when REDIS_URL is configured
+    aioredis = None
+
+# ─── Connection Setup ────────────────────────────────────────────────────────
+
+REDIS_URL = os.environ.get("REDIS_URL", "")
+
+# Only create a client if we have a URL and the driver is available
+redis_client = None
+
+if REDIS_URL and aioredis is not None:
+    redis_client = aioredis.from_url(
+        REDIS_URL,
+        socket_timeout=0.5,
+        socket_connect_timeout=0.5,
+    )
+elif REDIS_URL:
+    logger.warning("REDIS_URL is set but the redis package is not installed — caching disabled")
+
+
+def is_cache_available() -> bool:
+    """Check if a Redis cache is configured."""
+    return redis_client is not None
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """Return the cached bytes for key, or None on miss / cache outage."""
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.warning(f"Redis GET {key} failed: {e}")
+        return None
+
+
+async def cache_set(key: str, value: Union[str, bytes], ttl_seconds: int) -> None:
+    """Store value under key with a TTL. Failures are logged and ignored."""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(key, value, ex=ttl_seconds)
+    except Exception as e:
+        logger.warning(f"Redis SET {key} failed: {e}")
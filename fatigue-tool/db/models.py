@@ -8,6 +8,8 @@ Tables:
   - analyses: full JSON analysis results (~150-200KB JSONB)
   - fatigue_states: end-of-roster fatigue state for chaining across months
   - aggregate_metrics: pre-computed comparative stats per company/fleet/role
+  - monthly_metrics: per-roster dashboard figures, denormalized from analyses
+  - platform_stats: single-row platform-wide counts for the admin dashboard
   - refresh_tokens: JWT refresh token rotation
 """
 
@@ -26,10 +28,12 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     UniqueConstraint,
+    and_,
     func,
+    select,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import DeclarativeBase, relationship
+from sqlalchemy.orm import DeclarativeBase, aliased, deferred, relationship
 
 
 class Base(DeclarativeBase):
@@ -93,6 +97,7 @@ class User(Base):
 
     __table_args__ = (
         Index("ix_users_company_id", "company_id"),
+        Index("ix_users_created_at", "created_at"),
     )
 
 
@@ -114,7 +119,10 @@ class Roster(Base):
     total_sectors = Column(Integer, nullable=True)
     total_duty_hours = Column(Float, nullable=True)
     total_block_hours = Column(Float, nullable=True)
-    original_file_bytes = Column(LargeBinary, nullable=True)  # Store uploaded PDF
+    # Uploaded PDF. Deferred: only re-parsing needs it, and every other
+    # Roster load (listings, metrics, dashboard, deletes) would otherwise
+    # pull up to several MB per row.
+    original_file_bytes = deferred(Column(LargeBinary, nullable=True))
 
     # Company + fleet/role (auto-extracted from PDF)
     company_id = Column(
@@ -133,6 +141,7 @@ class Roster(Base):
     __table_args__ = (
         Index("ix_rosters_user_month", "user_id", "month"),
         Index("ix_rosters_company_id", "company_id"),
+        Index("ix_rosters_created_at", created_at.desc()),
     )
 
 
@@ -146,6 +155,9 @@ class Analysis(Base):
         UUID(as_uuid=True), ForeignKey("rosters.id", ondelete="CASCADE"), nullable=False
     )
     analysis_json = Column(JSONB, nullable=False)  # Full response (~150-200KB)
+    # The same response pre-encoded, so GET /api/analysis can return it as-is.
+    # Deferred: other readers only need the JSONB. NULL on rows written before it.
+    analysis_json_blob = deferred(Column(LargeBinary, nullable=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
@@ -240,6 +252,85 @@ class AggregateMetrics(Base):
     )
 
 
+# ── RosterMonthlyMetrics (for the yearly dashboard) ──────────────────────────
+
+class RosterMonthlyMetrics(Base):
+    """
+    Dashboard figures for one analysed roster, aggregated from its latest
+    analysis when that analysis is saved (see metrics/monthly.py).
+
+    Analyses are immutable, so /api/dashboard/yearly reads these rows
+    instead of re-scanning ~200KB of analysis JSONB per month.
+    """
+    __tablename__ = "monthly_metrics"
+
+    roster_id = Column(
+        UUID(as_uuid=True), ForeignKey("rosters.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    month = Column(String(7), nullable=False)                     # "2026-02"
+    filename = Column(String(255), nullable=False)
+    roster_created_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Activity
+    total_duties = Column(Integer, nullable=False, default=0)
+    total_sectors = Column(Integer, nullable=False, default=0)
+    total_duty_hours = Column(Float, nullable=False, default=0.0)
+    total_block_hours = Column(Float, nullable=False, default=0.0)
+
+    # Performance (0 when no duty reported one). Floats here are rounded to 0.1.
+    avg_performance = Column(Float, nullable=False, default=0.0)     # mean of duty averages
+    worst_performance = Column(Float, nullable=False, default=0.0)   # min of duty minimums
+
+    # Risk distribution
+    low_risk_count = Column(Integer, nullable=False, default=0)
+    moderate_risk_count = Column(Integer, nullable=False, default=0)
+    high_risk_count = Column(Integer, nullable=False, default=0)
+    critical_risk_count = Column(Integer, nullable=False, default=0)   # critical + extreme
+
+    # Sleep / WOCL / safety
+    avg_sleep_per_night = Column(Float, nullable=False, default=0.0)
+    max_sleep_debt = Column(Float, nullable=False, default=0.0)
+    average_sleep_debt = Column(Float, nullable=False, default=0.0)
+    total_wocl_hours = Column(Float, nullable=False, default=0.0)
+    total_pinch_events = Column(Integer, nullable=False, default=0)
+    high_risk_duties = Column(Integer, nullable=False, default=0)
+    critical_risk_duties = Column(Integer, nullable=False, default=0)
+
+    # Duty type breakdown
+    flight_duties = Column(Integer, nullable=False, default=0)
+    simulator_duties = Column(Integer, nullable=False, default=0)
+    ground_training_duties = Column(Integer, nullable=False, default=0)
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_monthly_metrics_user_month", "user_id", "month"),
+    )
+
+
+# ── PlatformStatsSummary (for the admin dashboard) ───────────────────────────
+
+class PlatformStatsSummary(Base):
+    """
+    Single-row summary of platform-wide counts (id is always 1).
+
+    Totals are incremented/decremented by ORM insert/delete events and
+    periodically reconciled against full COUNTs (see admin/stats.py).
+    """
+    __tablename__ = "platform_stats"
+
+    id = Column(Integer, primary_key=True, default=1)
+    total_users = Column(Integer, nullable=False, default=0)       # active users
+    total_rosters = Column(Integer, nullable=False, default=0)
+    total_analyses = Column(Integer, nullable=False, default=0)
+    users_last_7_days = Column(Integer, nullable=False, default=0)
+    rosters_last_7_days = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 # ── RefreshToken ─────────────────────────────────────────────────────────────
 
 class RefreshToken(Base):
@@ -249,9 +340,32 @@ class RefreshToken(Base):
     user_id = Column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    token_hash = Column(String(255), nullable=False, index=True)
+    token_hash = Column(LargeBinary(32), nullable=False, index=True)   # SHA-256 digest
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="refresh_tokens")
+
+
+# ── Roster.latest_analysis ───────────────────────────────────────────────────
+
+# Roster.latest_analysis: only the newest analysis of each roster. Readers
+# that want one analysis per roster load this instead of Roster.analyses,
+# so re-analysed rosters don't drag every historical JSONB along.
+_newer = aliased(Analysis)
+
+Roster.latest_analysis = relationship(
+    Analysis,
+    primaryjoin=and_(
+        Analysis.roster_id == Roster.id,
+        Analysis.id == select(_newer.id)
+        .where(_newer.roster_id == Roster.id)
+        .order_by(_newer.created_at.desc())
+        .limit(1)
+        .correlate(Roster)
+        .scalar_subquery(),
+    ),
+    uselist=False,
+    viewonly=True,
+)
@@ -30,13 +30,26 @@ else:
 engine = None
 AsyncSessionLocal = None
 
+# Pool sizing can be tuned per deployment without a code change
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+
 if DATABASE_URL:
     engine = create_async_engine(
         DATABASE_URL,
         echo=False,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
         pool_pre_ping=True,
+        connect_args={
+            # asyncpg's own statement cache (raw connection API)
+            "statement_cache_size": 1024,
+            # SQLAlchemy's per-connection prepared statement cache: the
+            # same compiled queries (auth lookups, admin counts, roster
+            # lists) are re-executed on every request, so keeping them
+            # prepared skips a parse/plan round-trip each time.
+            "prepared_statement_cache_size": 256,
+        },
     )
     AsyncSessionLocal = async_sessionmaker(
         engine,
@@ -77,6 +90,18 @@ async def init_db():
         await _add_column_if_missing(conn, "rosters", "fleet", "VARCHAR(10)")
         await _add_column_if_missing(conn, "rosters", "pilot_role", "VARCHAR(20)")
 
+        # Migration 004: indexes for paginated admin listings
+        await _create_index_if_missing(conn, "ix_users_created_at", "users", "created_at")
+        await _create_index_if_missing(conn, "ix_rosters_created_at", "rosters", "created_at DESC")
+
+        # Migration 005: pre-encoded analysis JSON
+        await _add_column_if_missing(conn, "analyses", "analysis_json_blob", "BYTEA")
+
+        # Migration 006: refresh token hashes as raw digests instead of hex
+        await _alter_column_type_if_needed(
+            conn, "refresh_tokens", "token_hash", "bytea", "decode(token_hash, 'hex')"
+        )
+
     logger.info("Database tables initialized successfully")
 
 
@@ -92,6 +117,30 @@ async def _add_column_if_missing(conn, table: str, column: str, column_def: str)
         logger.info(f"Added column {table}.{column}")
 
 
+async def _alter_column_type_if_needed(
+    conn, table: str, column: str, data_type: str, using: str
+):
+    """Convert a column to data_type (a Postgres type name) via USING, unless
+    it already has that type (idempotent)."""
+    from sqlalchemy import text
+    result = await conn.execute(text(
+        f"SELECT data_type FROM information_schema.columns "
+        f"WHERE table_name = :table AND column_name = :column"
+    ), {"table": table, "column": column})
+    current = result.scalar_one_or_none()
+    if current is not None and current != data_type:
+        await conn.execute(text(
+            f'ALTER TABLE "{table}" ALTER COLUMN "{column}" TYPE {data_type} USING {using}'
+        ))
+        logger.info(f"Converted {table}.{column} from {current} to {data_type}")
+
+
+async def _create_index_if_missing(conn, name: str, table: str, columns: str):
+    """Create an index on an existing table if it doesn't exist (idempotent)."""
+    from sqlalchemy import text
+    await conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({columns})'))
+
+
 async def get_db():
     """FastAPI dependency — yields an async DB session."""
     if AsyncSessionLocal is None:
@@ -27,6 +27,9 @@ logger = logging.getLogger(__name__)
 
 MIN_SAMPLE_SIZE = 5
 
+# Duty risk levels counted as "high risk" in the comparative metrics
+HIGH_RISK_LEVELS = frozenset(("high", "critical", "extreme"))
+
 
 # ── Public API ────────────────────────────────────────────────────────────────
 
@@ -48,7 +51,7 @@ async def compute_aggregate_metrics(
             select(Roster)
             .where(Roster.company_id == company_id)
             .where(Roster.month == month)
-            .options(selectinload(Roster.analyses))
+            .options(selectinload(Roster.latest_analysis))
         )
         rosters = result.scalars().all()
 
@@ -57,11 +60,10 @@ async def compute_aggregate_metrics(
         seen_users: set[UUID] = set()
 
         for roster in rosters:
-            if not roster.analyses or roster.user_id in seen_users:
+            if roster.latest_analysis is None or roster.user_id in seen_users:
                 continue
-            # Use the latest analysis per user (deduplicate)
-            analysis = roster.analyses[0]
-            data = _extract_pilot_data(roster, analysis)
+            # One roster per user (deduplicate), using its latest analysis
+            data = _extract_pilot_data(roster, roster.latest_analysis)
             if data is not None:
                 pilot_data.append(data)
                 seen_users.add(roster.user_id)
@@ -153,18 +155,18 @@ def _extract_pilot_data(roster: Roster, analysis: Analysis) -> Optional[_PilotMo
     d.avg_sleep_per_night = aj.get("avg_sleep_per_night", 0) or 0
     d.avg_sleep_debt = aj.get("average_sleep_debt", 0) or 0
 
-    # Compute average performance from duty-level data
-    all_avg_perf = []
-    high_risk = 0
+    # Compute average performance from duty-level data (one pass, running sums)
+    perf_sum = 0.0
+    perf_count = high_risk = 0
     for duty in duties:
         avg_p = duty.get("avg_performance")
         if avg_p is not None:
-            all_avg_perf.append(avg_p)
-        rl = duty.get("risk_level", "low")
-        if rl in ("high", "critical", "extreme"):
+            perf_sum += avg_p
+            perf_count += 1
+        if duty.get("risk_level") in HIGH_RISK_LEVELS:
             high_risk += 1
 
-    d.avg_performance = (sum(all_avg_perf) / len(all_avg_perf)) if all_avg_perf else 0
+    d.avg_performance = (perf_sum / perf_count) if perf_count else 0
     d.high_risk_duty_count = high_risk
     d.total_risk_duties = len(duties)
 
@@ -0,0 +1,152 @@
+"""
+Per-roster dashboard metrics for /api/dashboard/yearly.
+
+Each analysed roster gets one monthly_metrics row holding the figures the
+yearly dashboard shows. The row is computed once, when the analysis is
+saved, by aggregating its duties JSONB inside Postgres:
+
+  - refresh_monthly_metrics() upserts the row for one roster and is called
+    from the analysis persistence path (analyze and reanalyze).
+  - backfill_monthly_metrics() runs in the background at startup. It fills
+    in rows for rosters analysed before the table existed, and recomputes
+    rows older than the roster's latest analysis (a refresh that failed
+    after a reanalysis).
+
+Rows are deleted with their roster (FK cascade).
+"""
+
+import logging
+from uuid import UUID
+
+from sqlalchemy import Float, Integer, Numeric, column, func, select, true
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from db.models import Analysis, Roster, RosterMonthlyMetrics
+from db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+
+async def refresh_monthly_metrics(db: AsyncSession, roster_id: UUID) -> None:
+    """Recompute and upsert the monthly_metrics row for one roster."""
+    await db.execute(_upsert(_metrics_select().where(Roster.id == roster_id)))
+    await db.commit()
+
+
+async def backfill_monthly_metrics() -> None:
+    """Compute rows for analysed rosters that have none, or whose row
+    predates the roster's latest analysis."""
+    if AsyncSessionLocal is None:
+        return
+    # Analysis is the latest analysis joined in by _metrics_select()
+    missing_or_stale = ~select(RosterMonthlyMetrics.roster_id).where(
+        RosterMonthlyMetrics.roster_id == Roster.id,
+        RosterMonthlyMetrics.computed_at >= Analysis.created_at,
+    ).exists()
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(_upsert(_metrics_select().where(missing_or_stale)))
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to backfill monthly metrics: {e}")
+
+
+# ── Aggregation ───────────────────────────────────────────────────────────────
+
+
+def _metrics_select():
+    """One row per analysed roster, columns named after RosterMonthlyMetrics.
+
+    Uses the roster's latest analysis; its duties array is expanded with
+    jsonb_array_elements and aggregated with COUNT ... FILTER / SUM / AVG /
+    MIN. Roster totals win over the analysis totals unless they are 0/NULL.
+    Hours, performance and sleep figures are stored rounded to 0.1, as the
+    dashboard shows them.
+    """
+    latest = aliased(Analysis)
+    latest_analysis_id = (
+        select(latest.id)
+        .where(latest.roster_id == Roster.id)
+        .order_by(latest.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    aj = Analysis.analysis_json
+    duty = (
+        func.jsonb_array_elements(aj["duties"])
+        .table_valued(column("value", JSONB))
+        .alias("duty")
+    )
+    risk_level = func.coalesce(duty.c.value["risk_level"].astext, "low")
+    duty_type = duty.c.value["duty_type"].astext
+    n_duties = func.count(duty.c.value)
+    n_simulator = n_duties.filter(duty_type == "simulator")
+    n_ground = n_duties.filter(duty_type == "ground_training")
+
+    def _total(roster_col, key: str, type_):
+        return func.coalesce(func.nullif(roster_col, 0), _num(aj[key]).cast(type_), 0)
+
+    def _int(key: str):
+        return func.coalesce(_num(aj[key]), 0).cast(Integer)
+
+    return (
+        select(
+            Roster.id.label("roster_id"),
+            Roster.user_id.label("user_id"),
+            Roster.month.label("month"),
+            Roster.filename.label("filename"),
+            Roster.created_at.label("roster_created_at"),
+            _total(Roster.total_duties, "total_duties", Integer).label("total_duties"),
+            _total(Roster.total_sectors, "total_sectors", Integer).label("total_sectors"),
+            _round1(_total(Roster.total_duty_hours, "total_duty_hours", Float)).label("total_duty_hours"),
+            _round1(_total(Roster.total_block_hours, "total_block_hours", Float)).label("total_block_hours"),
+            _round1(func.avg(_num(duty.c.value["avg_performance"]))).label("avg_performance"),
+            _round1(func.min(_num(duty.c.value["min_performance"]))).label("worst_performance"),
+            n_duties.filter(risk_level == "low").label("low_risk_count"),
+            n_duties.filter(risk_level == "moderate").label("moderate_risk_count"),
+            n_duties.filter(risk_level == "high").label("high_risk_count"),
+            n_duties.filter(risk_level.in_(("critical", "extreme"))).label("critical_risk_count"),
+            _round1(_num(aj["avg_sleep_per_night"])).label("avg_sleep_per_night"),
+            _round1(_num(aj["max_sleep_debt"])).label("max_sleep_debt"),
+            _round1(_num(aj["average_sleep_debt"])).label("average_sleep_debt"),
+            _round1(func.sum(_num(duty.c.value["wocl_hours"]))).label("total_wocl_hours"),
+            _int("total_pinch_events").label("total_pinch_events"),
+            _int("high_risk_duties").label("high_risk_duties"),
+            _int("critical_risk_duties").label("critical_risk_duties"),
+            (n_duties - n_simulator - n_ground).label("flight_duties"),
+            n_simulator.label("simulator_duties"),
+            n_ground.label("ground_training_duties"),
+        )
+        .select_from(Roster)
+        .join(Analysis, Analysis.id == latest_analysis_id)
+        .outerjoin(duty, true())
+        .group_by(Roster.id, Analysis.id)
+    )
+
+
+def _num(expr):
+    """A JSONB field as a float (NULL when missing)."""
+    return expr.astext.cast(Float)
+
+
+def _round1(expr):
+    """expr rounded to one decimal, 0.0 when NULL (round() needs numeric)."""
+    return func.coalesce(func.round(expr.cast(Numeric), 1).cast(Float), 0.0)
+
+
+def _upsert(metrics_select):
+    columns = [c.name for c in metrics_select.selected_columns]
+    stmt = pg_insert(RosterMonthlyMetrics).from_select(columns, metrics_select)
+    return stmt.on_conflict_do_update(
+        index_elements=[RosterMonthlyMetrics.roster_id],
+        set_={
+            **{name: stmt.excluded[name] for name in columns if name != "roster_id"},
+            "computed_at": func.now(),
+        },
+    )
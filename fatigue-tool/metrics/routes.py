@@ -17,7 +17,7 @@ from sqlalchemy.orm import selectinload
 from auth.dependencies import get_current_user
 from db.models import User, Roster, Analysis, AggregateMetrics
 from db.session import get_db
-from metrics.aggregator import MIN_SAMPLE_SIZE
+from metrics.aggregator import HIGH_RISK_LEVELS, MIN_SAMPLE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -220,7 +220,7 @@ async def get_comparative_trend(
     result = await db.execute(
         select(Roster)
         .where(Roster.user_id == user.id)
-        .options(selectinload(Roster.analyses))
+        .options(selectinload(Roster.latest_analysis))
         .order_by(Roster.month.desc())
         .limit(12)
     )
@@ -237,12 +237,11 @@ async def get_comparative_trend(
     trend_points: list[TrendPoint] = []
 
     for roster in reversed(rosters):  # chronological order
-        if not roster.analyses:
+        if roster.latest_analysis is None:
             continue
 
         # Pilot's own performance
-        analysis = roster.analyses[0]
-        aj = analysis.analysis_json or {}
+        aj = roster.latest_analysis.analysis_json or {}
         duties = aj.get("duties", [])
         all_perf = [d.get("avg_performance") for d in duties if d.get("avg_performance") is not None]
         pilot_perf = round(sum(all_perf) / len(all_perf), 1) if all_perf else None
@@ -293,21 +292,20 @@ async def _get_pilot_metrics(db: AsyncSession, user_id, month: str) -> PilotMetr
         select(Roster)
         .where(Roster.user_id == user_id)
         .where(Roster.month == month)
-        .options(selectinload(Roster.analyses))
+        .options(selectinload(Roster.latest_analysis))
         .order_by(Roster.created_at.desc())
         .limit(1)
     )
     roster = result.scalar_one_or_none()
 
-    if not roster or not roster.analyses:
+    if not roster or roster.latest_analysis is None:
         return PilotMetrics()
 
-    analysis = roster.analyses[0]
-    aj = analysis.analysis_json or {}
+    aj = roster.latest_analysis.analysis_json or {}
     duties = aj.get("duties", [])
 
     all_perf = [d.get("avg_performance") for d in duties if d.get("avg_performance") is not None]
-    high_risk = sum(1 for d in duties if d.get("risk_level") in ("high", "critical", "extreme"))
+    high_risk = sum(1 for d in duties if d.get("risk_level") in HIGH_RISK_LEVELS)
 
     return PilotMetrics(
         avg_performance=round(sum(all_perf) / len(all_perf), 1) if all_perf else None,
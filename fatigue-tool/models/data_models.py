@@ -7,11 +7,26 @@ Data models for roster analysis, duties, sleep, and performance tracking.
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 import pytz
 
 
+# ============================================================================
+# TIMEZONES
+# ============================================================================
+
+@lru_cache(maxsize=512)
+def get_timezone(name: str):
+    """Memoized pytz.timezone() — rosters reuse a handful of zones many times.
+
+    Shared by the parsers, the fatigue model and the API so every layer
+    resolves a zone name once per process.
+    """
+    return pytz.timezone(name)
+
+
 # ============================================================================
 # ENUMS
 # ============================================================================
@@ -134,8 +149,8 @@ class Airport:
         Returns:
             Hours difference (positive = eastward, negative = westward)
         """
-        tz1 = pytz.timezone(self.timezone)
-        tz2 = pytz.timezone(other.timezone)
+        tz1 = get_timezone(self.timezone)
+        tz2 = get_timezone(other.timezone)
         
         offset1 = tz1.utcoffset(reference_time).total_seconds() / 3600
         offset2 = tz2.utcoffset(reference_time).total_seconds() / 3600
@@ -235,17 +250,17 @@ class Duty:
     @property
     def report_time_local(self) -> datetime:
         if self.segments:
-            tz = pytz.timezone(self.segments[0].departure_airport.timezone)
+            tz = get_timezone(self.segments[0].departure_airport.timezone)
         else:
-            tz = pytz.timezone(self.home_base_timezone)
+            tz = get_timezone(self.home_base_timezone)
         return self.report_time_utc.astimezone(tz)
 
     @property
     def release_time_local(self) -> datetime:
         if self.segments:
-            tz = pytz.timezone(self.segments[-1].arrival_airport.timezone)
+            tz = get_timezone(self.segments[-1].arrival_airport.timezone)
         else:
-            tz = pytz.timezone(self.home_base_timezone)
+            tz = get_timezone(self.home_base_timezone)
         return self.release_time_utc.astimezone(tz)
 
     @property
@@ -816,8 +831,9 @@ class MonthlyAnalysis:
     lowest_performance_duty: Optional[str] = None
     lowest_performance_value: float = 100.0
 
-    # Circadian adaptation timeline: [(utc_iso, phase_shift_hours, reference_tz)]
-    body_clock_timeline: List[tuple] = field(default_factory=list)
+    # Circadian adaptation timeline, already in API shape:
+    # [{timestamp_utc, phase_shift_hours, reference_timezone}]
+    body_clock_timeline: List[dict] = field(default_factory=list)
 
     # Augmented crew / ULR statistics
     total_ulr_duties: int = 0
@@ -34,10 +34,10 @@ import airportsdata
 import pytz
 
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Optional, Tuple
+from typing import BinaryIO, List, Dict, Optional, Tuple, Union
 
 from models.data_models import (
-    Airport, FlightSegment, Duty, DutyType
+    Airport, FlightSegment, Duty, DutyType, get_timezone,
 )
 
 # ── Module-level airport DB (cached, ~7,800 IATA airports) ──────────────────
@@ -132,7 +132,7 @@ def _localize_to_utc(time_str: str, col_date: datetime, airport_tz: str, day_off
     """
     t = datetime.strptime(time_str, '%H:%M').time()
     naive = datetime.combine(col_date.date(), t) + timedelta(days=day_offset)
-    tz = pytz.timezone(airport_tz)
+    tz = get_timezone(airport_tz)
     local = tz.localize(naive, is_dst=None)
     return local.astimezone(pytz.utc)
 
@@ -177,7 +177,7 @@ class EasyJetParser:
 
     # ── Public entry point ────────────────────────────────────────────────
 
-    def parse_roster(self, pdf_path: str) -> Dict:
+    def parse_roster(self, pdf_path: Union[str, BinaryIO]) -> Dict:
         """
         Parse an easyJet PDF roster.
 
@@ -14,11 +14,11 @@ Supports: Qatar Airways, Emirates, Etihad, and other airlines with CrewLink-styl
 import re
 import pdfplumber
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional, Union
 import pytz
 import airportsdata
 
-from models.data_models import Airport, FlightSegment, Duty, DutyType
+from models.data_models import Airport, FlightSegment, Duty, DutyType, get_timezone
 
 
 # Load global IATA airport database (~7,800 airports with timezones and coordinates)
@@ -138,7 +138,7 @@ class CrewLinkRosterParser:
         """Return the pilot's home base IATA code (e.g. 'DOH')."""
         return self.home_base_code
 
-    def parse_roster(self, pdf_path: str) -> Dict:
+    def parse_roster(self, pdf_path: Union[str, BinaryIO]) -> Dict:
         """
         Main entry point - parses airline grid-format roster PDF
         
@@ -554,11 +554,11 @@ class CrewLinkRosterParser:
             # FIXED: Added 'homebase' format conversion
             if self.timezone_format == 'local':
                 # Report time is in LOCAL timezone of departure airport
-                dep_tz = pytz.timezone(dep_airport.timezone)
+                dep_tz = get_timezone(dep_airport.timezone)
                 report_time = dep_tz.localize(report_time_naive)
             elif self.timezone_format == 'homebase':
                 # Report time is in HOME BASE timezone
-                home_tz = pytz.timezone(self.home_timezone)
+                home_tz = get_timezone(self.home_timezone)
                 report_time = home_tz.localize(report_time_naive)
             else:  # zulu
                 # Report time is already in UTC
@@ -569,11 +569,11 @@ class CrewLinkRosterParser:
             if report_time > first_departure:
                 # Report is after departure - move to previous day
                 if self.timezone_format == 'local':
-                    dep_tz = pytz.timezone(dep_airport.timezone)
+                    dep_tz = get_timezone(dep_airport.timezone)
                     report_time_naive_prev = report_time_naive - timedelta(days=1)
                     report_time = dep_tz.localize(report_time_naive_prev)
                 elif self.timezone_format == 'homebase':
-                    home_tz = pytz.timezone(self.home_timezone)
+                    home_tz = get_timezone(self.home_timezone)
                     report_time_naive_prev = report_time_naive - timedelta(days=1)
                     report_time = home_tz.localize(report_time_naive_prev)
                 print(f"  ⚠️  Report time adjusted to previous day (was after first departure)")
@@ -604,7 +604,7 @@ class CrewLinkRosterParser:
         # a 00:10 GRU report on "03Jan" column = 06:10 DOH, still 03 Jan in DOH —
         # but a very early local report could cross the home-base date boundary.
         # Anchoring to home TZ ensures the chronogram row always matches.
-        home_tz_parser = pytz.timezone(self.home_timezone)
+        home_tz_parser = get_timezone(self.home_timezone)
         report_in_home_tz = report_time.astimezone(home_tz_parser)
         duty_date = datetime(
             report_in_home_tz.year,
@@ -725,7 +725,7 @@ class CrewLinkRosterParser:
         end_time_naive, _ = times_found[1]
 
         # 3. Localize times to UTC (training always at home base)
-        home_tz = pytz.timezone(self.home_timezone)
+        home_tz = get_timezone(self.home_timezone)
         try:
             if self.timezone_format == 'local' or self.timezone_format == 'homebase':
                 # Training at home base — local == home base timezone
@@ -895,15 +895,15 @@ class CrewLinkRosterParser:
                 try:
                     if self.timezone_format == 'local':
                         # Times are in LOCAL timezone of each airport
-                        dep_tz = pytz.timezone(dep_airport.timezone)
-                        arr_tz = pytz.timezone(arr_airport.timezone)
+                        dep_tz = get_timezone(dep_airport.timezone)
+                        arr_tz = get_timezone(arr_airport.timezone)
                         
                         dep_utc = dep_tz.localize(dep_time).astimezone(pytz.utc)
                         arr_utc = arr_tz.localize(arr_time).astimezone(pytz.utc)
                     
                     elif self.timezone_format == 'homebase':
                         # NEW: Times are in HOME BASE timezone (DOH)
-                        home_tz = pytz.timezone(self.home_timezone)
+                        home_tz = get_timezone(self.home_timezone)
                         
                         dep_utc = home_tz.localize(dep_time).astimezone(pytz.utc)
                         arr_utc = home_tz.localize(arr_time).astimezone(pytz.utc)
@@ -14,14 +14,17 @@ for biomathematical analysis (Borbély model)
 
 import pdfplumber
 import pandas as pd
+import io
 import re
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from itertools import islice
+from typing import BinaryIO, List, Dict, Optional, Tuple, Union
 import pytz
 import airportsdata
 
 # Ensure you have these models defined in your project
-from models.data_models import Airport, FlightSegment, Duty, Roster, CrewComposition, RestFacilityClass, ULRCrewSet
+from models.data_models import Airport, FlightSegment, Duty, Roster, CrewComposition, RestFacilityClass, ULRCrewSet, get_timezone
 from parsers.qatar_crewlink_parser import CrewLinkRosterParser
 
 
@@ -156,6 +159,8 @@ def auto_detect_crew_augmentation(roster: Roster) -> None:
 
 # Module-level load (cached)
 _IATA_DB = airportsdata.load('IATA')
+# Sorted codes for prefix search: a prefix's matches are one contiguous run
+_SORTED_IATA_CODES = sorted(_IATA_DB)
 
 
 class AirportDatabase:
@@ -203,6 +208,18 @@ class AirportDatabase:
             longitude=0.0
         )
 
+    @classmethod
+    def search(cls, prefix: str, limit: int = 20) -> List[dict]:
+        """airportsdata entries whose IATA code starts with prefix, by code."""
+        prefix = prefix.upper()
+        start = bisect_left(_SORTED_IATA_CODES, prefix)
+        matches = []
+        for code in islice(_SORTED_IATA_CODES, start, start + limit):
+            if not code.startswith(prefix):
+                break
+            matches.append(_IATA_DB[code])
+        return matches
+
     @classmethod
     def add_custom_airport(cls, iata: str, name: str, timezone: str, lat: float, lon: float):
         """Add/override airport at runtime (for codes not in airportsdata)."""
@@ -245,10 +262,26 @@ class PDFRosterParser:
         self.timezone_format = timezone_format
         self.airport_db = AirportDatabase()
         self.roster_year = datetime.now().year  # Default, will be updated from PDF
+
+        # Set by parse_pdf(), read by the API after parsing
+        self.effective_timezone_format: Optional[str] = timezone_format  # format actually applied
+        self.pilot_info: Dict = {}
+        self.detected_format: Optional[str] = None  # for company detection
+        self.raw_pdf_text: str = ''                 # for company detection
     
-    def parse_pdf(self, pdf_path: str, pilot_id: str, month: str) -> Roster:
+    def parse_pdf_bytes(self, data: bytes, pilot_id: str, month: str) -> Roster:
+        """
+        Extract roster from PDF bytes already in memory (e.g. a stored upload)
+        without spooling them to a temporary file first
+        """
+        return self.parse_pdf(io.BytesIO(data), pilot_id, month)
+
+    def parse_pdf(self, pdf_path: Union[str, BinaryIO], pilot_id: str, month: str) -> Roster:
         """
         Main entry point - extract roster from PDF
+
+        pdf_path may be a filesystem path or a seekable binary file object;
+        pdfplumber reads either.
         """
         print(f"📄 Parsing PDF roster: {pdf_path}")
         
@@ -612,8 +645,8 @@ class PDFRosterParser:
         
         sta_time = datetime.strptime(sta_str_clean, '%H:%M').time()
         
-        dep_tz = pytz.timezone(dep_airport.timezone)
-        arr_tz = pytz.timezone(arr_airport.timezone)
+        dep_tz = get_timezone(dep_airport.timezone)
+        arr_tz = get_timezone(arr_airport.timezone)
         
         std_local = dep_tz.localize(datetime.combine(date, std_time))
         sta_local = arr_tz.localize(datetime.combine(date + timedelta(days=days_offset), sta_time))
@@ -684,7 +717,7 @@ class PDFRosterParser:
         
         release_time_obj = datetime.strptime(release_str_clean, '%H:%M').time()
         
-        home_tz = pytz.timezone(self.home_timezone)
+        home_tz = get_timezone(self.home_timezone)
 
         report_local = home_tz.localize(datetime.combine(date, report_time_obj))
         release_local = home_tz.localize(datetime.combine(date + timedelta(days=days_offset), release_time_obj))
@@ -729,6 +762,13 @@ class CSVRosterParser:
         self.home_base = home_base
         self.home_timezone = home_timezone
         self.airport_db = AirportDatabase()
+
+        # Same post-parse attributes as PDFRosterParser; CSV exports carry
+        # none of this, so they stay empty
+        self.effective_timezone_format: Optional[str] = None
+        self.pilot_info: Dict = {}
+        self.detected_format: Optional[str] = None
+        self.raw_pdf_text: str = ''
     
     def parse_csv(self, csv_path: str, pilot_id: str, month: str) -> Roster:
         """Parse CSV roster file"""
@@ -806,8 +846,8 @@ class CSVRosterParser:
         std_time = pd.to_datetime(row['STD'], format='%H:%M').time()
         sta_time = pd.to_datetime(row['STA'], format='%H:%M').time()
         
-        dep_tz = pytz.timezone(dep.timezone)
-        arr_tz = pytz.timezone(arr.timezone)
+        dep_tz = get_timezone(dep.timezone)
+        arr_tz = get_timezone(arr.timezone)
         
         std_utc = dep_tz.localize(datetime.combine(date, std_time)).astimezone(pytz.utc)
         sta_utc = arr_tz.localize(datetime.combine(date, sta_time)).astimezone(pytz.utc)
@@ -825,7 +865,7 @@ class CSVRosterParser:
         report_time = pd.to_datetime(report, format='%H:%M').time()
         release_time = pd.to_datetime(release, format='%H:%M').time()
         
-        home_tz = pytz.timezone(self.home_timezone)
+        home_tz = get_timezone(self.home_timezone)
         
         report_utc = home_tz.localize(datetime.combine(date_obj, report_time)).astimezone(pytz.utc)
         release_utc = home_tz.localize(datetime.combine(date_obj, release_time)).astimezone(pytz.utc)
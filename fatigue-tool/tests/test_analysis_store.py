@@ -0,0 +1,56 @@
+"""
+Tests for the in-memory analysis store
+======================================
+
+analysis_store keeps recent analyses for the GET / what-if endpoints and is
+bounded so anonymous uploads cannot grow the process without limit.
+
+Run: python -m pytest tests/test_analysis_store.py -v
+"""
+
+from api.api_server import AnalysisStore
+
+
+class TestAnalysisStore:
+
+    def test_evicts_least_recently_used(self):
+        store = AnalysisStore(maxsize=2)
+        store['a'] = ('A',)
+        store['b'] = ('B',)
+        assert store.get('a') == ('A',)   # 'a' is now most recent
+        store['c'] = ('C',)
+        assert 'b' not in store
+        assert 'a' in store and 'c' in store
+        assert len(store) == 2
+
+    def test_reinsert_refreshes_recency(self):
+        store = AnalysisStore(maxsize=2)
+        store['a'] = ('A',)
+        store['b'] = ('B',)
+        store['a'] = ('A2',)
+        store['c'] = ('C',)
+        assert store.get('a') == ('A2',)
+        assert store.get('b') is None
+
+    def test_hit_and_miss_counters(self):
+        store = AnalysisStore(maxsize=4)
+        store['a'] = ('A',)
+        store.get('a')
+        store.get('a')
+        store.get('missing')
+        assert store.stats() == {'size': 1, 'maxsize': 4, 'hits': 2, 'misses': 1}
+
+    def test_encoded_response_follows_its_entry(self):
+        store = AnalysisStore(maxsize=2)
+        store.set_encoded('a', b'{}')      # no entry yet: ignored
+        assert store.get_encoded('a') is None
+        store['a'] = ('A',)
+        store.set_encoded('a', b'{"v":1}')
+        assert store.get_encoded('a') == b'{"v":1}'
+        store['a'] = ('A2',)               # replaced entry: stale bytes dropped
+        assert store.get_encoded('a') is None
+        store.set_encoded('a', b'{"v":2}')
+        store['b'] = ('B',)
+        store['c'] = ('C',)                # evicts 'a' together with its bytes
+        assert store.get_encoded('a') is None
+        assert 'a' not in store
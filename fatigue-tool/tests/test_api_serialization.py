@@ -0,0 +1,197 @@
+"""
+Tests for the API serialization helpers
+=======================================
+
+The helpers in api/api_server.py that turn model objects into response
+payloads take shortcuts around pytz (cached zones, skipped conversions,
+direct transition-table lookups). These tests pin them to the plain pytz
+results they replace.
+
+Run: python -m pytest tests/test_api_serialization.py -v
+"""
+
+import warnings
+from datetime import datetime, timedelta, timezone
+
+import pytz
+import pytest
+
+from api.api_server import (
+    _OFFSET_BUCKET_SECONDS, _local_wallclock, _offset_hours, _to_utc,
+    _build_duty_response, _build_timeline_columns, _build_timeline_rows,
+    classify_risk, DutyResponse,
+)
+from core import BorbelyFatigueModel
+from models.data_models import Airport, Duty, FlightSegment, Roster, get_timezone
+
+
+ZONES = [
+    'Asia/Qatar',
+    'Europe/London',
+    'America/New_York',
+    'Asia/Kolkata',
+    'Australia/Lord_Howe',   # 30-minute DST shift
+    'Pacific/Auckland',
+    'America/St_Johns',      # half-hour offset, transitions at :30 UTC
+    'UTC',
+]
+
+
+def _utc_samples():
+    """Every 7h37m across 2025-2026, so both DST transitions are crossed."""
+    t = pytz.utc.localize(datetime(2025, 1, 1))
+    end = pytz.utc.localize(datetime(2027, 1, 1))
+    while t < end:
+        yield t
+        t += timedelta(hours=7, minutes=37)
+
+
+class TestLocalWallclock:
+
+    @pytest.mark.parametrize('zone', ZONES)
+    def test_matches_astimezone(self, zone):
+        tz = get_timezone(zone)
+        for dt in _utc_samples():
+            assert _local_wallclock(dt, tz) == dt.astimezone(tz).replace(tzinfo=None)
+
+    def test_london_dst_boundary(self):
+        tz = get_timezone('Europe/London')
+        before = pytz.utc.localize(datetime(2026, 3, 29, 0, 59))
+        after = pytz.utc.localize(datetime(2026, 3, 29, 1, 0))
+        assert _local_wallclock(before, tz).strftime('%H:%M') == '00:59'
+        assert _local_wallclock(after, tz).strftime('%H:%M') == '02:00'
+
+
+class TestOffsetHours:
+
+    @pytest.mark.parametrize('zone', ZONES)
+    def test_matches_utcoffset(self, zone):
+        tz = get_timezone(zone)
+        for dt in _utc_samples():
+            bucket = int(dt.timestamp()) // _OFFSET_BUCKET_SECONDS
+            expected = dt.astimezone(tz).utcoffset().total_seconds() / 3600
+            assert _offset_hours(zone, bucket) == expected
+
+    def test_st_johns_transition_minute(self):
+        # 2026-03-08 02:00 NST (-3:30) = 05:30 UTC
+        before = pytz.utc.localize(datetime(2026, 3, 8, 5, 29))
+        after = pytz.utc.localize(datetime(2026, 3, 8, 5, 30))
+        bucket = lambda dt: int(dt.timestamp()) // _OFFSET_BUCKET_SECONDS
+        assert _offset_hours('America/St_Johns', bucket(before)) == -3.5
+        assert _offset_hours('America/St_Johns', bucket(after)) == -2.5
+
+
+class TestToUtc:
+
+    def test_utc_input_returned_unchanged(self):
+        dt = pytz.utc.localize(datetime(2026, 2, 1, 12, 0))
+        assert _to_utc(dt) is dt
+
+    def test_stdlib_utc_input_returned_unchanged(self):
+        dt = datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc)
+        assert _to_utc(dt) is dt
+
+    def test_offset_input_converted(self):
+        dt = get_timezone('Asia/Qatar').localize(datetime(2026, 2, 1, 12, 0))
+        converted = _to_utc(dt)
+        assert converted.hour == 9
+        assert converted.utcoffset() == timedelta(0)
+
+
+class TestClassifyRisk:
+
+    @pytest.mark.parametrize('performance,expected', [
+        (None, 'unknown'),
+        (100.0, 'low'),
+        (75.0, 'low'),
+        (74.999, 'moderate'),
+        (65.0, 'moderate'),
+        (64.999, 'high'),
+        (55.0, 'high'),
+        (54.999, 'critical'),
+        (45.0, 'critical'),
+        (44.999, 'extreme'),
+        (0.0, 'extreme'),
+        (float('nan'), 'extreme'),
+    ])
+    def test_band_boundaries(self, performance, expected):
+        assert classify_risk(performance) == expected
+
+
+# ── Constructed responses ────────────────────────────────────────────────
+
+def _make_airport(code, timezone, lat=0.0, lon=0.0):
+    return Airport(code=code, timezone=timezone, latitude=lat, longitude=lon)
+
+
+DOH = _make_airport('DOH', 'Asia/Qatar', lat=25.26, lon=51.56)
+LHR = _make_airport('LHR', 'Europe/London', lat=51.47, lon=-0.46)
+
+
+def _make_duty(duty_id, dep_utc, block_hours, dep_airport, arr_airport):
+    arr_utc = dep_utc + timedelta(hours=block_hours)
+    segment = FlightSegment(
+        flight_number=f'QR{duty_id}',
+        departure_airport=dep_airport,
+        arrival_airport=arr_airport,
+        scheduled_departure_utc=dep_utc,
+        scheduled_arrival_utc=arr_utc,
+        aircraft_type='351',
+    )
+    return Duty(
+        duty_id=duty_id,
+        date=dep_utc.date(),
+        report_time_utc=dep_utc - timedelta(minutes=75),
+        release_time_utc=arr_utc + timedelta(minutes=30),
+        segments=[segment],
+        home_base_timezone='Asia/Qatar',
+    )
+
+
+@pytest.fixture(scope='module')
+def simulated():
+    roster = Roster(
+        roster_id='R1', pilot_id='P1', month='2026-03',
+        duties=[
+            _make_duty('D001', pytz.utc.localize(datetime(2026, 3, 28, 1, 30)), 7.0, DOH, LHR),
+            _make_duty('D002', pytz.utc.localize(datetime(2026, 3, 30, 8, 0)), 6.5, LHR, DOH),
+        ],
+        home_base_timezone='Asia/Qatar',
+    )
+    return roster, BorbelyFatigueModel().simulate_roster(roster)
+
+
+@pytest.fixture(scope='module')
+def duty_responses(simulated):
+    roster, analysis = simulated
+    return [
+        _build_duty_response(dt, roster.duties[roster.get_duty_index(dt.duty_id)], roster)
+        for dt in analysis.duty_timelines
+    ]
+
+
+class TestConstructedResponses:
+    """DutyResponse / DutySegmentResponse skip validation via model_construct();
+    they must serialize exactly as a validated instance would."""
+
+    def test_matches_validated_round_trip(self, duty_responses):
+        assert duty_responses
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')   # serializer type-mismatch warnings
+            for resp in duty_responses:
+                validated = DutyResponse.model_validate(resp.model_dump())
+                assert resp.model_dump_json() == validated.model_dump_json()
+
+
+class TestTimelineColumns:
+    """format=columnar must carry exactly the row data, transposed."""
+
+    def test_columns_are_transposed_rows(self, simulated):
+        _, analysis = simulated
+        points = analysis.duty_timelines[0].timeline
+        rows = _build_timeline_rows(points)
+        columns = _build_timeline_columns(points)
+        assert rows
+        assert list(columns) == list(rows[0])
+        for key, values in columns.items():
+            assert values == [row[key] for row in rows]
@@ -0,0 +1,66 @@
+"""
+Tests for airline detection
+===========================
+
+detect_airline counts flight-number matches with one combined regex; the
+counts must agree with the per-airline patterns it is built from.
+
+Run: python -m pytest tests/test_company_detection.py -v
+"""
+
+import pytest
+
+from company.detection import (
+    _AIRLINE_SIGNATURES, _COMBINED_FLIGHT_RE, detect_airline, extract_fleet_and_role,
+)
+
+
+FLIGHTS = [
+    'EJU1234', 'EJU123', 'QR101', 'QR1015', 'QR10', 'EK001', 'EK12345',
+    'EY470', 'EY4701', 'XQR101', 'QR101A', 'EZY1234', '', 'qr101',
+]
+
+
+class TestCombinedFlightRegex:
+
+    @pytest.mark.parametrize('flight', FLIGHTS)
+    def test_matches_per_airline_patterns(self, flight):
+        expected = [sig.icao for sig in _AIRLINE_SIGNATURES if sig.flight_re.fullmatch(flight)]
+        m = _COMBINED_FLIGHT_RE.fullmatch(flight)
+        assert ([m.lastgroup] if m else []) == expected
+
+
+class TestDetectAirline:
+
+    def test_crewlink_base_and_flights(self):
+        guess = detect_airline('crewlink', 'DOH', '', ['QR101', 'QR102', 'EK123', 'QR1'])
+        assert (guess.icao, guess.confidence) == ('QTR', 0.75)
+
+    def test_unique_format(self):
+        assert detect_airline('easyjet').icao == 'EZY'
+
+    def test_no_signal(self):
+        assert detect_airline('crewlink', 'LHR', '', ['BA001']) is None
+
+    @pytest.mark.parametrize('text,icao', [
+        ('Qatar Airways crew roster', 'QTR'),
+        ('EMIRATES', 'UAE'),
+        ('etihad', 'ETD'),
+    ])
+    def test_text_keyword_adds_score(self, text, icao):
+        without = detect_airline('crewlink', '', '', [])
+        guess = detect_airline('crewlink', '', text, [])
+        assert without is None
+        assert (guess.icao, guess.confidence) == (icao, 0.4)
+
+
+class TestExtractFleetAndRole:
+
+    @pytest.mark.parametrize('info,expected', [
+        ({'aircraft': '319', 'role': 'CP'}, {'fleet': 'A319', 'pilot_role': 'captain'}),
+        ({'pilot_aircraft': 'a350 ', 'role': 'f/o'}, {'fleet': 'A350', 'pilot_role': 'first_officer'}),
+        ({'aircraft': 'B7879', 'role': 'TRI'}, {'fleet': 'B7879', 'pilot_role': 'tri'}),
+        ({}, {'fleet': None, 'pilot_role': None}),
+    ])
+    def test_normalization(self, info, expected):
+        assert extract_fleet_and_role(info) == expected
@@ -0,0 +1,42 @@
+"""
+Tests for the login rate limiter
+================================
+
+SlidingWindowLimiter caps bcrypt-backed login/registration attempts per
+client IP.
+
+Run: python -m pytest tests/test_rate_limit.py -v
+"""
+
+from auth import rate_limit
+from auth.rate_limit import SlidingWindowLimiter
+
+
+class TestSlidingWindowLimiter:
+
+    def test_rejects_over_limit_until_window_passes(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: now[0])
+        limiter = SlidingWindowLimiter(limit=2, window=60)
+
+        assert limiter.hit('1.2.3.4') == 0
+        assert limiter.hit('1.2.3.4') == 0
+        assert limiter.hit('1.2.3.4') == 60
+        assert limiter.hit('5.6.7.8') == 0     # other clients unaffected
+
+        now[0] += 30
+        assert limiter.hit('1.2.3.4') == 30    # rejected hits are not recorded
+        now[0] += 30
+        assert limiter.hit('1.2.3.4') == 0
+
+    def test_sweeps_idle_clients(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: now[0])
+        monkeypatch.setattr(rate_limit, '_MAX_TRACKED_CLIENTS', 3)
+        limiter = SlidingWindowLimiter(limit=5, window=10)
+
+        for ip in ('a', 'b', 'c', 'd'):
+            limiter.hit(ip)
+        now[0] = 20
+        limiter.hit('e')
+        assert set(limiter._hits) == {'e'}
@@ -132,9 +132,9 @@ class FatigueChronogram:
         risk_grid = np.full((days_in_month, 48), np.nan)  # NaN = no data
         
         # Build duty map
+        duty_by_id = {d.duty_id: d for d in roster.duties}
         for duty_timeline in duties:
-            duty_idx = roster.get_duty_index(duty_timeline.duty_id)
-            duty = roster.duties[duty_idx]
+            duty = duty_by_id[duty_timeline.duty_id]
             
             # Get timeline points (5-min resolution)
             if not duty_timeline.timeline:
@@ -361,8 +361,9 @@ class FatigueChronogram:
         # Track "The Flip" (phase shifts)
         prev_report_hour = None
         
+        duty_by_id = {d.duty_id: d for d in roster.duties}
         for i, duty_timeline in enumerate(duties):
-            duty = roster.duties[roster.get_duty_index(duty_timeline.duty_id)]
+            duty = duty_by_id[duty_timeline.duty_id]
             
             report_local = duty.report_time_utc.astimezone(
                 pytz.timezone(duty.home_base_timezone)